@@ -1,4 +1,5 @@
 import asyncio
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -6,12 +7,19 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
+from alembic.util import load_python_file
 from app.core.config import settings
 from app.db.base import Base
 
 config = context.config
 
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Registers op.create_index_concurrently, op.drop_index_concurrently and op.backfill.
+# Loaded by path: `import alembic.online_ops` would look in the alembic package.
+load_python_file(os.path.dirname(__file__), "online_ops.py")
+
+# Every shard has the full schema: `alembic -x shard=<name> upgrade head` migrates one
+shard = context.get_x_argument(as_dictionary=True).get("shard")
+config.set_main_option("sqlalchemy.url", settings.DATABASE_SHARDS[shard] if shard else settings.DATABASE_URL)
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
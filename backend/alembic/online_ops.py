@@ -0,0 +1,192 @@
+"""
+Migration operations that keep tables online.
+
+A migration runs in one transaction, and every lock it takes is held until the
+end: `op.create_index` blocks writes to the table for the whole build, and a
+single `UPDATE` that backfills a column locks every row it touches. env.py
+registers these operations on `op` instead:
+
+    op.create_index_concurrently("ix_inventories_updated_at", "inventories", ["updated_at"])
+    op.drop_index_concurrently("ix_inventories_updated_at")
+    op.backfill("inventories", {"reserved_stock": "0"}, where="reserved_stock IS NULL")
+
+They commit the migration's transaction so far and run in autocommit mode.
+`CREATE INDEX CONCURRENTLY` builds the index while writes continue. A build
+that failed leaves an invalid index behind, which is dropped and rebuilt when
+the migration is run again. A backfill updates `batch_size` rows per
+transaction in key order, pausing `pause_ms` between batches, and logs its
+progress. `where` must exclude rows already filled, so a backfill that was
+interrupted carries on where it stopped.
+
+Since they commit, give them a migration of their own, or put them last.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from alembic.operations import MigrateOperation, Operations
+from sqlalchemy import text
+
+log = logging.getLogger("alembic.online_ops")
+
+# Index named `:name` left invalid by a concurrent build that failed
+_INVALID_INDEX_SQL = "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+
+# One batch: the next `:limit` keys after the cursor that still need filling, updated together
+_BACKFILL_BATCH_SQL = """
+WITH batch AS (
+    SELECT {key} AS backfill_key FROM {table}
+    WHERE ({where}){after}
+    ORDER BY {key}
+    LIMIT :limit
+), updated AS (
+    UPDATE {table} SET {values} FROM batch WHERE {table}.{key} = batch.backfill_key
+    RETURNING 1
+)
+SELECT (SELECT count(*) FROM updated) AS rows,
+       (SELECT backfill_key FROM batch ORDER BY backfill_key DESC LIMIT 1) AS last
+"""
+
+
+@Operations.register_operation("create_index_concurrently")
+class CreateIndexConcurrentlyOp(MigrateOperation):
+    def __init__(self, index_name: str, table_name: str, columns: Sequence[str], **kw: Any):
+        self.index_name = index_name
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.kw = kw
+
+    @classmethod
+    def create_index_concurrently(
+        cls, operations: Operations, index_name: str, table_name: str, columns: Sequence[str], **kw: Any
+    ) -> None:
+        """
+        Build an index without blocking writes; takes `op.create_index` keywords
+        (`unique`, `postgresql_where`, ...).
+        """
+        return operations.invoke(cls(index_name, table_name, columns, **kw))
+
+    def reverse(self) -> "DropIndexConcurrentlyOp":
+        return DropIndexConcurrentlyOp(self.index_name)
+
+
+@Operations.register_operation("drop_index_concurrently")
+class DropIndexConcurrentlyOp(MigrateOperation):
+    def __init__(self, index_name: str):
+        self.index_name = index_name
+
+    @classmethod
+    def drop_index_concurrently(cls, operations: Operations, index_name: str) -> None:
+        """
+        Drop an index without blocking reads or writes of its table.
+        """
+        return operations.invoke(cls(index_name))
+
+
+@Operations.register_operation("backfill")
+class BackfillOp(MigrateOperation):
+    def __init__(
+        self,
+        table_name: str,
+        values: Dict[str, str],
+        *,
+        where: str,
+        key: str = "id",
+        batch_size: int = 1000,
+        pause_ms: int = 50,
+    ):
+        self.table_name = table_name
+        self.values = values
+        self.where = where
+        self.key = key
+        self.batch_size = batch_size
+        self.pause_ms = pause_ms
+
+    @classmethod
+    def backfill(
+        cls,
+        operations: Operations,
+        table_name: str,
+        values: Dict[str, str],
+        *,
+        where: str,
+        key: str = "id",
+        batch_size: int = 1000,
+        pause_ms: int = 50,
+    ) -> int:
+        """
+        Set `values` (column to SQL expression) on the rows matching `where`, in
+        batches along the unique column `key`. Returns the rows updated.
+        """
+        return operations.invoke(
+            cls(table_name, values, where=where, key=key, batch_size=batch_size, pause_ms=pause_ms)
+        )
+
+
+@Operations.implementation_for(CreateIndexConcurrentlyOp)
+def create_index_concurrently(operations: Operations, operation: CreateIndexConcurrentlyOp) -> None:
+    context = operations.get_context()
+    with context.autocommit_block():
+        if not context.as_sql and operations.get_bind().scalar(
+            text(_INVALID_INDEX_SQL), {"name": operation.index_name}
+        ):
+            log.info("Dropping invalid index %s left by an earlier build", operation.index_name)
+            operations.drop_index(operation.index_name, postgresql_concurrently=True, if_exists=True)
+        operations.create_index(
+            operation.index_name,
+            operation.table_name,
+            operation.columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **operation.kw,
+        )
+
+
+@Operations.implementation_for(DropIndexConcurrentlyOp)
+def drop_index_concurrently(operations: Operations, operation: DropIndexConcurrentlyOp) -> None:
+    with operations.get_context().autocommit_block():
+        operations.drop_index(operation.index_name, postgresql_concurrently=True, if_exists=True)
+
+
+@Operations.implementation_for(BackfillOp)
+def backfill(operations: Operations, operation: BackfillOp) -> Optional[int]:
+    values = ", ".join(f"{column} = {expression}" for column, expression in operation.values.items())
+    context = operations.get_context()
+    if context.as_sql:
+        # A script can't loop over batches; it gets the whole update
+        operations.execute(f"UPDATE {operation.table_name} SET {values} WHERE {operation.where}")
+        return None
+
+    statements: List[Any] = [
+        text(
+            _BACKFILL_BATCH_SQL.format(
+                table=operation.table_name, key=operation.key, where=operation.where, values=values, after=after
+            )
+        )
+        for after in ("", f" AND {operation.key} > :last")
+    ]
+    updated = batches = 0
+    last = None
+    started = time.monotonic()
+    with context.autocommit_block():
+        bind = operations.get_bind()
+        while True:
+            params = {"limit": operation.batch_size} if last is None else {"limit": operation.batch_size, "last": last}
+            rows, last = bind.execute(statements[last is not None], params).one()
+            if last is None:
+                break
+            updated += rows
+            batches += 1
+            log.info(
+                "Backfilling %s: %s rows in %s batches (%.0f rows/s), up to %s %s",
+                operation.table_name,
+                updated,
+                batches,
+                updated / max(time.monotonic() - started, 1e-6),
+                operation.key,
+                last,
+            )
+            time.sleep(operation.pause_ms / 1000)
+    log.info("Backfilled %s rows of %s", updated, operation.table_name)
+    return updated
@@ -0,0 +1,179 @@
+"""pre-aggregated inventory summary per tenant and sku prefix
+
+Revision ID: 3e8c1f6a2b47
+Revises: a7b3d5e9f210
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8c1f6a2b47"
+down_revision: Union[str, Sequence[str], None] = "a7b3d5e9f210"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_summaries",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sku_prefix", sa.String(), nullable=False),
+        sa.Column("sku_count", sa.Integer(), nullable=False),
+        sa.Column("total_units", sa.BigInteger(), nullable=False),
+        sa.Column("low_stock_count", sa.Integer(), nullable=False),
+        sa.Column("out_of_stock_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("tenant_id", "sku_prefix"),
+    )
+    op.create_index(
+        "ix_inventory_summaries_empty",
+        "inventory_summaries",
+        ["tenant_id"],
+        postgresql_where=sa.text("sku_count = 0"),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_inventory_summary() RETURNS trigger AS $$
+        DECLARE
+            deltas text;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                deltas := 'SELECT *, 1 AS sign FROM new_rows';
+            ELSIF TG_OP = 'DELETE' THEN
+                deltas := 'SELECT *, -1 AS sign FROM old_rows';
+            ELSE
+                deltas := 'SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows';
+            END IF;
+            EXECUTE format($sql$
+                INSERT INTO inventory_summaries AS s
+                    (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+                SELECT * FROM (
+                    SELECT d.tenant_id,
+                           split_part(coalesce(p.sku, ''), '-', 1),
+                           sum(d.sign) AS sku_count,
+                           sum(d.sign * coalesce(d.current_stock, 0)) AS total_units,
+                           sum(CASE WHEN coalesce(d.current_stock, 0) < coalesce(d.min_stock, 0) THEN d.sign ELSE 0 END)
+                               AS low_stock_count,
+                           sum(CASE WHEN coalesce(d.current_stock, 0) <= 0 THEN d.sign ELSE 0 END) AS out_of_stock_count
+                    FROM (%s) d
+                    JOIN products p ON p.id = d.product_id
+                    GROUP BY 1, 2
+                ) counts
+                WHERE (sku_count, total_units, low_stock_count, out_of_stock_count) <> (0, 0, 0, 0)
+                -- The same lock order everywhere keeps concurrent bulk writes from deadlocking
+                ORDER BY 1, 2
+                ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+                    sku_count = s.sku_count + EXCLUDED.sku_count,
+                    total_units = s.total_units + EXCLUDED.total_units,
+                    low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+                    out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count
+            $sql$, deltas);
+            DELETE FROM inventory_summaries WHERE sku_count = 0;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION apply_product_summary_prefix() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO inventory_summaries AS s
+                (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+            SELECT i.tenant_id,
+                   prefixes.sku_prefix,
+                   sum(prefixes.sign),
+                   sum(prefixes.sign * coalesce(i.current_stock, 0)),
+                   sum(CASE WHEN coalesce(i.current_stock, 0) < coalesce(i.min_stock, 0) THEN prefixes.sign ELSE 0 END),
+                   sum(CASE WHEN coalesce(i.current_stock, 0) <= 0 THEN prefixes.sign ELSE 0 END)
+            FROM inventories i
+            CROSS JOIN (
+                SELECT -1, split_part(coalesce(OLD.sku, ''), '-', 1)
+                UNION ALL
+                SELECT 1, split_part(coalesce(NEW.sku, ''), '-', 1) WHERE TG_OP = 'UPDATE'
+            ) AS prefixes (sign, sku_prefix)
+            WHERE i.product_id = OLD.id
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+            ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+                sku_count = s.sku_count + EXCLUDED.sku_count,
+                total_units = s.total_units + EXCLUDED.total_units,
+                low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+                out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count;
+            DELETE FROM inventory_summaries WHERE sku_count = 0;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_summary_insert AFTER INSERT ON inventories
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_summary_update AFTER UPDATE ON inventories
+            REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_summary_delete AFTER DELETE ON inventories
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_summary_product_sku AFTER UPDATE OF sku ON products
+            FOR EACH ROW
+            WHEN (split_part(coalesce(OLD.sku, ''), '-', 1) IS DISTINCT FROM split_part(coalesce(NEW.sku, ''), '-', 1))
+            EXECUTE FUNCTION apply_product_summary_prefix()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_summary_product_delete BEFORE DELETE ON products
+            FOR EACH ROW EXECUTE FUNCTION apply_product_summary_prefix()
+        """
+    )
+
+    # Creating the triggers blocks writes to both tables until this migration
+    # commits, so the backfill can't miss or double-count a concurrent write
+    op.execute(
+        """
+        INSERT INTO inventory_summaries
+            (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+        SELECT i.tenant_id,
+               split_part(coalesce(p.sku, ''), '-', 1),
+               count(*),
+               sum(coalesce(i.current_stock, 0)),
+               count(*) FILTER (WHERE coalesce(i.current_stock, 0) < coalesce(i.min_stock, 0)),
+               count(*) FILTER (WHERE coalesce(i.current_stock, 0) <= 0)
+        FROM inventories i
+        JOIN products p ON p.id = i.product_id
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_product_delete ON products")
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_product_sku ON products")
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_delete ON inventories")
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_update ON inventories")
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_insert ON inventories")
+    op.execute("DROP FUNCTION IF EXISTS apply_product_summary_prefix()")
+    op.execute("DROP FUNCTION IF EXISTS apply_inventory_summary()")
+    op.drop_index("ix_inventory_summaries_empty", table_name="inventory_summaries")
+    op.drop_table("inventory_summaries")
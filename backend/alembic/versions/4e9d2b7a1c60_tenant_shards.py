@@ -0,0 +1,59 @@
+"""tenant shards
+
+Revision ID: 4e9d2b7a1c60
+Revises: 2c7e9a4b1d58
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4e9d2b7a1c60"
+down_revision: Union[str, Sequence[str], None] = "2c7e9a4b1d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECORD_INVENTORY_CHANGE = """
+CREATE OR REPLACE FUNCTION record_inventory_change() RETURNS trigger AS $$
+DECLARE
+    changed inventories%ROWTYPE;
+BEGIN
+    {skip}IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+    IF TG_OP = 'UPDATE'
+       AND (NEW.product_id, NEW.min_stock, NEW.current_stock)
+           IS NOT DISTINCT FROM (OLD.product_id, OLD.min_stock, OLD.current_stock) THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO inventory_changes (tenant_id, inventory_id, product_id, min_stock, current_stock, deleted)
+    VALUES (changed.tenant_id, changed.id, changed.product_id, changed.min_stock, changed.current_stock,
+            TG_OP = 'DELETE');
+    PERFORM pg_notify('inventory_changes', changed.tenant_id::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SKIP_DURING_TENANT_MOVE = """IF current_setting('app.skip_inventory_changes', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    """
+
+
+def upgrade() -> None:
+    op.add_column("tenants", sa.Column("shard", sa.String(), server_default=sa.text("'default'"), nullable=False))
+    op.add_column("tenants", sa.Column("shard_moved_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(RECORD_INVENTORY_CHANGE.format(skip=SKIP_DURING_TENANT_MOVE))
+
+
+def downgrade() -> None:
+    op.execute(RECORD_INVENTORY_CHANGE.format(skip=""))
+    op.drop_column("tenants", "shard_moved_at")
+    op.drop_column("tenants", "shard")
@@ -0,0 +1,79 @@
+"""inventory change log and notify trigger
+
+Revision ID: 5f3a9c1e7b2d
+Revises: 016accbe37d4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5f3a9c1e7b2d"
+down_revision: Union[str, Sequence[str], None] = "016accbe37d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_changes",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column(
+            "txid", sa.BigInteger(), server_default=sa.text("(pg_current_xact_id()::text)::bigint"), nullable=False
+        ),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("inventory_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("min_stock", sa.Integer(), nullable=True),
+        sa.Column("current_stock", sa.Integer(), nullable=True),
+        sa.Column("deleted", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_inventory_changes_tenant_txid", "inventory_changes", ["tenant_id", "txid"])
+    op.create_index(op.f("ix_inventory_changes_changed_at"), "inventory_changes", ["changed_at"])
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_inventory_change() RETURNS trigger AS $$
+        DECLARE
+            changed inventories%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                changed := OLD;
+            ELSE
+                changed := NEW;
+            END IF;
+            IF TG_OP = 'UPDATE'
+               AND (NEW.product_id, NEW.min_stock, NEW.current_stock)
+                   IS NOT DISTINCT FROM (OLD.product_id, OLD.min_stock, OLD.current_stock) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO inventory_changes (tenant_id, inventory_id, product_id, min_stock, current_stock, deleted)
+            VALUES (changed.tenant_id, changed.id, changed.product_id, changed.min_stock, changed.current_stock,
+                    TG_OP = 'DELETE');
+            PERFORM pg_notify('inventory_changes', changed.tenant_id::text);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_change AFTER INSERT OR UPDATE OR DELETE ON inventories
+            FOR EACH ROW EXECUTE FUNCTION record_inventory_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS inventory_change ON inventories")
+    op.execute("DROP FUNCTION IF EXISTS record_inventory_change()")
+    op.drop_index(op.f("ix_inventory_changes_changed_at"), table_name="inventory_changes")
+    op.drop_index("ix_inventory_changes_tenant_txid", table_name="inventory_changes")
+    op.drop_table("inventory_changes")
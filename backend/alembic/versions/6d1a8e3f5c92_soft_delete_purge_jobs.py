@@ -0,0 +1,51 @@
+"""soft delete for products and tenants, purge jobs
+
+Revision ID: 6d1a8e3f5c92
+Revises: 9b4f2d8e6c13
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1a8e3f5c92"
+down_revision: Union[str, Sequence[str], None] = "9b4f2d8e6c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("tenants", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    # Purging a product walks its inventory rows by product_id
+    op.create_index(op.f("ix_inventories_product_id"), "inventories", ["product_id"])
+    op.create_table(
+        "purge_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("rows_deleted", sa.BigInteger(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_purge_jobs_pending",
+        "purge_jobs",
+        ["created_at"],
+        postgresql_where=sa.text("finished_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_purge_jobs_pending", table_name="purge_jobs", postgresql_where=sa.text("finished_at IS NULL"))
+    op.drop_table("purge_jobs")
+    op.drop_index(op.f("ix_inventories_product_id"), table_name="inventories")
+    op.drop_column("tenants", "deleted_at")
+    op.drop_column("products", "deleted_at")
@@ -0,0 +1,27 @@
+"""inventory version
+
+Revision ID: 7a5c3e1f9d24
+Revises: 4e9d2b7a1c60
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7a5c3e1f9d24"
+down_revision: Union[str, Sequence[str], None] = "4e9d2b7a1c60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows are not rewritten
+    op.add_column("inventories", sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("inventories", "version")
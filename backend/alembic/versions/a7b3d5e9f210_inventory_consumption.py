@@ -0,0 +1,61 @@
+"""daily inventory consumption for demand forecasting
+
+Revision ID: a7b3d5e9f210
+Revises: c41f0e9a7d35
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b3d5e9f210"
+down_revision: Union[str, Sequence[str], None] = "c41f0e9a7d35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_consumption",
+        sa.Column("inventory_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["inventory_id"], ["inventories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("inventory_id", "day"),
+    )
+    op.create_index("ix_inventory_consumption_tenant_day", "inventory_consumption", ["tenant_id", "day"])
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_inventory_consumption() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO inventory_consumption (inventory_id, day, tenant_id, quantity)
+            VALUES (NEW.id, (now() AT TIME ZONE 'UTC')::date, NEW.tenant_id, OLD.current_stock - NEW.current_stock)
+            ON CONFLICT (inventory_id, day)
+            DO UPDATE SET quantity = inventory_consumption.quantity + EXCLUDED.quantity;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER inventory_consumption AFTER UPDATE OF current_stock ON inventories
+            FOR EACH ROW WHEN (NEW.current_stock < OLD.current_stock)
+            EXECUTE FUNCTION record_inventory_consumption()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS inventory_consumption ON inventories")
+    op.execute("DROP FUNCTION IF EXISTS record_inventory_consumption()")
+    op.drop_index("ix_inventory_consumption_tenant_day", table_name="inventory_consumption")
+    op.drop_table("inventory_consumption")
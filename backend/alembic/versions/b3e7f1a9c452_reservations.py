@@ -0,0 +1,47 @@
+"""reservations
+
+Revision ID: b3e7f1a9c452
+Revises: 7a5c3e1f9d24
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e7f1a9c452"
+down_revision: Union[str, Sequence[str], None] = "7a5c3e1f9d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("inventories", sa.Column("reserved_stock", sa.Integer(), server_default=sa.text("0"), nullable=False))
+    op.create_table(
+        "reservations",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("inventory_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["inventory_id"], ["inventories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_reservations_expires_at", "reservations", ["expires_at"], unique=False)
+    op.create_index(op.f("ix_reservations_inventory_id"), "reservations", ["inventory_id"], unique=False)
+    op.create_index(op.f("ix_reservations_tenant_id"), "reservations", ["tenant_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_reservations_tenant_id"), table_name="reservations")
+    op.drop_index(op.f("ix_reservations_inventory_id"), table_name="reservations")
+    op.drop_index("ix_reservations_expires_at", table_name="reservations")
+    op.drop_table("reservations")
+    op.drop_column("inventories", "reserved_stock")
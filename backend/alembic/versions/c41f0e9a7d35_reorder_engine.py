@@ -0,0 +1,71 @@
+"""reorder engine: target stock, supply orders and runs
+
+Revision ID: c41f0e9a7d35
+Revises: 8d2e6b4a1c90
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f0e9a7d35"
+down_revision: Union[str, Sequence[str], None] = "8d2e6b4a1c90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("inventories", sa.Column("target_stock", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_inventories_low_stock",
+        "inventories",
+        ["tenant_id", "id"],
+        postgresql_where=sa.text("current_stock < min_stock"),
+    )
+
+    op.create_table(
+        "supply_orders",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("inventory_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("reference", sa.String(), nullable=False),
+        sa.Column("external_reference_id", sa.String(), nullable=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["inventory_id"], ["inventories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_supply_orders_inventory_created", "supply_orders", ["inventory_id", "created_at"])
+    op.create_index(op.f("ix_supply_orders_reference"), "supply_orders", ["reference"])
+    op.create_index(op.f("ix_supply_orders_tenant_id"), "supply_orders", ["tenant_id"])
+
+    op.create_table(
+        "reorder_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("cursor_tenant_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("cursor_inventory_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("lines", sa.Integer(), nullable=False),
+        sa.Column("orders", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("reorder_runs")
+    op.drop_index(op.f("ix_supply_orders_tenant_id"), table_name="supply_orders")
+    op.drop_index(op.f("ix_supply_orders_reference"), table_name="supply_orders")
+    op.drop_index("ix_supply_orders_inventory_created", table_name="supply_orders")
+    op.drop_table("supply_orders")
+    op.drop_index("ix_inventories_low_stock", table_name="inventories")
+    op.drop_column("inventories", "target_stock")
@@ -0,0 +1,147 @@
+"""inventory summaries leave out deleted products
+
+Revision ID: d5a8c2e4f917
+Revises: b3e7f1a9c452
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a8c2e4f917"
+down_revision: Union[str, Sequence[str], None] = "b3e7f1a9c452"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLY_INVENTORY_SUMMARY = """
+CREATE OR REPLACE FUNCTION apply_inventory_summary() RETURNS trigger AS $$
+DECLARE
+    deltas text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        deltas := 'SELECT *, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        deltas := 'SELECT *, -1 AS sign FROM old_rows';
+    ELSE
+        deltas := 'SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows';
+    END IF;
+    EXECUTE format($sql$
+        INSERT INTO inventory_summaries AS s
+            (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+        SELECT * FROM (
+            SELECT d.tenant_id,
+                   split_part(coalesce(p.sku, ''), '-', 1),
+                   sum(d.sign) AS sku_count,
+                   sum(d.sign * coalesce(d.current_stock, 0)) AS total_units,
+                   sum(CASE WHEN coalesce(d.current_stock, 0) < coalesce(d.min_stock, 0) THEN d.sign ELSE 0 END)
+                       AS low_stock_count,
+                   sum(CASE WHEN coalesce(d.current_stock, 0) <= 0 THEN d.sign ELSE 0 END) AS out_of_stock_count
+            FROM (%s) d
+            JOIN products p ON p.id = d.product_id{live}
+            GROUP BY 1, 2
+        ) counts
+        WHERE (sku_count, total_units, low_stock_count, out_of_stock_count) <> (0, 0, 0, 0)
+        -- The same lock order everywhere keeps concurrent bulk writes from deadlocking
+        ORDER BY 1, 2
+        ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+            sku_count = s.sku_count + EXCLUDED.sku_count,
+            total_units = s.total_units + EXCLUDED.total_units,
+            low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+            out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count
+    $sql$, deltas);
+    DELETE FROM inventory_summaries WHERE sku_count = 0;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+APPLY_PRODUCT_SUMMARY_PREFIX = """
+CREATE OR REPLACE FUNCTION apply_product_summary_prefix() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO inventory_summaries AS s
+        (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+    SELECT i.tenant_id,
+           prefixes.sku_prefix,
+           sum(prefixes.sign),
+           sum(prefixes.sign * coalesce(i.current_stock, 0)),
+           sum(CASE WHEN coalesce(i.current_stock, 0) < coalesce(i.min_stock, 0) THEN prefixes.sign ELSE 0 END),
+           sum(CASE WHEN coalesce(i.current_stock, 0) <= 0 THEN prefixes.sign ELSE 0 END)
+    FROM inventories i
+    CROSS JOIN (
+        SELECT -1, split_part(coalesce(OLD.sku, ''), '-', 1){old_live}
+        UNION ALL
+        SELECT 1, split_part(coalesce(NEW.sku, ''), '-', 1) WHERE TG_OP = 'UPDATE'{new_live}
+    ) AS prefixes (sign, sku_prefix)
+    WHERE i.product_id = OLD.id
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+        sku_count = s.sku_count + EXCLUDED.sku_count,
+        total_units = s.total_units + EXCLUDED.total_units,
+        low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+        out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count;
+    DELETE FROM inventory_summaries WHERE sku_count = 0;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+"""
+
+PRODUCT_TRIGGER = """
+CREATE TRIGGER inventory_summary_product_sku AFTER UPDATE OF {columns} ON products
+    FOR EACH ROW
+    WHEN ({when})
+    EXECUTE FUNCTION apply_product_summary_prefix()
+"""
+
+PREFIX_CHANGED = "split_part(coalesce(OLD.sku, ''), '-', 1) IS DISTINCT FROM split_part(coalesce(NEW.sku, ''), '-', 1)"
+
+REBUILD_SUMMARIES = """
+INSERT INTO inventory_summaries
+    (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+SELECT i.tenant_id,
+       split_part(coalesce(p.sku, ''), '-', 1),
+       count(*),
+       sum(coalesce(i.current_stock, 0)),
+       count(*) FILTER (WHERE coalesce(i.current_stock, 0) < coalesce(i.min_stock, 0)),
+       count(*) FILTER (WHERE coalesce(i.current_stock, 0) <= 0)
+FROM inventories i
+JOIN products p ON p.id = i.product_id{live}
+GROUP BY 1, 2
+"""
+
+
+def _replace(*, live: bool) -> None:
+    op.execute(APPLY_INVENTORY_SUMMARY.format(live=" AND p.deleted_at IS NULL" if live else ""))
+    op.execute(
+        APPLY_PRODUCT_SUMMARY_PREFIX.format(
+            old_live=" WHERE OLD.deleted_at IS NULL" if live else "",
+            new_live=" AND NEW.deleted_at IS NULL" if live else "",
+        )
+    )
+    op.execute("DROP TRIGGER IF EXISTS inventory_summary_product_sku ON products")
+    if live:
+        op.execute(
+            PRODUCT_TRIGGER.format(
+                columns="sku, deleted_at",
+                when=f"{PREFIX_CHANGED}\n          OR (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)",
+            )
+        )
+    else:
+        op.execute(PRODUCT_TRIGGER.format(columns="sku", when=PREFIX_CHANGED))
+
+    # Writes to both tables wait until this migration commits, so the rebuild
+    # can't miss or double-count one
+    op.execute("LOCK TABLE products, inventories IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DELETE FROM inventory_summaries")
+    op.execute(REBUILD_SUMMARIES.format(live=" AND p.deleted_at IS NULL" if live else ""))
+
+
+def upgrade() -> None:
+    _replace(live=True)
+
+
+def downgrade() -> None:
+    _replace(live=False)
@@ -0,0 +1,39 @@
+"""prune watermark of the inventory change log
+
+Revision ID: e2b6d9f4a371
+Revises: d5a8c2e4f917
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b6d9f4a371"
+down_revision: Union[str, Sequence[str], None] = "d5a8c2e4f917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_change_prunes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column("pruned_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Earlier prunes left no watermark: assume everything below the oldest kept change is gone
+    op.execute(
+        """
+        INSERT INTO inventory_change_prunes (id, txid)
+        SELECT 1, min(txid) - 1 FROM inventory_changes HAVING count(*) > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_change_prunes")
@@ -0,0 +1,29 @@
+"""inventory stock never below reserved stock
+
+Revision ID: f7c3a8e1d526
+Revises: e2b6d9f4a371
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c3a8e1d526"
+down_revision: Union[str, Sequence[str], None] = "e2b6d9f4a371"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "ck_inventories_stock_covers_reserved"
+
+
+def upgrade() -> None:
+    # Added unvalidated, then validated: the scan holds no lock that blocks writes
+    op.execute(f"ALTER TABLE inventories ADD CONSTRAINT {CONSTRAINT} CHECK (current_stock >= reserved_stock) NOT VALID")
+    op.execute(f"ALTER TABLE inventories VALIDATE CONSTRAINT {CONSTRAINT}")
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT, "inventories", type_="check")
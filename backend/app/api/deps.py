@@ -1,19 +1,27 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import shards
 from app.db.session import AsyncSessionLocal
 from app import crud
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from uuid import UUID
 from app.models.user import User
 from app.core.config import settings
 from app.services.supply_service import SupplyService
+from app.services.purge import Purger
+from app.services.webhooks import WebhookDispatcher, webhook_dispatcher
 from app.core import security
+from app.core.server_timing import timing_phase
 from jose import jwt
 from jose.exceptions import JWTError
 from pydantic import ValidationError
 from fastapi import status
 from fastapi.security import OAuth2PasswordBearer
 from app.schemas.token import TokenPayload
+from app.logger import tenant_id_var
+
+# Requests that never write, so they need no move lock
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
@@ -33,21 +41,24 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)) -> User:
+async def get_current_user(
+    request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
-        token_data = TokenPayload(**payload)
-        if not token_data.sub:
+    with timing_phase("auth"):
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+            token_data = TokenPayload(**payload)
+            if not token_data.sub:
+                raise credentials_exception
+        except (JWTError, ValidationError):
             raise credentials_exception
-    except (JWTError, ValidationError):
-        raise credentials_exception
 
-    user = await crud.user.get(db, id=token_data.sub)
+        user = await crud.user.get(db, id=token_data.sub)
     if not user:
         raise credentials_exception
     if not user.is_active:
@@ -57,6 +68,11 @@ async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depe
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if user.tenant_id:
+        # Tag every log line of this request with the caller's tenant. The access
+        # log is written outside the context this runs in, so it reads request.state
+        tenant_id_var.set(str(user.tenant_id))
+        request.state.tenant_id = str(user.tenant_id)
     return user
 
 
@@ -69,6 +85,51 @@ async def get_current_tenant(
     return current_user.tenant_id
 
 
+async def get_tenant_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    tenant_id: UUID = Depends(get_current_tenant),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency yielding a session on the shard that holds the current tenant's data.
+    With a single database it is the `get_db` session itself.
+
+    Writes first take the tenant's move lock, shared, in the `get_db` session. A
+    move that is cutting over holds it exclusively, so they are answered with 503
+    until the tenant is readable and writable on its new shard.
+    """
+    if not shards.is_sharded():
+        yield db
+        return
+
+    if request.method not in SAFE_METHODS and not await crud.tenant.try_lock_for_write(db, tenant_id=tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Tenant is moving to another database, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    shard = await crud.tenant.get_shard(db, tenant_id=tenant_id)
+    async with shards.get_sessionmaker(shard)() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_shard_dbs(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[Dict[str, AsyncSession], None]:
+    """
+    Dependency yielding a session per shard, for superuser reads across tenants.
+    The default shard's is the `get_db` session.
+    """
+    sessions = {name: shards.get_sessionmaker(name)() for name in shards.extra_shards()}
+    try:
+        yield {shards.DEFAULT_SHARD: db, **sessions}
+    finally:
+        for session in sessions.values():
+            await session.close()
+
+
 async def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -85,3 +146,17 @@ def get_supply_service() -> SupplyService:
         supplier_url=getattr(settings, "SUPPLIER_API_URL", "https://mock-supplier.com/api"),
         api_key=getattr(settings, "SUPPLIER_API_KEY", "mock_key_123"),
     )
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """
+    Dependency returning the process-wide webhook dispatcher.
+    """
+    return webhook_dispatcher
+
+
+def get_purger() -> Purger:
+    """
+    Dependency returning the purger that removes deleted products and tenants.
+    """
+    return Purger()
@@ -3,6 +3,10 @@ from app.api.v1.endpoints import products
 from app.api.v1.endpoints import inventory
 from app.api.v1.endpoints import auth
 from app.api.v1.endpoints import tenants
+from app.api.v1.endpoints import profiles
+from app.api.v1.endpoints import webhooks
+from app.api.v1.endpoints import purges
+from app.api.v1.endpoints import reservations
 
 api_router = APIRouter()
 
@@ -10,3 +14,7 @@ api_router.include_router(products.router, prefix="/products", tags=["products"]
 api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(tenants.router, prefix="/tenants", tags=["tenants"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
+api_router.include_router(purges.router, prefix="/purges", tags=["purges"])
+api_router.include_router(reservations.router, prefix="/reservations", tags=["reservations"])
@@ -1,25 +1,31 @@
 from datetime import timedelta
 from typing import Any
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.api import deps
+from app.core.server_timing import TimedRoute
 from app.core import security
 from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.schemas.token import Token
+from app.schemas.token import RefreshTokenRequest, Token
 from app.schemas.user import (
     UserSignUp,
     UserPublic,
     UserInviteRequest,
     UserInviteResponse,
+    UserBulkInviteRequest,
+    UserBulkInviteResult,
 )
 from app.models.user import User
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/me", response_model=UserPublic)
@@ -53,6 +59,34 @@ async def login_access_token(
     return {
         "access_token": security.create_access_token(user.id, expires_delta=access_token_expires),
         "token_type": "bearer",
+        "refresh_token": await crud.refresh_token.issue(db, user_id=user.id),
+    }
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    token_in: RefreshTokenRequest,
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """
+    Exchange a refresh token for a new access token and refresh token, without a password.
+    Each refresh token works once; reusing one revokes every token issued since that login.
+    """
+    rotated = await crud.refresh_token.rotate(db, token=token_in.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user_id, refresh_token = rotated
+
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    return {
+        "access_token": security.create_access_token(user_id, expires_delta=access_token_expires),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
     }
 
 
@@ -95,3 +129,30 @@ async def invite_user(
         "full_name": user.full_name,
         "temporary_password": password,
     }
+
+
+@router.post("/invite/bulk", response_class=StreamingResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_invite_users(
+    invites_in: UserBulkInviteRequest,
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Invite up to BULK_INVITE_MAX_USERS users to the Tenant at once.
+    The response is NDJSON with one line per invite, in request order: the new
+    user with its temporary password, or an `error` for emails that are taken.
+    Invites are hashed and stored BULK_INVITE_CHUNK_SIZE at a time, and each
+    chunk's lines are sent as soon as it is done.
+    """
+    chunks = crud.user.bulk_invite(
+        db, invites=invites_in.users, tenant_id=tenant_id, chunk_size=settings.BULK_INVITE_CHUNK_SIZE
+    )
+
+    async def lines():
+        async for results in chunks:
+            yield b"".join(
+                orjson.dumps(UserBulkInviteResult(**result).model_dump(mode="json", exclude_none=True)) + b"\n"
+                for result in results
+            )
+
+    return StreamingResponse(lines(), status_code=status.HTTP_201_CREATED, media_type="application/x-ndjson")
@@ -1,25 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any, List
+from typing import Any, List, Optional
 from app import crud
 from app.api import deps
+from app.core.config import settings
+from app.core.server_timing import TimedRoute
+from app.core.responses import FastJSONResponse
+from app.models.inventory import Inventory
 from app.models.user import User
+from app.schemas.batch import BatchGetRequest
 from app.schemas.inventory import (
+    InventoryAvailability,
+    InventoryBatchGetResult,
+    InventoryForecast,
     InventoryPublic,
     InventoryCreate,
+    InventorySummary,
     InventoryUpdate,
     SupplyRequest,
     SupplyResponse,
 )
 from uuid import UUID
+from app.services.export import (
+    ARROW_FORMAT,
+    MEDIA_TYPES,
+    ExportColumnError,
+    export_filename,
+    export_inventory,
+    resolve_columns,
+)
+from app.services.forecast import get_tenant_forecast
+from app.services.inventory_stream import inventory_change_events
 from app.services.supply_service import SupplyService
+from app.services.webhooks import WebhookDispatcher, is_low_stock, low_stock_event
+
+router = APIRouter(route_class=TimedRoute)
+
+# Columns selected for list responses; kept in sync with the public schema
+INVENTORY_PUBLIC_FIELDS = tuple(InventoryPublic.model_fields)
+
 
-router = APIRouter()
+def _etag(item: Inventory) -> str:
+    return f'"{item.version}"'
+
+
+def _if_match_versions(if_match: Optional[str]) -> Optional[List[int]]:
+    """
+    Versions an If-Match header accepts, or None when it sets no condition (absent or `*`).
+    Weak or malformed tags match no version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tags = (tag.strip() for tag in if_match.split(","))
+    return [int(tag[1:-1]) for tag in tags if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()]
 
 
 @router.get("/", response_model=List[InventoryPublic])
 async def read_inventories(
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_tenant_db),
     tenant_id: UUID = Depends(deps.get_current_tenant),
     skip: int = 0,
     limit: int = 100,
@@ -27,35 +67,150 @@ async def read_inventories(
     """
     Retrieve inventories.
     """
-    return await crud.inventory.get_multi_by_tenant(db, tenant_id=tenant_id, skip=skip, limit=limit)
+    rows = await crud.inventory.get_multi_rows_by_tenant(
+        db, tenant_id=tenant_id, columns=INVENTORY_PUBLIC_FIELDS, skip=skip, limit=limit
+    )
+    return FastJSONResponse(rows)
+
+
+@router.get("/changes", response_class=StreamingResponse)
+async def stream_inventory_changes(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    primary: AsyncSession = Depends(deps.get_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    cursor: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """
+    Stream inventory changes as server-sent events instead of polling the list.
+    Reconnecting clients resume from `Last-Event-ID` (or `?cursor=`).
+    """
+    if primary is not db:
+        # The stream only reads the tenant's shard; hand this connection back to the pool
+        await primary.rollback()
+    events = inventory_change_events(db, tenant_id=tenant_id, cursor=last_event_id if last_event_id else cursor)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/summary", response_model=InventorySummary)
+async def read_inventory_summary(
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+) -> Any:
+    """
+    Item and unit totals, low-stock and out-of-stock counts, overall and per SKU prefix.
+    """
+    return await crud.inventory.get_summary(db, tenant_id=tenant_id)
+
+
+@router.get("/forecast", response_model=List[InventoryForecast])
+async def read_inventory_forecast(
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    method: str = Query("sma", pattern="^(sma|ema)$"),
+    limit: Optional[int] = Query(None, ge=1),
+) -> Any:
+    """
+    Forecast daily demand and stockout dates for every item, soonest stockout first.
+    `method` is a moving average (`sma`) or exponential smoothing (`ema`).
+    """
+    rows = await get_tenant_forecast(db, tenant_id=tenant_id, method=method)
+    return FastJSONResponse(rows[:limit])
+
+
+@router.post("/batch-get", response_model=InventoryBatchGetResult)
+async def batch_get_inventories(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    batch_in: BatchGetRequest,
+) -> Any:
+    """
+    Retrieve many inventory items by product `ids` or `skus` in one query, keyed
+    like `GET /inventory/{product_id}`.
+    `items` follows the request order, with null for keys listed in `missing`.
+    """
+    found = await crud.inventory.get_rows_by_tenant(
+        db, tenant_id=tenant_id, columns=INVENTORY_PUBLIC_FIELDS, product_ids=batch_in.ids, skus=batch_in.skus
+    )
+    return FastJSONResponse(batch_in.in_request_order(found))
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_inventories(
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    fmt: str = Query(ARROW_FORMAT, alias="format", pattern="^(arrow|parquet)$"),
+    columns: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Export every inventory item with its product as an Arrow IPC stream or a Parquet file.
+    `columns` is a comma-separated projection; by default every column is exported.
+    """
+    try:
+        names = resolve_columns(columns)
+    except ExportColumnError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return StreamingResponse(
+        export_inventory(db, fmt=fmt, columns=names, tenant_id=tenant_id, batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(fmt)}"'},
+    )
 
 
 @router.get("/{product_id}", response_model=InventoryPublic)
 async def read_inventory_by_product(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_tenant_db),
     tenant_id: UUID = Depends(deps.get_current_tenant),
     product_id: UUID,
+    response: Response,
 ) -> Any:
     """
     Retrieve an inventory item by product ID.
+    Its `ETag` can be sent back as `If-Match` to update it only if unchanged.
     """
     inventory = await crud.inventory.get_by_product_and_tenant(db, product_id=product_id, tenant_id=tenant_id)
     if not inventory:
         raise HTTPException(status_code=404, detail="Inventory item not found")
+    response.headers["ETag"] = _etag(inventory)
     return inventory
 
 
+@router.get("/{inventory_id}/availability", response_model=InventoryAvailability)
+async def read_inventory_availability(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    inventory_id: UUID,
+) -> Any:
+    """
+    Stock of an inventory item that is not held by reservations.
+    """
+    availability = await crud.inventory.get_availability(db, id=inventory_id, tenant_id=tenant_id)
+    if not availability:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    return availability
+
+
 @router.post("/", response_model=InventoryPublic, status_code=status.HTTP_201_CREATED)
 async def create_inventory(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_tenant_db),
     tenant_id: UUID = Depends(deps.get_current_tenant),
     inventory_in: InventoryCreate,
+    response: Response,
 ) -> Any:
     """
     Create new inventory item.
     """
+    if not await crud.product.get(db, id=inventory_in.product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
     existing_item = await crud.inventory.get_by_product_and_tenant(
         db, product_id=inventory_in.product_id, tenant_id=tenant_id
     )
@@ -65,28 +220,52 @@ async def create_inventory(
             detail="This product is already in your inventory. Use PATCH to update stock.",
         )
 
-    return await crud.inventory.create_with_tenant(db, obj_in=inventory_in, tenant_id=tenant_id)
+    item = await crud.inventory.create_with_tenant(db, obj_in=inventory_in, tenant_id=tenant_id)
+    response.headers["ETag"] = _etag(item)
+    return item
 
 
 @router.patch("/{inventory_id}", response_model=InventoryPublic)
 async def update_inventory(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_tenant_db),
     tenant_id: UUID = Depends(deps.get_current_tenant),
     inventory_id: UUID,
     inventory_in: InventoryUpdate,
+    webhooks: WebhookDispatcher = Depends(deps.get_webhook_dispatcher),
+    response: Response,
+    if_match: Optional[str] = Header(None),
 ) -> Any:
     """
     Update an inventory item (e.g., add stock).
+    With `If-Match`, only while its version still matches one of the ETags given;
+    otherwise nothing is written and 412 is returned with the current `ETag`.
+    Notifies the tenant's webhooks when stock drops below the minimum.
     """
-    item = await crud.inventory.get(db, id=inventory_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Inventory item not found")
-
-    if item.tenant_id != tenant_id:
-        raise HTTPException(status_code=404, detail="Inventory item not found")
+    try:
+        updated = await crud.inventory.update_for_tenant(
+            db, id=inventory_id, tenant_id=tenant_id, obj_in=inventory_in, versions=_if_match_versions(if_match)
+        )
+    except IntegrityError:
+        # The one constraint an update can break: stock below the units reservations hold
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Stock can't go below the units held by reservations")
+    if updated is None:
+        # Only read once the update matched nothing, to tell a stale version from a missing item
+        item = await crud.inventory.get(db, id=inventory_id)
+        if not item or item.tenant_id != tenant_id:
+            raise HTTPException(status_code=404, detail="Inventory item not found")
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Inventory item was changed since it was read",
+            headers={"ETag": _etag(item)},
+        )
 
-    return await crud.inventory.update(db, db_obj=item, obj_in=inventory_in)
+    item, was_low = updated
+    if not was_low and is_low_stock(item):
+        webhooks.publish(tenant_id, low_stock_event(item))
+    response.headers["ETag"] = _etag(item)
+    return item
 
 
 @router.post(
@@ -96,7 +275,7 @@ async def update_inventory(
 )
 async def request_more_supply(
     *,
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_tenant_db),
     inventory_id: UUID,
     supply_in: SupplyRequest,
     current_user: User = Depends(deps.get_current_user),
@@ -123,5 +302,9 @@ async def request_more_supply(
         product_name=product.name,
         quantity=supply_in.quantity,
     )
+    # Counted as an open order, so the reorder engine doesn't order the same stock again
+    await crud.supply_order.record_placed(
+        db, inventory=inventory_item, quantity=supply_in.quantity, external_reference_id=response.external_reference_id
+    )
 
     return response
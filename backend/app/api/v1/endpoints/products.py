@@ -1,14 +1,30 @@
 from typing import Any, List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.api import deps
+from app.core.server_timing import TimedRoute
+from app.core.responses import FastJSONResponse
 from app.models.user import User
-from app.schemas.product import ProductCreate, ProductUpdate, ProductPublic
+from app.schemas.batch import BatchGetRequest
+from app.schemas.product import (
+    ProductBatchGetResult,
+    ProductCreate,
+    ProductUpdate,
+    ProductPublic,
+    ProductImportResult,
+)
+from app.services.product_import import ProductImportFormatError, ProductImportParser
+from app.services.purge import Purger
+from app.services.sharding import remove_from_shards, replicate_products
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Columns selected for list responses; kept in sync with the public schema
+PRODUCT_PUBLIC_FIELDS = tuple(ProductPublic.model_fields)
 
 
 @router.get("/", response_model=List[ProductPublic])
@@ -20,7 +36,8 @@ async def read_products(
     """
     Retrieve products.
     """
-    return await crud.product.get_multi(db, skip=skip, limit=limit)
+    rows = await crud.product.get_multi_rows(db, columns=PRODUCT_PUBLIC_FIELDS, skip=skip, limit=limit)
+    return FastJSONResponse(rows)
 
 
 # 2. CREATE
@@ -34,14 +51,78 @@ async def create_product(
     """
     Create new product.
     """
-    product = await crud.product.get_by_sku(db, sku=product_in.sku)
+    product = await crud.product.get_by_sku(db, sku=product_in.sku, include_deleted=True)
+    if product and product.deleted_at is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="The product with this SKU is still being deleted.",
+        )
     if product:
         raise HTTPException(
             status_code=400,
             detail="The product with this SKU already exists in the system.",
         )
 
-    return await crud.product.create(db, obj_in=product_in)
+    product = await crud.product.create(db, obj_in=product_in)
+    await replicate_products(db, ids=[product.id])
+    return product
+
+
+@router.post("/import", response_model=ProductImportResult)
+async def import_products(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Bulk import a product catalog, merging rows into products by SKU.
+
+    Send the catalog as the raw request body with `Content-Type: text/csv`
+    (header row with `sku`, `name`, optional `description`) or
+    `application/x-ndjson`. The body is streamed straight into COPY.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        parser = ProductImportParser(content_type)
+    except ProductImportFormatError as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc))
+
+    # Rows the import writes are stamped with its transaction's start
+    started = await db.scalar(select(func.now()))
+    try:
+        inserted, updated, unchanged, deleted_lines = await crud.product.bulk_upsert(
+            db, rows=parser.rows(request.stream())
+        )
+    except ProductImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    for line in deleted_lines:
+        parser.reject(line, "The product with this SKU is still being deleted.")
+    if inserted or updated:
+        await replicate_products(db, since=started)
+
+    return ProductImportResult(
+        inserted=inserted,
+        updated=updated,
+        unchanged=unchanged,
+        rejected=parser.rejected,
+        errors=parser.errors,
+    )
+
+
+@router.post("/batch-get", response_model=ProductBatchGetResult)
+async def batch_get_products(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    batch_in: BatchGetRequest,
+) -> Any:
+    """
+    Retrieve many products by `ids` or `skus` in one query.
+    `items` follows the request order, with null for keys listed in `missing`.
+    """
+    column = "sku" if batch_in.skus is not None else "id"
+    found = await crud.product.get_rows_by(db, column=column, values=batch_in.keys, columns=PRODUCT_PUBLIC_FIELDS)
+    return FastJSONResponse(batch_in.in_request_order(found))
 
 
 @router.get("/{product_id}", response_model=ProductPublic)
@@ -75,6 +156,7 @@ async def update_product(
         raise HTTPException(status_code=404, detail="Product not found")
 
     product = await crud.product.update(db, db_obj=product, obj_in=product_in)
+    await replicate_products(db, ids=[product.id])
     return product
 
 
@@ -83,14 +165,18 @@ async def delete_product(
     *,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_superuser),
+    purger: Purger = Depends(deps.get_purger),
+    background_tasks: BackgroundTasks,
     product_id: UUID,
 ) -> Any:
     """
     Delete a product.
+    It disappears at once; tenants' inventory of it is purged in the background.
     """
-    product = await crud.product.get(db, id=product_id)
+    product = await crud.product.remove(db, id=product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    await remove_from_shards(crud.product, id=product_id)
 
-    product = await crud.product.remove(db, id=product_id)
+    background_tasks.add_task(purger.run)
     return product
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api import deps
+from app.core.profiling import profile_path
+from app.core.server_timing import TimedRoute
+from app.models.user import User
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/{profile_id}", response_class=FileResponse)
+async def read_profile(
+    profile_id: str,
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> FileResponse:
+    """
+    Download a stored request profile in speedscope format.
+    """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=path.name)
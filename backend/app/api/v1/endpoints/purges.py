@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List
+from app import crud
+from app.api import deps
+from app.core.server_timing import TimedRoute
+from app.models.user import User
+from app.schemas.purge_job import PurgeJobPublic
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/", response_model=List[PurgeJobPublic])
+async def read_purges(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+    pending: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+) -> Any:
+    """
+    Purges of deleted products and tenants, newest first, with the rows removed so far.
+    """
+    return await crud.purge_job.get_recent(db, pending=pending, limit=limit)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any
+from uuid import UUID
+from app import crud
+from app.api import deps
+from app.core.server_timing import TimedRoute
+from app.schemas.reservation import ReservationCreate, ReservationPublic
+from app.services.webhooks import WebhookDispatcher, is_low_stock, low_stock_event
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.post("/", response_model=ReservationPublic, status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    reservation_in: ReservationCreate,
+) -> Any:
+    """
+    Hold stock of an inventory item, e.g. while a checkout completes.
+    The hold lapses after `ttl_seconds` unless committed or released first.
+    """
+    reservation = await crud.reservation.reserve(db, obj_in=reservation_in, tenant_id=tenant_id)
+    if reservation is None:
+        # Only read once the hold failed, to tell a missing item from one sold out
+        item = await crud.inventory.get(db, id=reservation_in.inventory_id)
+        if not item or item.tenant_id != tenant_id:
+            raise HTTPException(status_code=404, detail="Inventory item not found")
+        raise HTTPException(status_code=409, detail="Not enough stock available")
+    return reservation
+
+
+@router.post("/{reservation_id}/commit", response_model=ReservationPublic)
+async def commit_reservation(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    reservation_id: UUID,
+    webhooks: WebhookDispatcher = Depends(deps.get_webhook_dispatcher),
+) -> Any:
+    """
+    Complete a reservation: its units are taken out of the item's stock.
+    Notifies the tenant's webhooks when stock drops below the minimum.
+    """
+    committed = await crud.reservation.commit(db, id=reservation_id, tenant_id=tenant_id)
+    if committed is None:
+        raise HTTPException(status_code=404, detail="Reservation not found or expired")
+
+    reservation, item, was_low = committed
+    if not was_low and is_low_stock(item):
+        webhooks.publish(tenant_id, low_stock_event(item))
+    return reservation
+
+
+@router.delete("/{reservation_id}", response_model=ReservationPublic)
+async def release_reservation(
+    *,
+    db: AsyncSession = Depends(deps.get_tenant_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    reservation_id: UUID,
+) -> Any:
+    """
+    Release a reservation before it expires, making its units available again.
+    """
+    reservation = await crud.reservation.release(db, id=reservation_id, tenant_id=tenant_id)
+    if reservation is None:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    return reservation
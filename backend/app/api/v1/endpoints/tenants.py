@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any, List
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 from app import crud
 from app.api import deps
+from app.core.config import settings
+from app.core.server_timing import TimedRoute
 from app.models.user import User
 from app.schemas.tenant import TenantPublic
+from app.services.export import (
+    ARROW_FORMAT,
+    MEDIA_TYPES,
+    ExportColumnError,
+    export_filename,
+    export_inventory,
+    resolve_columns,
+)
+from app.services.purge import Purger
+from app.services.sharding import remove_from_shards
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[TenantPublic])
@@ -18,3 +32,53 @@ async def read_tenants(
     Retrieve all tenants.
     """
     return await crud.tenant.get_multi(db)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_all_inventories(
+    db: AsyncSession = Depends(deps.get_db),
+    shard_dbs: Dict[str, AsyncSession] = Depends(deps.get_shard_dbs),
+    current_user: User = Depends(deps.get_current_active_superuser),
+    fmt: str = Query(ARROW_FORMAT, alias="format", pattern="^(arrow|parquet)$"),
+    columns: Optional[str] = None,
+    tenant_id: Optional[UUID] = None,
+) -> StreamingResponse:
+    """
+    Export the inventory of every tenant, or of `tenant_id` only, as Arrow IPC or Parquet.
+    `columns` is a comma-separated projection; by default every column is exported.
+    """
+    try:
+        names = resolve_columns(columns)
+    except ExportColumnError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    sources = list(shard_dbs.values())
+    if tenant_id is not None and len(sources) > 1:
+        shard = await crud.tenant.get_shard(db, tenant_id=tenant_id)
+        sources = [shard_dbs[shard]] if shard else []
+    return StreamingResponse(
+        export_inventory(sources, fmt=fmt, columns=names, tenant_id=tenant_id, batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(fmt)}"'},
+    )
+
+
+@router.delete("/{tenant_id}", response_model=TenantPublic)
+async def delete_tenant(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+    purger: Purger = Depends(deps.get_purger),
+    background_tasks: BackgroundTasks,
+    tenant_id: UUID,
+) -> Any:
+    """
+    Delete a tenant.
+    Its users are locked out at once; its data is purged in the background.
+    """
+    tenant = await crud.tenant.remove(db, id=tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+    await remove_from_shards(crud.tenant, id=tenant_id, only=[tenant.shard])
+
+    background_tasks.add_task(purger.run)
+    return tenant
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List
+from uuid import UUID
+from app import crud
+from app.api import deps
+from app.core.server_timing import TimedRoute
+from app.schemas.webhook import WebhookCreate, WebhookCreated, WebhookPublic, WebhookUpdate
+from app.services.webhooks import UnsafeWebhookURL, public_address
+
+router = APIRouter(route_class=TimedRoute)
+
+
+async def _get_tenant_webhook(db: AsyncSession, webhook_id: UUID, tenant_id: UUID):
+    webhook = await crud.webhook.get(db, id=webhook_id)
+    if not webhook or webhook.tenant_id != tenant_id:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return webhook
+
+
+@router.get("/", response_model=List[WebhookPublic])
+async def read_webhooks(
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+) -> Any:
+    """
+    List your tenant's webhooks.
+    """
+    return await crud.webhook.get_multi_by_tenant(db, tenant_id=tenant_id)
+
+
+@router.post("/", response_model=WebhookCreated, status_code=status.HTTP_201_CREATED)
+async def create_webhook(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    webhook_in: WebhookCreate,
+) -> Any:
+    """
+    Register a webhook for low-stock alerts. The URL's host must resolve to public
+    addresses only. The signing secret is only returned here.
+    """
+    try:
+        await public_address(str(webhook_in.url))
+    except UnsafeWebhookURL as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return await crud.webhook.create_with_tenant(db, obj_in=webhook_in, tenant_id=tenant_id)
+
+
+@router.patch("/{webhook_id}", response_model=WebhookPublic)
+async def update_webhook(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    webhook_id: UUID,
+    webhook_in: WebhookUpdate,
+) -> Any:
+    """
+    Pause or resume deliveries to a webhook.
+    """
+    webhook = await _get_tenant_webhook(db, webhook_id, tenant_id)
+    return await crud.webhook.update(db, db_obj=webhook, obj_in=webhook_in)
+
+
+@router.delete("/{webhook_id}", response_model=WebhookPublic)
+async def delete_webhook(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    tenant_id: UUID = Depends(deps.get_current_tenant),
+    webhook_id: UUID,
+) -> Any:
+    """
+    Delete a webhook.
+    """
+    await _get_tenant_webhook(db, webhook_id, tenant_id)
+    return await crud.webhook.remove(db, id=webhook_id)
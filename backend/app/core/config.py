@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,8 +13,80 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Lifetime of a refresh token; each refresh issues a new one
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     API_V1_STR: str = "/api/v1"
     PASSWORD_MAX_LENGTH: int = 72
+    # Threads running bcrypt off the event loop (bcrypt releases the GIL)
+    PASSWORD_HASH_WORKERS: int = 4
+    # Processes for bulk password hashing; 0 means one per CPU
+    PASSWORD_HASH_PROCESSES: int = 0
+    # Statements slower than this are logged (parameters redacted)
+    SLOW_QUERY_MS: int = 200
+    # A statement repeated this many times in one request is logged as an N+1 candidate
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # Server-Timing header: on for every request, or per request via X-Server-Timing-Token
+    SERVER_TIMING_ENABLED: bool = False
+    SERVER_TIMING_TOKEN: Optional[str] = None
+    # Sampling profiler: superusers opt in with X-Profile: 1; a fraction of all requests can be sampled too
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 1.0
+    PROFILE_DIR: str = "/tmp/profiles"
+    PROFILE_MAX_FILES: int = 50
+    # Profiling stops this long into a request, however long it keeps running
+    PROFILE_MAX_SECONDS: float = 30.0
+    # Inventory change stream: writes within this window reach subscribers as one batch
+    INVENTORY_STREAM_COALESCE_MS: int = 250
+    INVENTORY_STREAM_HEARTBEAT_SECONDS: int = 15
+    # Clients resuming from an older cursor are told to reload the full list
+    INVENTORY_CHANGES_RETENTION_HOURS: int = 24
+    # Low-stock webhooks: events per tenant are batched over this window, then retried with backoff
+    WEBHOOK_BATCH_WINDOW_SECONDS: float = 5.0
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_RETRY_BACKOFF_SECONDS: float = 1.0
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    WEBHOOK_MAX_CONNECTIONS: int = 100
+    # Reorder engine: rows per page, supplier requests in flight, fallback target (x min_stock),
+    # and how long a placed order counts as still on its way
+    REORDER_BATCH_SIZE: int = 5000
+    REORDER_CONCURRENCY: int = 16
+    REORDER_TARGET_MULTIPLIER: int = 2
+    REORDER_LEAD_TIME_HOURS: int = 72
+    # Demand forecast: days of consumption kept and read, the moving-average window,
+    # the exponential-smoothing factor, and how many tenants' forecasts each worker caches
+    FORECAST_HISTORY_DAYS: int = 56
+    FORECAST_WINDOW_DAYS: int = 28
+    FORECAST_SMOOTHING: float = 0.3
+    FORECAST_CACHE_TENANTS: int = 128
+    # Idempotency-Key: how long responses are replayed, how long a retry waits for the
+    # first request (polling other workers), and when an unfinished claim is abandoned
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_MS: int = 100
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    # Keys accepted by one batch-get request
+    BATCH_GET_MAX_KEYS: int = 1000
+    # Rows per Arrow record batch / Parquet row group in exports
+    EXPORT_BATCH_SIZE: int = 50000
+    # Purge of deleted products and tenants: rows per transaction, pause between them
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_PAUSE_MS: int = 50
+    # Users per bulk invite, and per chunk hashed, inserted and streamed back together.
+    # A chunk's INSERT binds 7 parameters per row, well under Postgres' 32767 per statement.
+    BULK_INVITE_MAX_USERS: int = 5000
+    BULK_INVITE_CHUNK_SIZE: int = 100
+    # Extra databases holding tenant data, by shard name (JSON in the environment). DATABASE_URL
+    # is the "default" shard and also holds the global tables; each shard has its own pool.
+    DATABASE_SHARDS: Dict[str, str] = {}
+    SHARD_POOL_SIZE: int = 5
+    SHARD_MAX_OVERFLOW: int = 10
+    # Tenant moves: rows per copy/delete transaction, and catch-up rounds before the cutover
+    TENANT_MOVE_BATCH_SIZE: int = 5000
+    TENANT_MOVE_MAX_ROUNDS: int = 5
+    # Stock reservations: default and longest hold, and holds expired per sweeper transaction
+    RESERVATION_TTL_SECONDS: int = 600
+    RESERVATION_MAX_TTL_SECONDS: int = 3600
+    RESERVATION_SWEEP_BATCH_SIZE: int = 1000
 
 
 settings = Settings()
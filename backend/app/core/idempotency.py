@@ -0,0 +1,220 @@
+"""
+Idempotency-Key support for write endpoints.
+
+A POST, PUT, PATCH or DELETE from a tenant user that carries `Idempotency-Key`
+runs once per (tenant, key). Its response is stored for `IDEMPOTENCY_TTL_HOURS`,
+and retries with the same key get the stored response back without running the
+handler again, marked `Idempotent-Replayed: true`. A retry that arrives while
+the first request is still running waits for its response. Waiters in the same
+worker are woken directly, and other workers poll every `IDEMPOTENCY_POLL_MS`.
+A retry storm therefore costs one execution.
+
+Reusing a key for a different method, path or body is rejected with 422. A wait
+longer than `IDEMPOTENCY_WAIT_SECONDS` gets 409. Server errors are not stored,
+so the next retry runs the handler again.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import crud
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.logger import get_logger
+
+log = get_logger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+IDEMPOTENT_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+PRUNE_EVERY = timedelta(hours=1)
+
+# Requests running in this worker, so duplicates can wait without polling
+_in_flight: Dict[Tuple[UUID, str], asyncio.Event] = {}
+
+
+def request_hash(scope: Scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(part + b"\0")
+    return digest.hexdigest()
+
+
+async def _read_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """
+    Read the whole request body, returning it with a `receive` that replays it.
+    """
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
+
+
+async def _send_json(send: Send, status_code: int, content: dict) -> None:
+    body = orjson.dumps(content)
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        """
+        ASGI middleware that runs each (tenant, Idempotency-Key) write once and replays its response.
+        """
+        self.app = app
+        self.session_factory = session_factory
+        self._last_prune = datetime.min.replace(tzinfo=timezone.utc)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = Headers(scope=scope).get(IDEMPOTENCY_HEADER) if scope["type"] == "http" else None
+        if key is None or scope["method"] not in IDEMPOTENT_METHODS:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"})
+            return
+        tenant_id = await self._tenant_id(scope)
+        if tenant_id is None:
+            # Unauthenticated or tenantless callers get the endpoint's own response
+            await self.app(scope, receive, send)
+            return
+
+        body, receive = await _read_body(receive)
+        fingerprint = request_hash(scope, body)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            async with self.session_factory() as db:
+                claimed_at = await crud.idempotency_key.claim(
+                    db,
+                    tenant_id=tenant_id,
+                    key=key,
+                    request_hash=fingerprint,
+                    ttl=timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+                    lock=timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+                )
+                if claimed_at is not None:
+                    break
+                stored = await crud.idempotency_key.get_by_key(db, tenant_id=tenant_id, key=key)
+            if stored is None:
+                # Released between our claim and read; try to claim it again
+                continue
+            if stored.request_hash != fingerprint:
+                await _send_json(send, 422, {"detail": "Idempotency-Key was already used for a different request"})
+                return
+            if stored.status_code is not None:
+                await self._replay(send, stored.status_code, stored.content_type, stored.body)
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await _send_json(send, 409, {"detail": "A request with this Idempotency-Key is still in progress"})
+                return
+            await self._wait(tenant_id, key, remaining)
+
+        await self._run_once(scope, receive, send, tenant_id, key, claimed_at)
+
+    async def _tenant_id(self, scope: Scope) -> Optional[UUID]:
+        # Imported here: deps pulls in the whole CRUD layer
+        from app.api import deps
+
+        authorization = Headers(scope=scope).get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        async with self.session_factory() as db:
+            try:
+                user = await deps.get_current_user(request=Request(scope), db=db, token=token)
+            except HTTPException:
+                return None
+        return user.tenant_id
+
+    async def _wait(self, tenant_id: UUID, key: str, remaining: float) -> None:
+        in_flight = _in_flight.get((tenant_id, key))
+        if in_flight is None:
+            await asyncio.sleep(min(remaining, settings.IDEMPOTENCY_POLL_MS / 1000))
+            return
+        try:
+            await asyncio.wait_for(in_flight.wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _replay(self, send: Send, status_code: int, content_type: Optional[str], body: bytes) -> None:
+        headers = [(b"content-length", str(len(body)).encode()), (REPLAYED_HEADER, b"true")]
+        if content_type:
+            headers.append((b"content-type", content_type.encode("latin-1")))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _run_once(
+        self, scope: Scope, receive: Receive, send: Send, tenant_id: UUID, key: str, claimed_at: datetime
+    ) -> None:
+        done = _in_flight[(tenant_id, key)] = asyncio.Event()
+        response: Dict[str, object] = {}
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["content_type"] = Headers(raw=message.get("headers", [])).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            status_code = response.get("status")
+            async with self.session_factory() as db:
+                if isinstance(status_code, int) and status_code < 500:
+                    await crud.idempotency_key.complete(
+                        db,
+                        tenant_id=tenant_id,
+                        key=key,
+                        claimed_at=claimed_at,
+                        status_code=status_code,
+                        content_type=response["content_type"],
+                        body=b"".join(chunks),
+                    )
+                else:
+                    await crud.idempotency_key.release(db, tenant_id=tenant_id, key=key, claimed_at=claimed_at)
+                await self._prune_if_due(db)
+            # A retry that took over a lapsed claim has its own event by now
+            if _in_flight.get((tenant_id, key)) is done:
+                del _in_flight[(tenant_id, key)]
+            done.set()
+
+    async def _prune_if_due(self, db: AsyncSession) -> None:
+        now = datetime.now(timezone.utc)
+        if now - self._last_prune < PRUNE_EVERY:
+            return
+        self._last_prune = now
+        pruned = await crud.idempotency_key.prune_expired(db)
+        if pruned:
+            log.info("Pruned %s expired idempotency keys", pruned)
@@ -0,0 +1,166 @@
+"""
+Prometheus metrics for the API.
+
+Set `PROMETHEUS_MULTIPROC_DIR` to an empty, writable directory before starting
+multiple workers; every worker then writes to it and `/metrics` aggregates them.
+Without it, each process reports only its own metrics.
+"""
+
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_PATH = "/metrics"
+
+# Label used for requests that matched no route, so unknown paths can't explode cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+# gunicorn_conf.py empties it on start; any other runner (uvicorn --reload, scripts)
+# only needs it to exist before the first metric value is written
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured size of the database connection pools, summed over shards",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_connections_open",
+    "Database connections currently open",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify jobs waiting for a bcrypt executor thread",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent in bcrypt, excluding queueing",
+    ["operation"],
+)
+
+SUPPLIER_LATENCY = Histogram(
+    "supplier_request_duration_seconds",
+    "Latency of calls to the external supplier API",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the matched route's path template (e.g. `/api/v1/inventory/{inventory_id}`).
+    """
+    # Newer FastAPI keeps included routers nested, so `scope["route"]` only knows the
+    # path relative to its router; the effective route context carries the full one.
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Return the exposition payload and its content type.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Track pool usage through pool events, so every worker's gauges stay current.
+    """
+    pool = engine.sync_engine.pool
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.inc(pool.size())
+
+    event.listen(pool, "connect", lambda *_: DB_POOL_OPEN.inc())
+    event.listen(pool, "close", lambda *_: DB_POOL_OPEN.dec())
+    event.listen(pool, "close_detached", lambda *_: DB_POOL_OPEN.dec())
+    event.listen(pool, "checkout", lambda *_: DB_POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *_: DB_POOL_CHECKED_OUT.dec())
+
+
+class PrometheusMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware recording request count, latency and in-flight requests,
+        labelled by the matched route template rather than the raw path.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            labels = (method, route_template(scope), str(status_code or 500))
+            REQUEST_COUNT.labels(*labels).inc()
+            REQUEST_LATENCY.labels(*labels).observe(duration)
@@ -0,0 +1,146 @@
+"""
+On-demand sampling profiler for live requests.
+
+A request is profiled when a superuser sends `X-Profile: 1`, or when it is
+picked by `PROFILE_SAMPLE_RATE`. The profile is written in speedscope format
+(open it at https://www.speedscope.app) to `PROFILE_DIR`, and its id is
+returned in the `X-Profile-Id` header; superusers can download it from
+`GET /api/v1/profiles/{profile_id}`.
+
+Overhead is bounded so this can stay on in production: requests that are not
+profiled only pay for a header check, at most one request per worker is
+profiled at a time (others run unprofiled), sampling runs at
+`PROFILE_INTERVAL_MS` and stops after `PROFILE_MAX_SECONDS`, streaming responses
+are not profiled, and only the newest `PROFILE_MAX_FILES` profiles are kept.
+"""
+
+import asyncio
+import random
+import re
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.logger import get_logger
+
+log = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+_profiling_lock = asyncio.Lock()
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """
+    Return the stored profile's path, or None for unknown or malformed ids.
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}{PROFILE_SUFFIX}"
+    return path if path.is_file() else None
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+
+async def _is_superuser(scope: Scope) -> bool:
+    # Imported here: deps pulls in the whole CRUD layer
+    from app.api import deps
+
+    token = _bearer_token(scope)
+    if token is None:
+        return False
+
+    # Respect dependency overrides (tests swap the session this way)
+    get_db = scope["app"].dependency_overrides.get(deps.get_db, deps.get_db)
+    sessions = get_db()
+    db = await anext(sessions)
+    try:
+        user = await deps.get_current_user(request=Request(scope), db=db, token=token)
+        await deps.get_current_active_superuser(current_user=user)
+    except HTTPException:
+        return False
+    finally:
+        await sessions.aclose()
+    return True
+
+
+async def _should_profile(scope: Scope) -> bool:
+    if dict(scope["headers"]).get(PROFILE_HEADER) == b"1":
+        return await _is_superuser(scope)
+    return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def _store(profiler: Profiler, profile_id: str) -> None:
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{profile_id}{PROFILE_SUFFIX}").write_text(profiler.output(SpeedscopeRenderer()))
+
+    stored = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda path: path.stat().st_mtime)
+    for old in stored[: -settings.PROFILE_MAX_FILES]:
+        old.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that runs a statistical profiler around selected requests.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _profiling_lock.locked() or not await _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        # Checked again without awaiting before the acquire, which then can't wait:
+        # a request picked while another is profiled runs unprofiled, never queued
+        if _profiling_lock.locked():
+            await self.app(scope, receive, send)
+            return
+        await _profiling_lock.acquire()
+
+        profile_id = uuid.uuid4().hex
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL_MS / 1000, async_mode="enabled")
+        keep = True
+
+        def stop() -> None:
+            if profiler.is_running:
+                profiler.stop()
+                _profiling_lock.release()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal keep
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "content-length" in headers:
+                    headers.append(PROFILE_ID_HEADER, profile_id)
+                else:
+                    # A streaming response (change stream, export) may run for hours
+                    keep = False
+                    stop()
+            await send(message)
+
+        profiler.start()
+        timer = asyncio.get_running_loop().call_later(settings.PROFILE_MAX_SECONDS, stop)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            timer.cancel()
+            stop()
+            if keep:
+                await asyncio.to_thread(_store, profiler, profile_id)
+                log.info("Stored profile %s for %s %s", profile_id, scope["method"], scope["path"])
@@ -0,0 +1,56 @@
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logger import get_logger, request_id_var, tenant_id_var
+
+log = get_logger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that binds a request id (taken from `X-Request-ID` or generated)
+        to the logging context, echoes it back, and writes one access log line per request.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.lower().encode())
+        request_id = incoming.decode("latin-1")[:128] if incoming else uuid.uuid4().hex
+        request_token = request_id_var.set(request_id)
+        tenant_token = tenant_id_var.set(None)
+        # Shared with every layer below, unlike context variables that middleware
+        # running the app in a copied context (BaseHTTPMiddleware) sets
+        state = scope.setdefault("state", {})
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            log.info(
+                "%s %s %s",
+                scope["method"],
+                scope["path"],
+                status_code,
+                extra={"duration_ms": duration_ms, "tenant_id": state.get("tenant_id")},
+            )
+            tenant_id_var.reset(tenant_token)
+            request_id_var.reset(request_token)
@@ -1,11 +1,28 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from itertools import chain
+from typing import Any, Callable, List, Optional, Sequence, TypeVar, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_LATENCY, PASSWORD_HASH_QUEUE_DEPTH
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow; run it here so it never blocks the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+# Bulk hashing (thousands of provisioned users) fans out over processes instead; started on first use
+_hash_processes: Optional[ProcessPoolExecutor] = None
+
+T = TypeVar("T")
+
 ALGORITHM = "HS256"
 
 
@@ -20,6 +37,15 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    # Refresh tokens are 256 random bits, so a fast digest is enough; bcrypt would defeat their purpose
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     max_bytes = settings.PASSWORD_MAX_LENGTH
     if len(plain_password.encode("utf-8")) > max_bytes:
@@ -32,3 +58,82 @@ def get_password_hash(password: str) -> str:
     if len(password.encode("utf-8")) > max_bytes:
         password = password.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
     return pwd_context.hash(password)
+
+
+class _QueueSlot:
+    """
+    Counts a job in the queue-depth gauge until it starts running or is cancelled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queued = True
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._queued:
+                self._queued = False
+                PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+
+async def _run_in_hash_executor(operation: str, fn: Callable[..., T], *args: Any) -> T:
+    slot = _QueueSlot()
+
+    def job() -> T:
+        slot.release()
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, job)
+    finally:
+        slot.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_executor("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor("hash", get_password_hash, password)
+
+
+def _hash_process_count() -> int:
+    return settings.PASSWORD_HASH_PROCESSES or os.cpu_count() or 1
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+async def get_password_hashes_parallel(passwords: Sequence[str]) -> List[str]:
+    """
+    Hash many passwords across a pool of `PASSWORD_HASH_PROCESSES` processes, in input order.
+    Each process gets a few chunks, so the pickling overhead is per chunk, not per password.
+    """
+    global _hash_processes
+    if not passwords:
+        return []
+    if _hash_processes is None:
+        # Spawned, not forked: forking a process with running threads and an event loop is unsafe
+        _hash_processes = ProcessPoolExecutor(
+            max_workers=_hash_process_count(), mp_context=multiprocessing.get_context("spawn")
+        )
+    size = -(-len(passwords) // (_hash_process_count() * 4))
+    chunks = [list(passwords[start : start + size]) for start in range(0, len(passwords), size)]
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    hashed = await asyncio.gather(*(loop.run_in_executor(_hash_processes, _hash_many, chunk) for chunk in chunks))
+    PASSWORD_HASH_LATENCY.labels("bulk_hash").observe(time.perf_counter() - start)
+    return list(chain.from_iterable(hashed))
+
+
+def shutdown_hash_processes() -> None:
+    global _hash_processes
+    if _hash_processes is not None:
+        _hash_processes.shutdown(cancel_futures=True)
+        _hash_processes = None
@@ -0,0 +1,145 @@
+"""
+Per-request latency breakdown reported in a `Server-Timing` response header.
+
+Phases are accumulated in a context variable while the request runs:
+
+* `auth` – JWT decode and user lookup in `deps.get_current_user`
+* `db` – all SQL statements (overlaps `auth`, which runs one)
+* `supplier` – calls to the external supplier API
+* `serialize` – building the response body after the endpoint returns
+* `total` – everything up to the response headers
+
+Only requests that opt in pay for it: enable it for every request with
+`SERVER_TIMING_ENABLED`, or per request by sending `SERVER_TIMING_TOKEN`
+in the `X-Server-Timing-Token` header.
+"""
+
+import functools
+import inspect
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.instrumentation import track_queries
+
+TOKEN_HEADER = "x-server-timing-token"
+
+
+class ServerTiming:
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.endpoint_done: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self, **extra: float) -> str:
+        entries = {**self.phases, **extra}
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in entries.items())
+
+
+_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def timing_phase(name: str) -> Iterator[None]:
+    """
+    Add the block's duration to the named phase. A no-op unless timing is active.
+    """
+    timing = _timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+def _timing_requested(scope: Scope) -> bool:
+    if settings.SERVER_TIMING_ENABLED:
+        return True
+    if not settings.SERVER_TIMING_TOKEN:
+        return False
+    token = dict(scope["headers"]).get(TOKEN_HEADER.encode())
+    return token is not None and secrets.compare_digest(token, settings.SERVER_TIMING_TOKEN.encode())
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that collects phase timings for opted-in requests and
+        writes them to the `Server-Timing` header.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _timing_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        timing = ServerTiming()
+        token = _timing.set(timing)
+        start = time.perf_counter()
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    timing.add("db", stats.duration)
+                    header = timing.header(total=time.perf_counter() - start)
+                    MutableHeaders(scope=message).append("Server-Timing", header)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _timing.reset(token)
+
+
+def _mark_endpoint_done(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing = _timing.get()
+            if timing is not None:
+                timing.endpoint_done = time.perf_counter()
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class that attributes the time between the endpoint returning and the
+    response being ready (response_model validation and encoding) to `serialize`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            response = await handler(request)
+            timing = _timing.get()
+            if timing is not None and timing.endpoint_done is not None:
+                timing.add("serialize", time.perf_counter() - timing.endpoint_done)
+            return response
+
+        return timed_handler
@@ -0,0 +1,21 @@
+"""
+Gunicorn worker class for production (see `gunicorn_conf.py`).
+"""
+
+from typing import Any
+
+from uvicorn_worker import UvicornWorker
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop and httptools. Access logging is left to
+    RequestContextMiddleware, which already writes one line per request.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "access_log": False}
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Let in-flight requests finish within gunicorn's graceful timeout on shutdown
+        self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout
@@ -2,3 +2,10 @@ from .crud_product import product as product
 from .crud_tenant import tenant as tenant
 from .crud_inventory import inventory as inventory
 from .crud_user import user as user
+from .crud_webhook import webhook as webhook
+from .crud_supply_order import supply_order as supply_order
+from .crud_reorder_run import reorder_run as reorder_run
+from .crud_idempotency_key import idempotency_key as idempotency_key
+from .crud_purge_job import purge_job as purge_job
+from .crud_refresh_token import refresh_token as refresh_token
+from .crud_reservation import reservation as reservation
@@ -1,11 +1,17 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime, timezone
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
+from app.crud.single_flight import fetch_one
 from app.db.session import Base
+from app.models.mixins import SoftDeleteMixin
+from app.models.purge_job import PurgeJob
 
 # Generic Types
 ModelType = TypeVar("ModelType", bound=Base)
@@ -26,19 +32,44 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """
         Get a single record by ID.
+        Concurrent lookups of the same ID share one query (see `single_flight`).
         """
-        query = select(self.model).where(self.model.id == id)
-        result = await db.execute(query)
-        return result.scalars().first()
+        query = self._live(select(self.model).where(self.model.id == id))
+        return await fetch_one(db, self.model, query, key=("id", id))
 
     async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """
         Get multiple records with pagination.
         """
-        query = select(self.model).offset(skip).limit(limit)
+        query = self._live(select(self.model)).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_multi_rows(
+        self, db: AsyncSession, *, columns: Sequence[str], skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Get multiple records as plain dicts holding only the given columns.
+        Skips ORM object hydration, for read-only list responses.
+        """
+        query = self._live(select(*(getattr(self.model, column) for column in columns))).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_rows_by(
+        self, db: AsyncSession, *, column: str, values: Sequence[Any], columns: Sequence[str]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Get the records whose `column` is any of `values` as plain dicts of `columns`, keyed by that value.
+        The values are bound as one array, so any number of them is a single statement.
+        """
+        key = getattr(self.model, column)
+        query = self._live(select(key.label("batch_key"), *(getattr(self.model, name) for name in columns))).where(
+            key == any_(bindparam("values", list(values), type_=ARRAY(key.type)))
+        )
+        result = await db.execute(query)
+        return {row.pop("batch_key"): row for row in map(dict, result.mappings())}
+
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """
         Create a new record.
@@ -84,13 +115,30 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def remove(self, db: AsyncSession, *, id: UUID) -> Optional[ModelType]:
         """
         Delete a record by ID.
+        Soft-deletable records are only marked deleted, with a purge job queued
+        to remove them and their dependents in batches (see `services.purge`).
         """
-        query = select(self.model).where(self.model.id == id)
+        query = self._live(select(self.model).where(self.model.id == id)).with_for_update()
         result = await db.execute(query)
         obj = result.scalars().first()
 
         if obj:
-            await db.delete(obj)
+            if isinstance(obj, SoftDeleteMixin):
+                await self._mark_deleted(db, db_obj=obj)
+            else:
+                await db.delete(obj)
             await db.commit()
 
         return obj
+
+    async def _mark_deleted(self, db: AsyncSession, *, db_obj: ModelType) -> None:
+        db_obj.deleted_at = datetime.now(timezone.utc)
+        db.add(PurgeJob(table_name=self.model.__tablename__, entity_id=db_obj.id, rows_deleted=0))
+
+    def _live(self, query: Select) -> Select:
+        """
+        Restrict `query` to records that are not soft-deleted.
+        """
+        if issubclass(self.model, SoftDeleteMixin):
+            query = query.where(self.model.deleted_at.is_(None))
+        return query
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.idempotency_key import IdempotencyKey
+
+
+class CRUDIdempotencyKey(CRUDBase[IdempotencyKey, BaseModel, BaseModel]):
+    async def claim(
+        self,
+        db: AsyncSession,
+        *,
+        tenant_id: UUID,
+        key: str,
+        request_hash: str,
+        ttl: timedelta,
+        lock: timedelta,
+    ) -> Optional[datetime]:
+        """
+        Reserve the key for a first execution. Fails while another request holds
+        it or its response is stored, unless that has expired or its lock lapsed.
+        Returns the claim's `created_at`, which completing or releasing it must
+        match: a claim whose lock lapsed may have been taken over since.
+        """
+        now = datetime.now(timezone.utc)
+        values = {
+            "request_hash": request_hash,
+            "status_code": None,
+            "content_type": None,
+            "body": None,
+            "created_at": now,
+            "locked_until": now + lock,
+            "expires_at": now + ttl,
+        }
+        query = (
+            insert(IdempotencyKey)
+            .values(tenant_id=tenant_id, key=key, **values)
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.tenant_id, IdempotencyKey.key],
+                set_=values,
+                where=or_(
+                    IdempotencyKey.expires_at < func.now(),
+                    (IdempotencyKey.status_code.is_(None)) & (IdempotencyKey.locked_until < func.now()),
+                ),
+            )
+            .returning(IdempotencyKey.created_at)
+        )
+        claimed_at = await db.scalar(query)
+        await db.commit()
+        return claimed_at
+
+    async def get_by_key(self, db: AsyncSession, *, tenant_id: UUID, key: str) -> Optional[IdempotencyKey]:
+        query = (
+            select(IdempotencyKey)
+            .where(IdempotencyKey.tenant_id == tenant_id, IdempotencyKey.key == key)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(query)
+        return result.scalars().first()
+
+    async def complete(
+        self,
+        db: AsyncSession,
+        *,
+        tenant_id: UUID,
+        key: str,
+        claimed_at: datetime,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes,
+    ) -> None:
+        """
+        Store the response of the claim made at `claimed_at`, unless it was taken over.
+        """
+        await db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at == claimed_at,
+            )
+            .values(status_code=status_code, content_type=content_type, body=body)
+        )
+        await db.commit()
+
+    async def release(self, db: AsyncSession, *, tenant_id: UUID, key: str, claimed_at: datetime) -> None:
+        """
+        Drop the unfinished claim made at `claimed_at` so the next retry executes again.
+        """
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at == claimed_at,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        await db.commit()
+
+    async def prune_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now()))
+        await db.commit()
+        return result.rowcount
+
+
+idempotency_key = CRUDIdempotencyKey(IdempotencyKey)
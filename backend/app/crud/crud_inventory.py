@@ -1,21 +1,123 @@
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    Integer,
+    Text,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, distinct_on, insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.crud.base import CRUDBase
+from app.crud.single_flight import fetch_one
 from app.models.inventory import Inventory
+from app.models.inventory_change import InventoryChange, InventoryChangePrune
+from app.models.inventory_consumption import InventoryConsumption
+from app.models.inventory_summary import InventorySummary
+from app.models.product import Product
 from app.schemas.inventory import InventoryCreate, InventoryUpdate
 
 
+def _of_live_products(query):
+    """
+    Leave out items of deleted products; they only wait for the purger.
+    """
+    return query.join(Product, Product.id == Inventory.product_id).where(Product.deleted_at.is_(None))
+
+
+def _product_is_live() -> ColumnElement:
+    # EXISTS rather than a join, for statements that don't read the product
+    return Inventory.product.has(Product.deleted_at.is_(None))
+
+
 class CRUDInventory(CRUDBase[Inventory, InventoryCreate, InventoryUpdate]):
+    def _live(self, query: Select) -> Select:
+        """
+        Restrict `query` to items whose product is not deleted.
+        """
+        return query.where(_product_is_live())
+
     async def get_multi_by_tenant(
         self, db: AsyncSession, *, tenant_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Inventory]:
-        query = select(Inventory).where(Inventory.tenant_id == tenant_id).offset(skip).limit(limit)
+        query = _of_live_products(select(Inventory)).where(Inventory.tenant_id == tenant_id).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_multi_rows_by_tenant(
+        self,
+        db: AsyncSession,
+        *,
+        tenant_id: UUID,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        query = (
+            _of_live_products(select(*(getattr(Inventory, column) for column in columns)))
+            .where(Inventory.tenant_id == tenant_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_rows_by_tenant(
+        self,
+        db: AsyncSession,
+        *,
+        tenant_id: UUID,
+        columns: Sequence[str],
+        product_ids: Optional[Sequence[UUID]] = None,
+        skus: Optional[Sequence[str]] = None,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Get the tenant's items of any of `product_ids`, or whose product has any of `skus`,
+        as plain dicts of `columns` keyed by the product id or SKU. One statement either way.
+        """
+        query = _of_live_products(select(*(getattr(Inventory, column) for column in columns))).where(
+            Inventory.tenant_id == tenant_id
+        )
+        if skus is not None:
+            key = Product.sku
+            values: Sequence[Any] = skus
+        else:
+            key, values = Inventory.product_id, product_ids or []
+        query = query.add_columns(key.label("batch_key")).where(
+            key == any_(bindparam("values", list(values), type_=ARRAY(key.type)))
+        )
+        result = await db.execute(query)
+        return {row.pop("batch_key"): row for row in map(dict, result.mappings())}
+
+    async def get_availability(self, db: AsyncSession, *, id: UUID, tenant_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Stock of the tenant's item net of its reservations, read off the item's row.
+        """
+        query = self._live(
+            select(
+                Inventory.id,
+                Inventory.current_stock,
+                Inventory.reserved_stock,
+                (Inventory.current_stock - Inventory.reserved_stock).label("available_stock"),
+            ).where(Inventory.id == id, Inventory.tenant_id == tenant_id)
+        )
+        row = (await db.execute(query)).mappings().first()
+        return dict(row) if row else None
+
     async def create_with_tenant(self, db: AsyncSession, *, obj_in: InventoryCreate, tenant_id: UUID) -> Inventory:
         db_obj = Inventory(**obj_in.model_dump(), tenant_id=tenant_id)
         db.add(db_obj)
@@ -26,9 +128,229 @@ class CRUDInventory(CRUDBase[Inventory, InventoryCreate, InventoryUpdate]):
     async def get_by_product_and_tenant(
         self, db: AsyncSession, *, product_id: UUID, tenant_id: UUID
     ) -> Optional[Inventory]:
-        query = select(Inventory).where(Inventory.product_id == product_id, Inventory.tenant_id == tenant_id)
+        query = self._live(
+            select(Inventory).where(Inventory.product_id == product_id, Inventory.tenant_id == tenant_id)
+        )
+        return await fetch_one(db, Inventory, query, key=("tenant_product", tenant_id, product_id))
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Inventory, obj_in: Union[InventoryUpdate, Dict[str, Any]]
+    ) -> Inventory:
+        # Every write moves the version on, so ETags already handed out stop matching
+        db_obj.version = Inventory.version + 1
+        return await super().update(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def update_for_tenant(
+        self,
+        db: AsyncSession,
+        *,
+        id: UUID,
+        tenant_id: UUID,
+        obj_in: InventoryUpdate,
+        versions: Optional[Sequence[int]] = None,
+    ) -> Optional[Tuple[Inventory, bool]]:
+        """
+        Update the tenant's item and bump its version in one statement, without
+        reading it first. With `versions` it only applies while the item's version
+        is one of them. Returns the updated item and whether it was low on stock
+        before, or None if nothing matched.
+        """
+        # Joined to itself, the item's row as it was before this update
+        old = aliased(Inventory)
+        query = (
+            update(Inventory)
+            .where(Inventory.id == id, Inventory.tenant_id == tenant_id, old.id == Inventory.id, _product_is_live())
+            .values(**obj_in.model_dump(exclude_unset=True), version=Inventory.version + 1)
+            .returning(Inventory, func.coalesce(old.current_stock, 0) < func.coalesce(old.min_stock, 0))
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if versions is not None:
+            query = query.where(Inventory.version == any_(bindparam("versions", list(versions), type_=ARRAY(Integer))))
+        row = (await db.execute(query)).first()
+        await db.commit()
+        return tuple(row) if row else None
+
+    async def get_change_watermark(self, db: AsyncSession) -> int:
+        """
+        Oldest transaction still running; every change below it is final.
+        """
+        return await db.scalar(_snapshot_xmin())
+
+    async def get_changes_since(
+        self, db: AsyncSession, *, tenant_id: UUID, cursor: int
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Latest state of each item the tenant changed since `cursor`, coalesced so an
+        item appears once. Returns the rows, the next cursor, and whether newer
+        changes are already committed but held back behind a running transaction.
+        """
+        xmin = _snapshot_xmin().cte("snapshot")
+        for_tenant = (InventoryChange.tenant_id == tenant_id, InventoryChange.txid >= xmin.c.xmin)
+        watermark, pending = (
+            await db.execute(select(xmin.c.xmin, exists().where(*for_tenant)).select_from(xmin))
+        ).one()
+
+        query = (
+            select(
+                InventoryChange.inventory_id.label("id"),
+                InventoryChange.product_id,
+                InventoryChange.min_stock,
+                InventoryChange.current_stock,
+                InventoryChange.deleted,
+                InventoryChange.changed_at,
+            )
+            .where(
+                InventoryChange.tenant_id == tenant_id,
+                InventoryChange.txid >= cursor,
+                InventoryChange.txid < watermark,
+            )
+            .ext(distinct_on(InventoryChange.inventory_id))
+            .order_by(InventoryChange.inventory_id, InventoryChange.txid.desc(), InventoryChange.id.desc())
+        )
+        rows = [dict(row) for row in (await db.execute(query)).mappings()]
+        rows.sort(key=lambda row: row["changed_at"])
+        return rows, watermark, pending
+
+    async def changes_pruned_since(self, db: AsyncSession, *, cursor: int) -> bool:
+        """
+        Whether changes after `cursor` may have been pruned, so a client resuming
+        from it has to reload the full list.
+        """
+        pruned = await db.scalar(select(InventoryChangePrune.txid))
+        # Changes are read from `cursor` on, so one at the pruned txid itself is gone too
+        return pruned is not None and cursor <= pruned
+
+    async def get_deleted_since(self, db: AsyncSession, *, tenant_id: UUID, since: datetime) -> List[UUID]:
+        """
+        Ids of the tenant's items deleted at or after `since`, from the change log.
+        """
+        query = select(InventoryChange.inventory_id).where(
+            InventoryChange.tenant_id == tenant_id,
+            InventoryChange.deleted,
+            InventoryChange.changed_at >= since,
+        )
+        return list(await db.scalars(query.distinct()))
+
+    async def prune_changes(self, db: AsyncSession, *, older_than: datetime) -> int:
+        """
+        Delete changes from before `older_than`, raising the prune watermark to the
+        highest txid deleted in the same transaction. Returns the changes deleted.
+        """
+        pruned = (
+            delete(InventoryChange)
+            .where(InventoryChange.changed_at < older_than)
+            .returning(InventoryChange.txid)
+            .cte("pruned")
+        )
+        count, highest = (await db.execute(select(func.count(), func.max(pruned.c.txid)))).one()
+        if count:
+            watermark = insert(InventoryChangePrune).values(id=1, txid=highest)
+            await db.execute(
+                watermark.on_conflict_do_update(
+                    index_elements=[InventoryChangePrune.id],
+                    set_={
+                        "txid": func.greatest(InventoryChangePrune.txid, watermark.excluded.txid),
+                        "pruned_at": func.now(),
+                    },
+                )
+            )
+        await db.commit()
+        return count
+
+    async def get_change_version(self, db: AsyncSession, *, tenant_id: UUID) -> Tuple[int, Optional[int]]:
+        """
+        Count and newest id of the tenant's logged changes. It differs as soon as
+        another write commits, including one that was assigned an older id.
+        """
+        query = select(func.count(), func.max(InventoryChange.id)).where(InventoryChange.tenant_id == tenant_id)
+        count, newest = (await db.execute(query)).one()
+        return count, newest
+
+    async def get_consumption_history(
+        self, db: AsyncSession, *, tenant_id: UUID, until: date, days: int
+    ) -> Dict[str, List[Any]]:
+        """
+        Every item of the tenant with the units it consumed on each of the `days`
+        days before `until`, as columns. `ages` (days before `until`) and
+        `quantities` are parallel arrays per item, null if it consumed nothing.
+        """
+        until_day = literal(until, Date)
+        history = (
+            select(
+                InventoryConsumption.inventory_id,
+                func.array_agg(until_day - InventoryConsumption.day).label("ages"),
+                func.array_agg(InventoryConsumption.quantity).label("quantities"),
+            )
+            .where(
+                InventoryConsumption.tenant_id == tenant_id,
+                InventoryConsumption.day < until_day,
+                InventoryConsumption.day >= until_day - days,
+            )
+            .group_by(InventoryConsumption.inventory_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Inventory.id,
+                Inventory.product_id,
+                Inventory.current_stock,
+                Inventory.min_stock,
+                history.c.ages,
+                history.c.quantities,
+            )
+            .outerjoin(history, history.c.inventory_id == Inventory.id)
+            .where(Inventory.tenant_id == tenant_id, _product_is_live())
+        )
         result = await db.execute(query)
-        return result.scalars().first()
+        names = list(result.keys())
+        columns = list(zip(*result.all())) or [()] * len(names)
+        return {name: list(column) for name, column in zip(names, columns)}
+
+    async def prune_consumption(self, db: AsyncSession, *, before: date) -> int:
+        result = await db.execute(delete(InventoryConsumption).where(InventoryConsumption.day < before))
+        await db.commit()
+        return result.rowcount
+
+    async def get_summary(self, db: AsyncSession, *, tenant_id: UUID) -> Dict[str, Any]:
+        """
+        Tenant-wide counts with a rollup per SKU prefix, read from the trigger-maintained
+        summary rows, so the cost depends on the number of prefixes, not items.
+        """
+        query = (
+            select(InventorySummary)
+            .where(InventorySummary.tenant_id == tenant_id)
+            .order_by(InventorySummary.sku_prefix)
+        )
+        prefixes = (await db.execute(query)).scalars().all()
+        totals = {
+            field: sum(getattr(prefix, field) for prefix in prefixes)
+            for field in ("sku_count", "total_units", "low_stock_count", "out_of_stock_count")
+        }
+        return {**totals, "prefixes": prefixes}
+
+    async def stream_export_rows(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[ColumnElement],
+        tenant_id: Optional[UUID] = None,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Inventory items joined with their products, as lists of at most `batch_size` rows.
+        Read through a server-side cursor, so only one batch is held in memory at a time.
+        All tenants are exported unless `tenant_id` is given.
+        """
+        query = _of_live_products(select(*columns).select_from(Inventory))
+        if tenant_id is not None:
+            query = query.where(Inventory.tenant_id == tenant_id)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+
+def _snapshot_xmin():
+    return select(cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger).label("xmin"))
 
 
 inventory = CRUDInventory(Inventory)
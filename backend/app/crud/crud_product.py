@@ -1,20 +1,86 @@
-from typing import Optional
-from sqlalchemy import select
+from typing import AsyncIterable, List, Optional, Tuple
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.crud.single_flight import fetch_one
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 
+_STAGE_TABLE = "product_import_stage"
+_STAGE_COLUMNS = ("line", "sku", "name", "description")
+
+_CREATE_STAGE_SQL = f"""
+CREATE TEMP TABLE {_STAGE_TABLE} (
+    line integer NOT NULL,
+    sku text NOT NULL,
+    name text NOT NULL,
+    description text
+) ON COMMIT DROP
+"""
+
+# The last occurrence of a repeated SKU wins; rows identical to what is stored are left untouched.
+# SKUs of deleted products are refused, as creating one is, until the purger frees them.
+_MERGE_STAGE_SQL = f"""
+WITH staged AS (
+    SELECT DISTINCT ON (sku) line, sku, name, description
+    FROM {_STAGE_TABLE}
+    ORDER BY sku, line DESC
+),
+deleted AS (
+    SELECT staged.line FROM staged JOIN products ON products.sku = staged.sku
+    WHERE products.deleted_at IS NOT NULL
+),
+merged AS (
+    INSERT INTO products (id, sku, name, description, created_at, updated_at)
+    SELECT gen_random_uuid(), sku, name, description, now(), now() FROM staged
+    WHERE line NOT IN (SELECT line FROM deleted)
+    ON CONFLICT (sku) DO UPDATE
+        SET name = EXCLUDED.name, description = EXCLUDED.description, updated_at = now()
+        WHERE products.deleted_at IS NULL
+          AND (products.name, products.description) IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.description)
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT
+    (SELECT count(*) FROM staged) AS staged,
+    count(*) FILTER (WHERE inserted) AS inserted,
+    count(*) FILTER (WHERE NOT inserted) AS updated,
+    (SELECT coalesce(array_agg(line ORDER BY line), '{{}}') FROM deleted) AS deleted_lines
+FROM merged
+"""
+
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
-    async def get_by_sku(self, db: AsyncSession, *, sku: str) -> Optional[Product]:
+    async def get_by_sku(self, db: AsyncSession, *, sku: str, include_deleted: bool = False) -> Optional[Product]:
         """
         Find a product by its SKU.
+        A deleted product keeps its SKU until it is purged; `include_deleted` finds it too.
         """
         query = select(Product).where(Product.sku == sku)
-        result = await db.execute(query)
-        return result.scalars().first()
+        if not include_deleted:
+            query = self._live(query)
+        return await fetch_one(db, Product, query, key=("sku", sku, include_deleted))
+
+    async def bulk_upsert(
+        self, db: AsyncSession, *, rows: AsyncIterable[Tuple[int, str, str, Optional[str]]]
+    ) -> Tuple[int, int, int, List[int]]:
+        """
+        Stage `(line, sku, name, description)` rows with COPY into a temp table and merge
+        them into products by SKU in a single statement.
+
+        Returns `(inserted, updated, unchanged)` counts of distinct SKUs, and the lines
+        left out because their SKU belongs to a deleted product.
+        """
+        await db.execute(text(_CREATE_STAGE_SQL))
+
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(_STAGE_TABLE, records=rows, columns=_STAGE_COLUMNS)
+
+        result = await db.execute(text(_MERGE_STAGE_SQL))
+        staged, inserted, updated, deleted_lines = result.one()
+        await db.commit()
+        return inserted, updated, staged - inserted - updated - len(deleted_lines), deleted_lines
 
 
 product = CRUDProduct(Product)
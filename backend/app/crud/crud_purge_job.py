@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.db.session import Base
+from app.models.purge_job import PurgeJob
+
+# pg_advisory lock key held by the running purger, so purges never overlap
+PURGE_LOCK_KEY = 0x5EED0002
+
+# Deletes by physical row address, so tables without a single-column key work the same
+DELETE_BATCH_SQL = """
+DELETE FROM {table}
+WHERE ctid = ANY(ARRAY(SELECT ctid FROM {table} WHERE {column} = :entity_id LIMIT :limit))
+"""
+
+
+class CRUDPurgeJob(CRUDBase[PurgeJob, BaseModel, BaseModel]):
+    async def try_lock(self, db: AsyncSession) -> bool:
+        """
+        Take the purger lock for the rest of this session's transaction.
+        """
+        return await db.scalar(select(func.pg_try_advisory_xact_lock(PURGE_LOCK_KEY)))
+
+    async def get_next_pending(self, db: AsyncSession) -> Optional[PurgeJob]:
+        query = select(PurgeJob).where(PurgeJob.finished_at.is_(None)).order_by(PurgeJob.created_at).limit(1)
+        return (await db.execute(query)).scalars().first()
+
+    async def get_recent(self, db: AsyncSession, *, pending: bool = False, limit: int = 100) -> List[PurgeJob]:
+        query = select(PurgeJob).order_by(PurgeJob.created_at.desc()).limit(limit)
+        if pending:
+            query = query.where(PurgeJob.finished_at.is_(None))
+        return (await db.execute(query)).scalars().all()
+
+    async def delete_batch(self, db: AsyncSession, *, job: PurgeJob, table: str, column: str, limit: int) -> int:
+        """
+        Delete up to `limit` rows of `table` whose `column` is the job's entity, and
+        count them on the job in the same transaction. Returns the rows deleted.
+        """
+        result = await db.execute(
+            text(DELETE_BATCH_SQL.format(table=table, column=column)), {"entity_id": job.entity_id, "limit": limit}
+        )
+        job.rows_deleted += result.rowcount
+        await db.commit()
+        return result.rowcount
+
+    async def finish(self, db: AsyncSession, *, job: PurgeJob) -> None:
+        """
+        Delete the soft-deleted record itself; rows added since its last batch go with it by cascade.
+        """
+        table = Base.metadata.tables[job.table_name]
+        result = await db.execute(delete(table).where(table.c.id == job.entity_id))
+        job.rows_deleted += result.rowcount
+        job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+
+
+purge_job = CRUDPurgeJob(PurgeJob)
@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_refresh_token, hash_refresh_token
+from app.crud.base import CRUDBase
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+class CRUDRefreshToken(CRUDBase[RefreshToken, BaseModel, BaseModel]):
+    async def issue(self, db: AsyncSession, *, user_id: UUID, family_id: Optional[UUID] = None) -> str:
+        """
+        Create a refresh token for the user, in a new family unless `family_id` is given.
+        Returns the token itself; only its digest is stored.
+        """
+        token = create_refresh_token()
+        db.add(
+            RefreshToken(
+                user_id=user_id,
+                family_id=family_id or uuid.uuid4(),
+                token_hash=hash_refresh_token(token),
+                expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        await db.commit()
+        return token
+
+    async def rotate(self, db: AsyncSession, *, token: str) -> Optional[Tuple[UUID, str]]:
+        """
+        Exchange a refresh token for a new one in its family.
+        Returns `(user_id, new_token)`, or None if the token is unknown, expired or
+        revoked, or its user is inactive. A token that was already used revokes its family.
+        """
+        now = datetime.now(timezone.utc)
+        query = (
+            select(RefreshToken, User.is_active)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(RefreshToken.token_hash == hash_refresh_token(token))
+            .with_for_update(of=RefreshToken)
+        )
+        row = (await db.execute(query)).first()
+        if (
+            row is None
+            or not row.is_active
+            or row.RefreshToken.revoked_at is not None
+            or row.RefreshToken.expires_at <= now
+        ):
+            await db.rollback()
+            return None
+
+        stored = row.RefreshToken
+        if stored.used_at is not None:
+            await db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == stored.family_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            await db.commit()
+            return None
+
+        stored.used_at = now
+        # Used tokens are kept until they expire, for reuse detection; expired ones can go
+        await db.execute(
+            delete(RefreshToken).where(RefreshToken.user_id == stored.user_id, RefreshToken.expires_at <= now)
+        )
+        return stored.user_id, await self.issue(db, user_id=stored.user_id, family_id=stored.family_id)
+
+
+refresh_token = CRUDRefreshToken(RefreshToken)
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.reorder_run import ReorderRun
+from app.models.supply_order import SupplyOrder
+
+# pg_advisory lock key held by the running engine, so sweeps never overlap
+REORDER_LOCK_KEY = 0x5EED0001
+
+
+class CRUDReorderRun(CRUDBase[ReorderRun, BaseModel, BaseModel]):
+    async def try_lock(self, db: AsyncSession) -> bool:
+        """
+        Take the engine lock for the rest of this session's transaction.
+        """
+        return await db.scalar(select(func.pg_try_advisory_xact_lock(REORDER_LOCK_KEY)))
+
+    async def lock(self, db: AsyncSession) -> None:
+        """
+        Wait for a running sweep to finish, and keep new ones from starting until this session's transaction ends.
+        """
+        await db.execute(select(func.pg_advisory_xact_lock(REORDER_LOCK_KEY)))
+
+    async def get_or_start(self, db: AsyncSession) -> ReorderRun:
+        """
+        Resume the latest unfinished run, or start a new one.
+        """
+        query = select(ReorderRun).where(ReorderRun.finished_at.is_(None)).order_by(ReorderRun.created_at.desc())
+        run = (await db.execute(query)).scalars().first()
+        if run is None:
+            run = ReorderRun(lines=0, orders=0)
+            db.add(run)
+            await db.commit()
+        return run
+
+    async def checkpoint(
+        self,
+        db: AsyncSession,
+        *,
+        run: ReorderRun,
+        cursor: Tuple[UUID, UUID],
+        orders: List[Dict[str, Any]],
+        requests: int,
+    ) -> None:
+        """
+        Record a batch's pending orders and advance the cursor in one transaction,
+        so after a crash every row before the cursor has its orders on record.
+        """
+        if orders:
+            await db.execute(insert(SupplyOrder), orders)
+        run.cursor_tenant_id, run.cursor_inventory_id = cursor
+        run.lines += len(orders)
+        run.orders += requests
+        await db.commit()
+
+    async def finish(self, db: AsyncSession, *, run: ReorderRun, finished_at: Optional[datetime] = None) -> None:
+        run.finished_at = finished_at or datetime.now(timezone.utc)
+        await db.commit()
+
+
+reorder_run = CRUDReorderRun(ReorderRun)
@@ -0,0 +1,190 @@
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.crud.base import CRUDBase
+from app.models.inventory import Inventory
+from app.models.product import Product
+from app.models.reservation import Reservation
+from app.schemas.reservation import ReservationCreate
+
+# pg_advisory lock key held by the running sweeper; two sweepers could deadlock on
+# items whose holds they expire in different orders
+RESERVATION_SWEEP_LOCK_KEY = 0x5EED0005
+
+_AVAILABLE = (Inventory.current_stock - Inventory.reserved_stock).label("available_stock")
+
+
+class CRUDReservation(CRUDBase[Reservation, ReservationCreate, BaseModel]):
+    async def reserve(
+        self, db: AsyncSession, *, obj_in: ReservationCreate, tenant_id: UUID
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Hold `quantity` units of the tenant's item if that many are available.
+        The availability check, the item's `reserved_stock` and the new reservation
+        are one statement, so concurrent holds queue on the item's row lock and can
+        never reserve more than is in stock. Returns the reservation, or None.
+        """
+        held = (
+            update(Inventory)
+            .where(
+                Inventory.id == obj_in.inventory_id,
+                Inventory.tenant_id == tenant_id,
+                Inventory.current_stock - Inventory.reserved_stock >= obj_in.quantity,
+                Inventory.product.has(Product.deleted_at.is_(None)),
+            )
+            .values(reserved_stock=Inventory.reserved_stock + obj_in.quantity)
+            .returning(Inventory.id, Inventory.tenant_id, _AVAILABLE)
+            .cte("held")
+        )
+        created = (
+            insert(Reservation)
+            .from_select(
+                ["id", "tenant_id", "inventory_id", "quantity", "expires_at"],
+                select(
+                    literal(uuid.uuid4(), Reservation.id.type),
+                    held.c.tenant_id,
+                    held.c.id,
+                    literal(obj_in.quantity),
+                    func.now() + timedelta(seconds=obj_in.ttl_seconds),
+                ),
+            )
+            .returning(Reservation.id, Reservation.inventory_id, Reservation.quantity, Reservation.expires_at)
+            .cte("created")
+        )
+        query = select(created, held.c.available_stock).join_from(created, held, created.c.inventory_id == held.c.id)
+        row = (await db.execute(query)).mappings().first()
+        await db.commit()
+        return dict(row) if row else None
+
+    async def release(self, db: AsyncSession, *, id: UUID, tenant_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Drop the tenant's reservation and return its units to the item's available stock.
+        """
+        released = (
+            delete(Reservation)
+            .where(Reservation.id == id, Reservation.tenant_id == tenant_id)
+            .returning(Reservation.id, Reservation.inventory_id, Reservation.quantity, Reservation.expires_at)
+            .cte("released")
+        )
+        # On the table, not the mapped class: the result is plain rows, not items
+        query = (
+            update(Inventory.__table__)
+            .where(Inventory.id == released.c.inventory_id)
+            .values(reserved_stock=Inventory.reserved_stock - released.c.quantity)
+            .returning(released.c.id, released.c.inventory_id, released.c.quantity, released.c.expires_at, _AVAILABLE)
+        )
+        row = (await db.execute(query)).mappings().first()
+        await db.commit()
+        return dict(row) if row else None
+
+    async def commit(
+        self, db: AsyncSession, *, id: UUID, tenant_id: UUID
+    ) -> Optional[Tuple[Dict[str, Any], Inventory, bool]]:
+        """
+        Complete the tenant's unexpired reservation: its units leave `current_stock`
+        along with the hold, in one statement. Returns the reservation, the updated
+        item and whether the item was low on stock before, or None if there is no
+        such reservation (or it expired).
+        """
+        consumed = (
+            delete(Reservation)
+            .where(Reservation.id == id, Reservation.tenant_id == tenant_id, Reservation.expires_at > func.now())
+            .returning(Reservation.id, Reservation.inventory_id, Reservation.quantity, Reservation.expires_at)
+            .cte("consumed")
+        )
+        # Joined to itself, the item's row as it was before this update
+        old = aliased(Inventory)
+        query = (
+            update(Inventory)
+            .where(Inventory.id == consumed.c.inventory_id, old.id == Inventory.id)
+            .values(
+                current_stock=Inventory.current_stock - consumed.c.quantity,
+                reserved_stock=Inventory.reserved_stock - consumed.c.quantity,
+                version=Inventory.version + 1,
+            )
+            .returning(
+                Inventory,
+                func.coalesce(old.current_stock, 0) < func.coalesce(old.min_stock, 0),
+                consumed.c.id,
+                consumed.c.quantity,
+                consumed.c.expires_at,
+            )
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        row = (await db.execute(query)).first()
+        await db.commit()
+        if row is None:
+            return None
+        item, was_low, reservation_id, quantity, expires_at = row
+        reservation = {
+            "id": reservation_id,
+            "inventory_id": item.id,
+            "quantity": quantity,
+            "expires_at": expires_at,
+            "available_stock": item.current_stock - item.reserved_stock,
+        }
+        return reservation, item, was_low
+
+    async def try_lock_sweep(self, db: AsyncSession) -> bool:
+        """
+        Take the sweeper lock for the rest of this session's transaction.
+        """
+        return await db.scalar(select(func.pg_try_advisory_xact_lock(RESERVATION_SWEEP_LOCK_KEY)))
+
+    async def expire_batch(self, db: AsyncSession, *, limit: int) -> int:
+        """
+        Delete up to `limit` expired reservations, oldest first through the
+        `expires_at` index, and take their units off the items' `reserved_stock`
+        in the same statement. Returns the reservations expired.
+        """
+        due = (
+            select(Reservation.id)
+            .where(Reservation.expires_at <= func.now())
+            .order_by(Reservation.expires_at)
+            .limit(limit)
+            # Holds being committed or released right now are theirs to finish
+            .with_for_update(skip_locked=True)
+        )
+        expired = (
+            delete(Reservation)
+            .where(Reservation.id.in_(due.scalar_subquery()))
+            .returning(Reservation.inventory_id, Reservation.quantity)
+            .cte("expired")
+        )
+        per_item = (
+            select(expired.c.inventory_id, func.sum(expired.c.quantity).label("quantity"))
+            .group_by(expired.c.inventory_id)
+            .subquery()
+        )
+        released = (
+            update(Inventory)
+            .where(Inventory.id == per_item.c.inventory_id)
+            .values(reserved_stock=Inventory.reserved_stock - per_item.c.quantity)
+            .returning(Inventory.id)
+            .cte("released")
+        )
+        count = await db.scalar(select(func.count()).select_from(expired).add_cte(released))
+        await db.commit()
+        return count
+
+    async def recount_reserved(self, db: AsyncSession, *, tenant_id: UUID) -> None:
+        """
+        Set the tenant's `reserved_stock` counters from its reservation rows.
+        """
+        held = (
+            select(func.coalesce(func.sum(Reservation.quantity), 0))
+            .where(Reservation.inventory_id == Inventory.id)
+            .scalar_subquery()
+        )
+        await db.execute(update(Inventory).where(Inventory.tenant_id == tenant_id).values(reserved_stock=held))
+        await db.commit()
+
+
+reservation = CRUDReservation(Reservation)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.db.shards import DEFAULT_SHARD
+from app.models.inventory import Inventory
+from app.models.product import Product
+from app.models.supply_order import (
+    SUPPLY_ORDER_OPEN,
+    SUPPLY_ORDER_PENDING,
+    SUPPLY_ORDER_PLACED,
+    SupplyOrder,
+)
+from app.models.tenant import Tenant
+
+
+class CRUDSupplyOrder(CRUDBase[SupplyOrder, BaseModel, BaseModel]):
+    async def get_reorder_candidates(
+        self,
+        db: AsyncSession,
+        *,
+        after: Tuple[Optional[UUID], Optional[UUID]],
+        limit: int,
+        target_multiplier: int,
+        lead_time: timedelta,
+        shard: str = DEFAULT_SHARD,
+    ) -> List[Dict[str, Any]]:
+        """
+        Next page of low-stock items across the tenants placed on `shard`, ordered by
+        (tenant_id, id), with the quantity needed to reach the target level net of open
+        orders. Rows needing nothing are still returned so the caller's cursor can pass them.
+        """
+        open_quantity = (
+            select(func.coalesce(func.sum(SupplyOrder.quantity), 0))
+            .where(
+                SupplyOrder.inventory_id == Inventory.id,
+                SupplyOrder.status.in_(SUPPLY_ORDER_OPEN),
+                SupplyOrder.created_at > func.now() - lead_time,
+            )
+            .scalar_subquery()
+        )
+        target = func.coalesce(Inventory.target_stock, Inventory.min_stock * target_multiplier)
+        query = (
+            select(
+                Inventory.tenant_id,
+                Inventory.id.label("inventory_id"),
+                Tenant.name.label("tenant_name"),
+                Product.sku.label("product_sku"),
+                Product.name.label("product_name"),
+                (target - Inventory.current_stock - open_quantity).label("quantity"),
+            )
+            .join(Tenant, Tenant.id == Inventory.tenant_id)
+            .join(Product, Product.id == Inventory.product_id)
+            .where(
+                Inventory.current_stock < Inventory.min_stock,
+                Tenant.deleted_at.is_(None),
+                # Rows of a tenant being moved in (or already moved out) are not this shard's to order
+                Tenant.shard == shard,
+                Product.deleted_at.is_(None),
+            )
+            .order_by(Inventory.tenant_id, Inventory.id)
+            .limit(limit)
+        )
+        if after[0] is not None:
+            query = query.where(tuple_(Inventory.tenant_id, Inventory.id) > tuple_(*after))
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_pending(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        Orders recorded but never confirmed by the supplier (the engine stopped mid-call).
+        """
+        query = (
+            select(
+                SupplyOrder.reference,
+                SupplyOrder.tenant_id,
+                SupplyOrder.quantity,
+                Tenant.name.label("tenant_name"),
+                Product.sku.label("product_sku"),
+                Product.name.label("product_name"),
+            )
+            .join(Inventory, Inventory.id == SupplyOrder.inventory_id)
+            .join(Tenant, Tenant.id == SupplyOrder.tenant_id)
+            .join(Product, Product.id == Inventory.product_id)
+            .where(SupplyOrder.status == SUPPLY_ORDER_PENDING)
+            .order_by(SupplyOrder.reference)
+        )
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def set_status(
+        self, db: AsyncSession, *, reference: str, status: str, external_reference_id: Optional[str] = None
+    ) -> None:
+        await db.execute(
+            update(SupplyOrder)
+            .where(SupplyOrder.reference == reference)
+            .values(status=status, external_reference_id=external_reference_id)
+        )
+        await db.commit()
+
+    async def record_placed(
+        self, db: AsyncSession, *, inventory: Inventory, quantity: int, external_reference_id: str
+    ) -> SupplyOrder:
+        """
+        Record an order placed outside the engine (manual resupply) so it counts as open.
+        """
+        db_obj = SupplyOrder(
+            tenant_id=inventory.tenant_id,
+            inventory_id=inventory.id,
+            quantity=quantity,
+            status=SUPPLY_ORDER_PLACED,
+            reference=external_reference_id,
+            external_reference_id=external_reference_id,
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+
+supply_order = CRUDSupplyOrder(SupplyOrder)
@@ -1,10 +1,92 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.crud.base import CRUDBase
+from app.crud.crud_purge_job import DELETE_BATCH_SQL
+from app.models.inventory_change import SKIP_CHANGES_SETTING
 from app.models.tenant import Tenant
+from app.models.user import User
 from app.schemas.tenant import TenantCreate, TenantUpdate
 
+# pg_advisory lock class for tenant moves, keyed by the tenant id's hash. Writes hold
+# it shared for their transaction; a move's cutover holds it exclusively.
+TENANT_MOVE_LOCK_KEY = 0x5EED0003
+# Held by a move from start to finish, so a tenant is only moved by one at a time
+TENANT_MOVER_LOCK_KEY = 0x5EED0004
+
+
+def _move_lock_key(tenant_id: UUID, lock: int = TENANT_MOVE_LOCK_KEY):
+    return lock, func.hashtext(str(tenant_id))
+
 
 class CRUDTenant(CRUDBase[Tenant, TenantCreate, TenantUpdate]):
-    pass
+    async def _mark_deleted(self, db: AsyncSession, *, db_obj: Tenant) -> None:
+        # Lock the tenant's users out now; the purger removes them later
+        await super()._mark_deleted(db, db_obj=db_obj)
+        await db.execute(update(User).where(User.tenant_id == db_obj.id).values(is_active=False))
+
+    async def get_shard(self, db: AsyncSession, *, tenant_id: UUID) -> Optional[str]:
+        return await db.scalar(select(Tenant.shard).where(Tenant.id == tenant_id))
+
+    async def try_lock_for_write(self, db: AsyncSession, *, tenant_id: UUID) -> bool:
+        """
+        Hold off moves of the tenant for the rest of this session's transaction.
+        False while a move is cutting over.
+        """
+        return await db.scalar(select(func.pg_try_advisory_xact_lock_shared(*_move_lock_key(tenant_id))))
+
+    async def lock_for_move(self, db: AsyncSession, *, tenant_id: UUID) -> None:
+        """
+        Wait for the tenant's writes in flight, and refuse new ones until this session's transaction ends.
+        """
+        await db.execute(select(func.pg_advisory_xact_lock(*_move_lock_key(tenant_id))))
+
+    async def try_claim_move(self, db: AsyncSession, *, tenant_id: UUID) -> bool:
+        """
+        Claim the tenant for a move for the rest of this session's transaction, unless another move has it.
+        """
+        return await db.scalar(
+            select(func.pg_try_advisory_xact_lock(*_move_lock_key(tenant_id, TENANT_MOVER_LOCK_KEY)))
+        )
+
+    async def skip_change_log(self, db: AsyncSession) -> None:
+        """
+        Keep this session's current transaction out of the inventory change log.
+        """
+        await db.execute(select(func.set_config(SKIP_CHANGES_SETTING, "on", True)))
+
+    async def delete_moved_rows(
+        self, db: AsyncSession, *, table: str, tenant_id: UUID, limit: int, column: str = "tenant_id"
+    ) -> int:
+        """
+        Delete up to `limit` of a moved tenant's rows in `table` from the shard it left. Returns the rows deleted.
+        """
+        await self.skip_change_log(db)
+        result = await db.execute(
+            text(DELETE_BATCH_SQL.format(table=table, column=column)), {"entity_id": tenant_id, "limit": limit}
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def set_shard(self, db: AsyncSession, *, tenant_id: UUID, shard: str) -> None:
+        await db.execute(
+            update(Tenant)
+            .where(Tenant.id == tenant_id)
+            .values(shard=shard, shard_moved_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    async def moved_since(self, db: AsyncSession, *, tenant_id: UUID, since: datetime) -> bool:
+        """
+        Whether the tenant's data moved to this database after `since`.
+        """
+        moved_at = await db.scalar(select(Tenant.shard_moved_at).where(Tenant.id == tenant_id))
+        return moved_at is not None and moved_at > since
 
 
 tenant = CRUDTenant(Tenant)
@@ -1,15 +1,22 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 import string
 import secrets
+import uuid
 from typing import Tuple
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserSignUp, UserInviteRequest
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    get_password_hashes_parallel,
+    verify_password_async,
+)
 from app.models.tenant import Tenant
 
 # Pre-computed dummy hash so authenticate() takes constant time
@@ -31,7 +38,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash_async(obj_in.password),
             full_name=obj_in.full_name,
             tenant_id=obj_in.tenant_id,
             is_superuser=obj_in.is_superuser,
@@ -52,7 +59,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
         new_user = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash_async(obj_in.password),
             full_name=obj_in.full_name,
             tenant_id=new_tenant.id,
         )
@@ -70,7 +77,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         password = generate_random_password()
         new_user = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(password),
+            hashed_password=await get_password_hash_async(password),
             full_name=obj_in.full_name,
             tenant_id=tenant_id,
         )
@@ -79,6 +86,69 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         await db.refresh(new_user)
         return new_user, password
 
+    async def bulk_invite(
+        self, db: AsyncSession, *, invites: Sequence[UserInviteRequest], tenant_id: UUID, chunk_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Invite many users to the Tenant with one email lookup and one insert per
+        `chunk_size` invites. Passwords are hashed across the bulk hashing processes.
+        Yields each chunk's results as soon as it is stored, one entry per invite,
+        in order: the new user with its temporary password, or an `error`.
+        """
+        emails = bindparam("emails", list({invite.email for invite in invites}), type_=ARRAY(String))
+        taken = set(await db.scalars(select(User.email).where(User.email == any_(emails))))
+        seen = set()
+        for start in range(0, len(invites), chunk_size):
+            chunk = invites[start : start + chunk_size]
+            new: Dict[str, UserInviteRequest] = {}
+            for invite in chunk:
+                if invite.email not in taken and invite.email not in seen:
+                    new.setdefault(invite.email, invite)
+
+            passwords = {email: generate_random_password() for email in new}
+            hashes = await get_password_hashes_parallel(list(passwords.values()))
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "email": email,
+                    "full_name": invite.full_name,
+                    "hashed_password": hashed,
+                    "tenant_id": tenant_id,
+                    "is_active": True,
+                    "is_superuser": False,
+                }
+                for (email, invite), hashed in zip(new.items(), hashes)
+            ]
+            created = {}
+            if rows:
+                # Emails registered since the lookup are skipped, not failed
+                query = (
+                    insert(User).values(rows).on_conflict_do_nothing(index_elements=[User.email]).returning(User.email)
+                )
+                inserted = set(await db.scalars(query))
+                await db.commit()
+                created = {row["email"]: row for row in rows if row["email"] in inserted}
+
+            results: List[Dict[str, Any]] = []
+            for invite in chunk:
+                if invite.email in seen:
+                    results.append({"email": invite.email, "error": "Email listed more than once"})
+                elif invite.email in created:
+                    row = created[invite.email]
+                    results.append(
+                        {
+                            "id": row["id"],
+                            "email": row["email"],
+                            "full_name": row["full_name"],
+                            "tenant_id": tenant_id,
+                            "temporary_password": passwords[row["email"]],
+                        }
+                    )
+                else:
+                    results.append({"email": invite.email, "error": "User with this email already exists"})
+                seen.add(invite.email)
+            yield results
+
     async def update(
         self,
         db: AsyncSession,
@@ -92,7 +162,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             update_data = obj_in.model_dump(exclude_unset=True)
 
         if "password" in update_data and update_data["password"] is not None:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
         else:
             update_data.pop("password", None)
 
@@ -102,9 +172,9 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user = await self.get_by_email(db, email=email)
         if not user:
             # Spend the same time as a real verification to prevent timing enumeration
-            verify_password(password, _DUMMY_HASH)
+            await verify_password_async(password, _DUMMY_HASH)
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
 
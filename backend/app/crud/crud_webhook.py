@@ -0,0 +1,30 @@
+import secrets
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.webhook import Webhook
+from app.schemas.webhook import WebhookCreate, WebhookUpdate
+
+
+class CRUDWebhook(CRUDBase[Webhook, WebhookCreate, WebhookUpdate]):
+    async def create_with_tenant(self, db: AsyncSession, *, obj_in: WebhookCreate, tenant_id: UUID) -> Webhook:
+        db_obj = Webhook(url=str(obj_in.url), secret=secrets.token_urlsafe(32), tenant_id=tenant_id)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def get_multi_by_tenant(self, db: AsyncSession, *, tenant_id: UUID) -> List[Webhook]:
+        result = await db.execute(select(Webhook).where(Webhook.tenant_id == tenant_id))
+        return result.scalars().all()
+
+    async def get_active_by_tenant(self, db: AsyncSession, *, tenant_id: UUID) -> List[Webhook]:
+        result = await db.execute(select(Webhook).where(Webhook.tenant_id == tenant_id, Webhook.is_active.is_(True)))
+        return result.scalars().all()
+
+
+webhook = CRUDWebhook(Webhook)
@@ -0,0 +1,110 @@
+"""
+Single-flight lookups: concurrent identical reads in a worker share one query.
+
+The first caller for a key runs the query. Callers arriving while it is in
+flight wait for its row instead of sending the same query again. The shared
+value is a snapshot of the row's columns, and each waiter gets its own instance
+of it in its own session, so nothing ORM-level is shared between requests.
+
+The key is the engine, the model and the complete set of query parameters. Two
+callers therefore only share a result their own query would have returned. A
+tenant-scoped lookup has the tenant id in its key, so it can never be answered
+with another tenant's row.
+
+Sessions holding uncommitted writes always run their own query, because they
+must see those writes.
+"""
+
+import asyncio
+from typing import Any, Dict, Hashable, Optional, Type, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
+
+ModelType = TypeVar("ModelType")
+
+_PENDING_WRITES = "single_flight_pending_writes"
+# The leader's query failed or was cancelled; waiters query for themselves
+_FAILED = object()
+
+_flights: Dict[Hashable, asyncio.Future] = {}
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(state: ORMExecuteState) -> None:
+    if not state.is_select:
+        state.session.info[_PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context: Any) -> None:
+    session.info[_PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    session.info.pop(_PENDING_WRITES, None)
+
+
+def _has_pending_writes(db: AsyncSession) -> bool:
+    return bool(db.info.get(_PENDING_WRITES) or db.new or db.dirty or db.deleted)
+
+
+def _column_values(obj: Any) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _attach(db: AsyncSession, model: Type[ModelType], values: Dict[str, Any]) -> ModelType:
+    """
+    Turn a shared row snapshot into an instance in `db`, as if `db` had loaded it.
+    """
+    mapper = inspect(model)
+    identity = mapper.identity_key_from_primary_key(
+        [values[mapper.get_property_by_column(column).key] for column in mapper.primary_key]
+    )
+    existing = db.identity_map.get(identity)
+    if existing is not None:
+        return existing
+
+    obj = mapper.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    db.add(obj)
+    return obj
+
+
+async def fetch_one(db: AsyncSession, model: Type[ModelType], query: Select, *, key: Hashable) -> Optional[ModelType]:
+    """
+    First row of `query`, shared with identical lookups already in flight.
+    `key` must identify the query completely: every parameter it filters on.
+    """
+    if not _has_pending_writes(db):
+        flight_key = (db.get_bind(), model, key)
+        flight = _flights.get(flight_key)
+        if flight is None:
+            return await _lead(db, query, flight_key)
+        values = await asyncio.shield(flight)
+        if values is not _FAILED:
+            return None if values is None else _attach(db, model, values)
+
+    result = await db.execute(query)
+    return result.scalars().first()
+
+
+async def _lead(db: AsyncSession, query: Select, flight_key: Hashable) -> Optional[Any]:
+    flight = asyncio.get_running_loop().create_future()
+    _flights[flight_key] = flight
+    try:
+        result = await db.execute(query)
+        obj = result.scalars().first()
+        flight.set_result(None if obj is None else _column_values(obj))
+        return obj
+    finally:
+        if not flight.done():
+            flight.set_result(_FAILED)
+        del _flights[flight_key]
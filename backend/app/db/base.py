@@ -3,3 +3,13 @@ from app.models.tenant import Tenant  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.product import Product  # noqa: F401
 from app.models.inventory import Inventory  # noqa: F401
+from app.models.inventory_change import InventoryChange, InventoryChangePrune  # noqa: F401
+from app.models.webhook import Webhook  # noqa: F401
+from app.models.supply_order import SupplyOrder  # noqa: F401
+from app.models.reorder_run import ReorderRun  # noqa: F401
+from app.models.inventory_consumption import InventoryConsumption  # noqa: F401
+from app.models.inventory_summary import InventorySummary  # noqa: F401
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
+from app.models.purge_job import PurgeJob  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
+from app.models.reservation import Reservation  # noqa: F401
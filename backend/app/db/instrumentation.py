@@ -0,0 +1,122 @@
+"""
+SQL statement instrumentation.
+
+Engine events count and time every statement and attribute it to whatever is
+being tracked in the current context (normally the HTTP request, via
+`QueryStatsMiddleware`). Slow statements are logged with their parameters
+redacted, and a statement repeated many times within one request is flagged
+as an N+1 candidate.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import DB_STATEMENTS_PER_REQUEST, route_template
+from app.logger import get_logger
+
+log = get_logger(__name__)
+
+_START_TIMES_KEY = "query_start_times"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    n_plus_one: set = field(default_factory=set)
+
+
+# Every active tracker records each statement, so a test-level budget still sees
+# the statements counted by the request-level tracker nested inside it.
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the statements executed in the current context while the block runs.
+    """
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+def _redacted(parameters: Any) -> str:
+    if not parameters:
+        return "no params"
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} param sets redacted"
+    return f"{len(parameters)} params redacted"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - conn.info[_START_TIMES_KEY].pop()
+
+    if duration * 1000 >= settings.SLOW_QUERY_MS:
+        log.warning("Slow query (%.1f ms, %s): %s", duration * 1000, _redacted(parameters), statement)
+
+    for stats in _active.get():
+        stats.count += 1
+        stats.duration += duration
+        stats.statements[statement] += 1
+        if stats.statements[statement] == settings.N_PLUS_ONE_THRESHOLD and statement not in stats.n_plus_one:
+            stats.n_plus_one.add(statement)
+            log.warning(
+                "Possible N+1: statement ran %d times in one request: %s", stats.statements[statement], statement
+            )
+
+
+def instrument_queries(engine: AsyncEngine | Engine) -> None:
+    """
+    Attach the statement hooks to an engine. Safe to call more than once.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that tracks the statements each HTTP request executes.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if stats.count:
+                    route = route_template(scope)
+                    DB_STATEMENTS_PER_REQUEST.labels(route).observe(stats.count)
+                    log.debug(
+                        "%s %s ran %d statements in %.1f ms",
+                        scope["method"],
+                        route,
+                        stats.count,
+                        stats.duration * 1000,
+                    )
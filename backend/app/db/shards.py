@@ -0,0 +1,107 @@
+"""
+Tenant-to-database routing.
+
+The database at DATABASE_URL is the "default" shard. It holds the global tables
+(tenants, users, refresh tokens, products, webhooks, idempotency keys, purge
+jobs) and the data of every tenant placed on it. Each entry of DATABASE_SHARDS
+is another database with the same schema (`alembic -x shard=<name> upgrade
+head`), holding the data of the tenants placed there: inventories, their
+consumption, summaries, change log and reservations, and supply orders.
+`tenants.shard` in the default database is the shard map.
+
+A shard also keeps reference copies of the products and of its tenants' rows,
+so its foreign keys and joins work without leaving the database (see
+app/services/sharding.py). Every shard gets its own engine and pool.
+"""
+
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+
+DEFAULT_SHARD = "default"
+# Session.info key naming the shard a session is bound to
+SHARD_INFO_KEY = "shard"
+
+
+class UnknownShardError(KeyError):
+    """
+    Raised for a shard name that is not configured.
+    """
+
+
+def _shard_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.SHARD_POOL_SIZE,
+        max_overflow=settings.SHARD_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+
+_urls: Dict[str, str] = {DEFAULT_SHARD: settings.DATABASE_URL, **settings.DATABASE_SHARDS}
+_engines: Dict[str, AsyncEngine] = {
+    DEFAULT_SHARD: engine,
+    **{name: _shard_engine(url) for name, url in settings.DATABASE_SHARDS.items()},
+}
+_sessionmakers: Dict[str, async_sessionmaker] = {
+    DEFAULT_SHARD: AsyncSessionLocal,
+    **{
+        name: async_sessionmaker(
+            bind=shard_engine, autoflush=False, expire_on_commit=False, info={SHARD_INFO_KEY: name}
+        )
+        for name, shard_engine in _engines.items()
+        if name != DEFAULT_SHARD
+    },
+}
+
+
+def shard_names() -> List[str]:
+    return list(_sessionmakers)
+
+
+def extra_shards() -> List[str]:
+    """
+    Every shard but the default one.
+    """
+    return [name for name in _sessionmakers if name != DEFAULT_SHARD]
+
+
+def is_sharded() -> bool:
+    """
+    Whether tenant data can live outside the default database. Without extra
+    shards every tenant is on the default one and routing is skipped entirely.
+    """
+    return len(_sessionmakers) > 1
+
+
+def get_sessionmaker(shard: str) -> async_sessionmaker:
+    try:
+        return _sessionmakers[shard]
+    except KeyError:
+        raise UnknownShardError(shard) from None
+
+
+def get_url(shard: str) -> str:
+    try:
+        return _urls[shard]
+    except KeyError:
+        raise UnknownShardError(shard) from None
+
+
+def shard_of(db: AsyncSession) -> str:
+    """
+    Name of the shard a session from `get_sessionmaker` is bound to.
+    """
+    return db.info.get(SHARD_INFO_KEY, DEFAULT_SHARD)
+
+
+def engines() -> List[AsyncEngine]:
+    return list(_engines.values())
+
+
+async def dispose_engines() -> None:
+    for shard_engine in _engines.values():
+        await shard_engine.dispose()
@@ -1,11 +1,27 @@
 """
 Global logger for the multi-t-inventory backend.
 Import `logger` or use `get_logger(__name__)` in any module.
+
+Records are handed to a background thread through a bounded queue, so a slow
+stdout never blocks the event loop; if the queue is full, records are dropped
+rather than waiting. Output is one JSON object per line, carrying the request
+id and tenant id of the request that logged it. Use %-style arguments
+(`log.info("x=%s", x)`) so messages are only formatted when they are emitted.
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
+import pickle
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from typing import Optional
+
+import orjson
 
 # Logger name used across the app
 LOG_NAME = "multi-t-inventory"
@@ -13,6 +29,108 @@ LOG_NAME = "multi-t-inventory"
 # Default level; override with LOG_LEVEL env (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
+# "json" (default) or "text" for human-readable local output
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Fraction of DEBUG records kept (0-1), so debug logging can stay on under load
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+# Records buffered for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Set per request by RequestContextMiddleware and deps.get_current_user
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+tenant_id_var: ContextVar[Optional[str]] = ContextVar("tenant_id", default=None)
+
+# Optional attributes copied into the JSON output when present on a record
+CONTEXT_FIELDS = ("request_id", "tenant_id", "duration_ms")
+
+
+class ContextFilter(logging.Filter):
+    """
+    Stamp records with the request context. Runs in the calling thread, before
+    the record crosses the queue and the context is lost.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "tenant_id", None) is None:
+            record.tenant_id = tenant_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keep only a fraction of DEBUG records; other levels always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking or raising when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Hand over a copy of the record unformatted, so the writer thread formats it
+        off the event loop. The traceback is only rendered here when the exception
+        can't be pickled.
+        """
+        record = copy.copy(record)
+        if record.exc_info and record.exc_info[1] is not None:
+            try:
+                pickle.dumps(record.exc_info[1])
+            except Exception:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "text":
+        return logging.Formatter(
+            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    return JsonFormatter()
+
 
 def _setup_logger() -> logging.Logger:
     """Create and configure the global application logger."""
@@ -23,13 +141,32 @@ def _setup_logger() -> logging.Logger:
     log.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
     log.propagate = False
 
-    fmt = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(fmt)
-    log.addHandler(handler)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_build_formatter())
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    queue_handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE_RATE))
+    queue_handler.addFilter(ContextFilter())
+    log.addHandler(queue_handler)
+
+    listeners = []
+
+    def start_listener() -> None:
+        listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+        listener.start()
+        # Flush whatever is still queued on shutdown
+        atexit.register(listener.stop)
+        listeners.append(listener)
+
+    def restart_in_child() -> None:
+        # The writer thread does not survive fork (e.g. gunicorn --preload), so a
+        # forked worker gets a fresh queue and its own listener
+        atexit.unregister(listeners.pop().stop)
+        queue_handler.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        start_listener()
+
+    start_listener()
+    os.register_at_fork(after_in_child=restart_in_child)
 
     return log
 
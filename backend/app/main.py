@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -6,10 +8,33 @@ from slowapi.middleware import SlowAPIMiddleware
 
 from app.logger import get_logger
 from app.api.v1.api import api_router
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import METRICS_PATH, PrometheusMiddleware, instrument_engine, render_metrics
+from app.core.profiling import ProfilingMiddleware
 from app.core.rate_limit import limiter
+from app.core.security import shutdown_hash_processes
+from app.core.request_context import RequestContextMiddleware
+from app.core.server_timing import ServerTimingMiddleware
+from app.db.instrumentation import QueryStatsMiddleware, instrument_queries
+from app.db import shards
+from app.services.webhooks import webhook_dispatcher
 
 log = get_logger(__name__)
-app = FastAPI(title="multi-t-inventory API", version="0.1.0")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Deliver low-stock batches still inside their window before the worker exits
+    await webhook_dispatcher.aclose()
+    shutdown_hash_processes()
+    await shards.dispose_engines()
+
+
+app = FastAPI(title="multi-t-inventory API", version="0.1.0", lifespan=lifespan)
+
+# Added first so it is the innermost middleware and stores exactly what the endpoint returned
+app.add_middleware(IdempotencyMiddleware)
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -23,4 +48,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestContextMiddleware)
+for shard_engine in shards.engines():
+    instrument_queries(shard_engine)
+
+# Added last so it is the outermost middleware and times the whole stack
+app.add_middleware(PrometheusMiddleware)
+for shard_engine in shards.engines():
+    instrument_engine(shard_engine)
+
 app.include_router(api_router, prefix="/api/v1")
+
+
+@app.get(METRICS_PATH, include_in_schema=False)
+def metrics() -> Response:
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -0,0 +1,27 @@
+from app.db.session import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, PrimaryKeyConstraint, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class IdempotencyKey(Base):
+    """
+    First response to a write sent with an `Idempotency-Key`, replayed for retries.
+
+    `status_code` stays null while the first request is still running; its claim
+    can be taken over once `locked_until` passes (e.g. the worker died).
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String, nullable=False)
+    # Method, path and body of the first request; a retry must match it
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (PrimaryKeyConstraint("tenant_id", "key"),)
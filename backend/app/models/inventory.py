@@ -1,6 +1,6 @@
 from app.db.session import Base
 from app.models.mixins import TenantAwareMixin, TimestampMixin
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import CheckConstraint, Column, Index, Integer, ForeignKey, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.orm import relationship
@@ -11,12 +11,29 @@ class Inventory(Base, TenantAwareMixin, TimestampMixin):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
 
     min_stock = Column(Integer, default=0)
     current_stock = Column(Integer, default=0)
+    # Reorder-up-to level; the reorder engine falls back to a multiple of min_stock
+    target_stock = Column(Integer, nullable=True)
+    # Units held by unexpired reservations; available stock is current_stock - reserved_stock
+    reserved_stock = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Bumped by every update; served as the ETag and checked against If-Match
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
 
     product = relationship("Product", back_populates="inventories")
     tenant = relationship("Tenant", back_populates="inventories")
 
-    __table_args__ = (UniqueConstraint("tenant_id", "product_id", name="uq_tenant_product_stock"),)
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "product_id", name="uq_tenant_product_stock"),
+        # Stock can't be set below what is held, or committing the holds would oversell
+        CheckConstraint("current_stock >= reserved_stock", name="ck_inventories_stock_covers_reserved"),
+        # Only low-stock rows, in the order the reorder engine walks them
+        Index(
+            "ix_inventories_low_stock",
+            "tenant_id",
+            "id",
+            postgresql_where=current_stock < min_stock,
+        ),
+    )
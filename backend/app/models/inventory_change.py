@@ -0,0 +1,104 @@
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    DDL,
+    Index,
+    Integer,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+# NOTIFY channel; the payload is the tenant id of the changed row
+INVENTORY_CHANGES_CHANNEL = "inventory_changes"
+# Transaction-local setting under which the trigger records nothing: rows copied or
+# removed by a tenant move are not changes to the tenant's inventory
+SKIP_CHANGES_SETTING = "app.skip_inventory_changes"
+
+# Every write to `inventories` (API, bulk SQL, COPY) is recorded by this trigger, so
+# no write path can forget to publish. Notifications with the same payload are
+# folded by Postgres within a transaction, so a bulk write wakes each tenant once.
+INVENTORY_CHANGE_TRIGGER = [
+    f"""
+CREATE OR REPLACE FUNCTION record_inventory_change() RETURNS trigger AS $$
+DECLARE
+    changed inventories%ROWTYPE;
+BEGIN
+    IF current_setting('{SKIP_CHANGES_SETTING}', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+    IF TG_OP = 'UPDATE'
+       AND (NEW.product_id, NEW.min_stock, NEW.current_stock)
+           IS NOT DISTINCT FROM (OLD.product_id, OLD.min_stock, OLD.current_stock) THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO inventory_changes (tenant_id, inventory_id, product_id, min_stock, current_stock, deleted)
+    VALUES (changed.tenant_id, changed.id, changed.product_id, changed.min_stock, changed.current_stock,
+            TG_OP = 'DELETE');
+    PERFORM pg_notify('{INVENTORY_CHANGES_CHANNEL}', changed.tenant_id::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS inventory_change ON inventories",
+    """
+CREATE TRIGGER inventory_change AFTER INSERT OR UPDATE OR DELETE ON inventories
+    FOR EACH ROW EXECUTE FUNCTION record_inventory_change()
+""",
+]
+
+
+class InventoryChange(Base):
+    """
+    Append-only log of inventory row states, read by the change stream.
+
+    `txid` is the id of the writing transaction. Readers only consume rows whose
+    transaction is older than every transaction still running, so a cursor can
+    never skip past a write that commits late.
+    """
+
+    __tablename__ = "inventory_changes"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    txid = Column(BigInteger, server_default=text("(pg_current_xact_id()::text)::bigint"), nullable=False)
+    # No foreign keys: changes outlive the rows they describe, including deletes
+    # cascaded from a tenant or product
+    tenant_id = Column(UUID(as_uuid=True), nullable=False)
+    inventory_id = Column(UUID(as_uuid=True), nullable=False)
+    product_id = Column(UUID(as_uuid=True), nullable=False)
+    min_stock = Column(Integer)
+    current_stock = Column(Integer)
+    deleted = Column(Boolean, server_default=text("false"), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    __table_args__ = (Index("ix_inventory_changes_tenant_txid", "tenant_id", "txid"),)
+
+
+class InventoryChangePrune(Base):
+    """
+    Highest `txid` pruned from the change log. A cursor at or below it may have
+    missed pruned changes, even once the log is empty.
+    """
+
+    __tablename__ = "inventory_change_prunes"
+
+    # A single row
+    id = Column(Integer, primary_key=True, default=1)
+    txid = Column(BigInteger, nullable=False)
+    pruned_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# Tables built with metadata.create_all (tests) get the trigger too; migrations create it explicitly
+for statement in INVENTORY_CHANGE_TRIGGER:
+    # DDL() treats % as a format character
+    event.listen(Base.metadata, "after_create", DDL(statement.replace("%", "%%")).execute_if(dialect="postgresql"))
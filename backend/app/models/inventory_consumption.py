@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Date, DDL, ForeignKey, Index, Integer, PrimaryKeyConstraint, event
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+# Stock decreases are summed per item and UTC day as they happen, so the forecast
+# reads one small row per item and day instead of replaying every write.
+INVENTORY_CONSUMPTION_TRIGGER = [
+    """
+CREATE OR REPLACE FUNCTION record_inventory_consumption() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO inventory_consumption (inventory_id, day, tenant_id, quantity)
+    VALUES (NEW.id, (now() AT TIME ZONE 'UTC')::date, NEW.tenant_id, OLD.current_stock - NEW.current_stock)
+    ON CONFLICT (inventory_id, day)
+    DO UPDATE SET quantity = inventory_consumption.quantity + EXCLUDED.quantity;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS inventory_consumption ON inventories",
+    """
+CREATE TRIGGER inventory_consumption AFTER UPDATE OF current_stock ON inventories
+    FOR EACH ROW WHEN (NEW.current_stock < OLD.current_stock)
+    EXECUTE FUNCTION record_inventory_consumption()
+""",
+]
+
+
+class InventoryConsumption(Base):
+    """
+    Units taken out of stock per item and day, read by the demand forecast.
+    """
+
+    __tablename__ = "inventory_consumption"
+
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("inventory_id", "day"),
+        Index("ix_inventory_consumption_tenant_day", "tenant_id", "day"),
+    )
+
+
+# Tables built with metadata.create_all (tests) get the trigger too; migrations create it explicitly
+for statement in INVENTORY_CONSUMPTION_TRIGGER:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,145 @@
+from sqlalchemy import BigInteger, Column, DDL, Index, Integer, PrimaryKeyConstraint, String, event, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+# Inventory writes are applied once per statement, from its transition tables, so
+# a bulk write updates each (tenant, prefix) row once. Writes that don't move any
+# count (e.g. a new target_stock) leave the summary untouched. Products roll up
+# under the part of their SKU before the first dash ("ELEC-LP15" -> "ELEC"), and
+# leave the summary as soon as they are deleted, not when the purger removes them.
+INVENTORY_SUMMARY_TRIGGER = [
+    """
+CREATE OR REPLACE FUNCTION apply_inventory_summary() RETURNS trigger AS $$
+DECLARE
+    deltas text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        deltas := 'SELECT *, 1 AS sign FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        deltas := 'SELECT *, -1 AS sign FROM old_rows';
+    ELSE
+        deltas := 'SELECT *, 1 AS sign FROM new_rows UNION ALL SELECT *, -1 AS sign FROM old_rows';
+    END IF;
+    EXECUTE format($sql$
+        INSERT INTO inventory_summaries AS s
+            (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+        SELECT * FROM (
+            SELECT d.tenant_id,
+                   split_part(coalesce(p.sku, ''), '-', 1),
+                   sum(d.sign) AS sku_count,
+                   sum(d.sign * coalesce(d.current_stock, 0)) AS total_units,
+                   sum(CASE WHEN coalesce(d.current_stock, 0) < coalesce(d.min_stock, 0) THEN d.sign ELSE 0 END)
+                       AS low_stock_count,
+                   sum(CASE WHEN coalesce(d.current_stock, 0) <= 0 THEN d.sign ELSE 0 END) AS out_of_stock_count
+            FROM (%s) d
+            JOIN products p ON p.id = d.product_id AND p.deleted_at IS NULL
+            GROUP BY 1, 2
+        ) counts
+        WHERE (sku_count, total_units, low_stock_count, out_of_stock_count) <> (0, 0, 0, 0)
+        -- The same lock order everywhere keeps concurrent bulk writes from deadlocking
+        ORDER BY 1, 2
+        ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+            sku_count = s.sku_count + EXCLUDED.sku_count,
+            total_units = s.total_units + EXCLUDED.total_units,
+            low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+            out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count
+    $sql$, deltas);
+    DELETE FROM inventory_summaries WHERE sku_count = 0;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    # A product's counts move to its new prefix when its SKU changes, and are removed
+    # when it is deleted (soft deleted, or removed while live). Removed up front: the
+    # cascaded inventory deletes can't see the product.
+    """
+CREATE OR REPLACE FUNCTION apply_product_summary_prefix() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO inventory_summaries AS s
+        (tenant_id, sku_prefix, sku_count, total_units, low_stock_count, out_of_stock_count)
+    SELECT i.tenant_id,
+           prefixes.sku_prefix,
+           sum(prefixes.sign),
+           sum(prefixes.sign * coalesce(i.current_stock, 0)),
+           sum(CASE WHEN coalesce(i.current_stock, 0) < coalesce(i.min_stock, 0) THEN prefixes.sign ELSE 0 END),
+           sum(CASE WHEN coalesce(i.current_stock, 0) <= 0 THEN prefixes.sign ELSE 0 END)
+    FROM inventories i
+    CROSS JOIN (
+        SELECT -1, split_part(coalesce(OLD.sku, ''), '-', 1) WHERE OLD.deleted_at IS NULL
+        UNION ALL
+        SELECT 1, split_part(coalesce(NEW.sku, ''), '-', 1) WHERE TG_OP = 'UPDATE' AND NEW.deleted_at IS NULL
+    ) AS prefixes (sign, sku_prefix)
+    WHERE i.product_id = OLD.id
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (tenant_id, sku_prefix) DO UPDATE SET
+        sku_count = s.sku_count + EXCLUDED.sku_count,
+        total_units = s.total_units + EXCLUDED.total_units,
+        low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+        out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count;
+    DELETE FROM inventory_summaries WHERE sku_count = 0;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS inventory_summary_insert ON inventories",
+    """
+CREATE TRIGGER inventory_summary_insert AFTER INSERT ON inventories
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+""",
+    "DROP TRIGGER IF EXISTS inventory_summary_update ON inventories",
+    """
+CREATE TRIGGER inventory_summary_update AFTER UPDATE ON inventories
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+""",
+    "DROP TRIGGER IF EXISTS inventory_summary_delete ON inventories",
+    """
+CREATE TRIGGER inventory_summary_delete AFTER DELETE ON inventories
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_inventory_summary()
+""",
+    "DROP TRIGGER IF EXISTS inventory_summary_product_sku ON products",
+    """
+CREATE TRIGGER inventory_summary_product_sku AFTER UPDATE OF sku, deleted_at ON products
+    FOR EACH ROW
+    WHEN (split_part(coalesce(OLD.sku, ''), '-', 1) IS DISTINCT FROM split_part(coalesce(NEW.sku, ''), '-', 1)
+          OR (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL))
+    EXECUTE FUNCTION apply_product_summary_prefix()
+""",
+    "DROP TRIGGER IF EXISTS inventory_summary_product_delete ON products",
+    """
+CREATE TRIGGER inventory_summary_product_delete BEFORE DELETE ON products
+    FOR EACH ROW EXECUTE FUNCTION apply_product_summary_prefix()
+""",
+]
+
+
+class InventorySummary(Base):
+    """
+    Per-tenant inventory counts for each SKU prefix, kept current by triggers.
+    """
+
+    __tablename__ = "inventory_summaries"
+
+    # No foreign keys: rows are removed as their counts drop to zero, which
+    # happens while a tenant's inventories are being cascade-deleted
+    tenant_id = Column(UUID(as_uuid=True), nullable=False)
+    sku_prefix = Column(String, nullable=False)
+    sku_count = Column(Integer, nullable=False)
+    total_units = Column(BigInteger, nullable=False)
+    low_stock_count = Column(Integer, nullable=False)
+    out_of_stock_count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "sku_prefix"),
+        Index("ix_inventory_summaries_empty", "tenant_id", postgresql_where=text("sku_count = 0")),
+    )
+
+
+# Tables built with metadata.create_all (tests) get the triggers too; migrations create them explicitly
+for statement in INVENTORY_SUMMARY_TRIGGER:
+    # DDL() treats % as a format character
+    event.listen(Base.metadata, "after_create", DDL(statement.replace("%", "%%")).execute_if(dialect="postgresql"))
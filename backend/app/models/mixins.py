@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from sqlalchemy.orm import Mapped, mapped_column, declared_attr
 from sqlalchemy import DateTime, ForeignKey, func
@@ -33,3 +34,12 @@ class TenantAwareMixin:
             nullable=False,
             index=True,
         )
+
+
+class SoftDeleteMixin:
+    """
+    Mixin for records deleted in two steps: `deleted_at` hides them from CRUD
+    reads at once, and the purger removes them and their dependents later.
+    """
+
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
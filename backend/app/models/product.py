@@ -1,12 +1,12 @@
 from app.db.session import Base
-from app.models.mixins import TimestampMixin
+from app.models.mixins import SoftDeleteMixin, TimestampMixin
 from sqlalchemy import Column, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.orm import relationship
 
 
-class Product(Base, TimestampMixin):
+class Product(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "products"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
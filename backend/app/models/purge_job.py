@@ -0,0 +1,27 @@
+from app.db.session import Base
+from app.models.mixins import TimestampMixin
+from sqlalchemy import BigInteger, Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+
+class PurgeJob(Base, TimestampMixin):
+    """
+    Removal of a soft-deleted record and everything depending on it, one batch per
+    transaction. `rows_deleted` is committed with each batch, so it is the progress
+    so far, and an interrupted purge simply continues with the next batch.
+    """
+
+    __tablename__ = "purge_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Table of the deleted record: "products" or "tenants"
+    table_name = Column(String, nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    rows_deleted = Column(BigInteger, nullable=False, default=0)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only unfinished jobs, oldest first, as the purger picks them
+        Index("ix_purge_jobs_pending", "created_at", postgresql_where=finished_at.is_(None)),
+    )
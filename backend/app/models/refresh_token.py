@@ -0,0 +1,24 @@
+from app.db.session import Base
+from app.models.mixins import TimestampMixin
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+
+class RefreshToken(Base, TimestampMixin):
+    """
+    One refresh token, stored as its SHA-256 digest. Every refresh replaces the
+    token with a new one in the same family. Presenting a token that was already
+    used means it leaked, so the whole family is revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Every token descended from one login
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(String, nullable=False, unique=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,21 @@
+from app.db.session import Base
+from app.models.mixins import TimestampMixin
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+
+class ReorderRun(Base, TimestampMixin):
+    """
+    One sweep of the reorder engine. The cursor is the (tenant_id, inventory_id)
+    of the last row whose orders were recorded, so an interrupted sweep resumes there.
+    """
+
+    __tablename__ = "reorder_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    cursor_tenant_id = Column(UUID(as_uuid=True), nullable=True)
+    cursor_inventory_id = Column(UUID(as_uuid=True), nullable=True)
+    lines = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,28 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+from app.models.mixins import TenantAwareMixin, TimestampMixin
+
+
+class Reservation(Base, TenantAwareMixin, TimestampMixin):
+    """
+    A hold on `quantity` units of an inventory item until `expires_at`.
+
+    While the row exists its quantity is counted in the item's `reserved_stock`;
+    every statement that inserts or deletes a reservation moves that counter too.
+    """
+
+    __tablename__ = "reservations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    inventory_id = Column(
+        UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # The sweeper takes the oldest expired holds first
+    __table_args__ = (Index("ix_reservations_expires_at", "expires_at"),)
@@ -0,0 +1,26 @@
+from app.db.session import Base
+from app.models.mixins import TenantAwareMixin, TimestampMixin
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+# Written before the supplier is called, so a crash can never lose an order
+SUPPLY_ORDER_PENDING = "pending"
+SUPPLY_ORDER_PLACED = "placed"
+SUPPLY_ORDER_FAILED = "failed"
+# Orders that count against the next reorder quantity
+SUPPLY_ORDER_OPEN = (SUPPLY_ORDER_PENDING, SUPPLY_ORDER_PLACED)
+
+
+class SupplyOrder(Base, TenantAwareMixin, TimestampMixin):
+    __tablename__ = "supply_orders"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("inventories.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default=SUPPLY_ORDER_PENDING)
+    # Lines sent to the supplier in the same request share a reference (also the supplier's idempotency key)
+    reference = Column(String, nullable=False, index=True)
+    external_reference_id = Column(String, nullable=True)
+
+    __table_args__ = (Index("ix_supply_orders_inventory_created", "inventory_id", "created_at"),)
@@ -1,15 +1,18 @@
 from app.db.session import Base
-from app.models.mixins import TimestampMixin
-from sqlalchemy import Column, String
+from app.models.mixins import SoftDeleteMixin, TimestampMixin
+from sqlalchemy import Column, DateTime, String, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.orm import relationship
 
 
-class Tenant(Base, TimestampMixin):
+class Tenant(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "tenants"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
+    # Database holding the tenant's data (see app/db/shards.py), and when it last moved there
+    shard = Column(String, nullable=False, server_default=text("'default'"))
+    shard_moved_at = Column(DateTime(timezone=True), nullable=True)
     inventories = relationship("Inventory", back_populates="tenant")
     users = relationship("User", back_populates="tenant")
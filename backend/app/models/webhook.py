@@ -0,0 +1,15 @@
+from app.db.session import Base
+from app.models.mixins import TenantAwareMixin, TimestampMixin
+from sqlalchemy import Boolean, Column, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+
+class Webhook(Base, TenantAwareMixin, TimestampMixin):
+    __tablename__ = "webhooks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    url = Column(String, nullable=False)
+    # Shared with the receiver to verify the X-Webhook-Signature header
+    secret = Column(String, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+from app.core.config import settings
+
+
+class BatchGetRequest(BaseModel):
+    """
+    Keys to look up in one call: either `ids` or `skus`, at most BATCH_GET_MAX_KEYS.
+    """
+
+    ids: Optional[List[UUID]] = None
+    skus: Optional[List[str]] = None
+
+    @model_validator(mode="after")
+    def one_key_list(self) -> "BatchGetRequest":
+        if (self.ids is None) == (self.skus is None):
+            raise ValueError("Send either ids or skus")
+        if len(self.keys) > settings.BATCH_GET_MAX_KEYS:
+            raise ValueError(f"At most {settings.BATCH_GET_MAX_KEYS} keys per request")
+        return self
+
+    @property
+    def keys(self) -> List[Union[UUID, str]]:
+        return self.ids if self.ids is not None else self.skus
+
+    def in_request_order(self, found: Dict[Any, Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """
+        Lay out rows keyed by id or SKU as one entry per requested key, null where missing.
+        """
+        keys = self.keys
+        return {
+            "items": [found.get(key) for key in keys],
+            "missing": [str(key) for key in dict.fromkeys(keys) if key not in found],
+        }
@@ -1,12 +1,14 @@
+from datetime import date, datetime
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field
 
 
 class InventoryBase(BaseModel):
     min_stock: int = Field(ge=0)
     current_stock: int = Field(ge=0)
+    target_stock: Optional[int] = Field(None, ge=0)
     product_id: UUID
 
 
@@ -17,6 +19,7 @@ class InventoryCreate(InventoryBase):
 class InventoryUpdate(BaseModel):
     min_stock: Optional[int] = Field(None, ge=0)
     current_stock: Optional[int] = Field(None, ge=0)
+    target_stock: Optional[int] = Field(None, ge=0)
 
 
 class InventoryInDBBase(InventoryBase):
@@ -27,14 +30,91 @@ class InventoryInDBBase(InventoryBase):
 
 class InventoryPublic(InventoryBase):
     id: UUID
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class InventoryAvailability(BaseModel):
+    """
+    Stock of an item not held by reservations.
+    """
+
+    id: UUID
+    current_stock: int
+    reserved_stock: int
+    available_stock: int
+
+
+class InventoryBatchGetResult(BaseModel):
+    """
+    One entry per requested key, in request order; null where nothing matched.
+    """
+
+    items: List[Optional[InventoryPublic]]
+    missing: List[str]
+
+
+class InventoryChangeEvent(BaseModel):
+    """
+    Latest state of an inventory item, as sent on the change stream.
+    """
+
+    id: UUID
+    product_id: UUID
+    min_stock: Optional[int] = None
+    current_stock: Optional[int] = None
+    deleted: bool = False
+    changed_at: datetime
+
+
+class InventoryForecast(BaseModel):
+    """
+    Forecast daily demand for an item and when its stock runs out at that rate.
+    """
+
+    id: UUID
+    product_id: UUID
+    current_stock: int
+    min_stock: int
+    daily_demand: float
+    days_until_stockout: Optional[float] = None
+    stockout_date: Optional[date] = None
+    # Demand expected over the reorder lead time
+    suggested_min_stock: int
+
+
+class InventoryCounts(BaseModel):
+    sku_count: int
+    total_units: int
+    low_stock_count: int
+    out_of_stock_count: int
+
+
+class InventoryPrefixSummary(InventoryCounts):
+    sku_prefix: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventorySummary(InventoryCounts):
+    """
+    Tenant-wide inventory counts, with the same counts per SKU prefix.
+    """
+
+    prefixes: List[InventoryPrefixSummary]
+
+
 class SupplyRequest(BaseModel):
     quantity: int = Field(ge=0)
 
 
+class SupplyLine(BaseModel):
+    product_sku: str
+    product_name: str
+    quantity: int = Field(gt=0)
+
+
 class SupplyResponse(BaseModel):
     status: str
     message: str
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
@@ -29,3 +29,25 @@ class ProductPublic(ProductBase):
     id: UUID
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBatchGetResult(BaseModel):
+    """
+    One entry per requested key, in request order; null where nothing matched.
+    """
+
+    items: List[Optional[ProductPublic]]
+    missing: List[str]
+
+
+class ProductImportRowError(BaseModel):
+    line: int
+    detail: str
+
+
+class ProductImportResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: List[ProductImportRowError] = []
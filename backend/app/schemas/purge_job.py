@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+
+class PurgeJobPublic(BaseModel):
+    """
+    Progress of removing a deleted product or tenant; finished once `finished_at` is set.
+    """
+
+    id: UUID
+    table_name: str
+    entity_id: UUID
+    rows_deleted: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
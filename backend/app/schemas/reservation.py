@@ -0,0 +1,26 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class ReservationCreate(BaseModel):
+    inventory_id: UUID
+    quantity: int = Field(gt=0)
+    # How long the hold lasts unless committed or released first
+    ttl_seconds: int = Field(settings.RESERVATION_TTL_SECONDS, gt=0, le=settings.RESERVATION_MAX_TTL_SECONDS)
+
+
+class ReservationPublic(BaseModel):
+    """
+    A hold on stock, with the item's stock left to reserve once it was placed,
+    committed or released.
+    """
+
+    id: UUID
+    inventory_id: UUID
+    quantity: int
+    expires_at: datetime
+    available_stock: int
@@ -1,6 +1,6 @@
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field, EmailStr
-from typing import Optional
+from typing import List, Optional
 
 from app.core.config import settings
 
@@ -36,6 +36,24 @@ class UserInviteResponse(UserBase):
     temporary_password: str
 
 
+class UserBulkInviteRequest(BaseModel):
+    users: List[UserInviteRequest] = Field(..., min_length=1, max_length=settings.BULK_INVITE_MAX_USERS)
+
+
+class UserBulkInviteResult(BaseModel):
+    """
+    One line of a bulk invite response: the new user and its temporary password,
+    or `error` when the email was taken or already listed earlier in the request.
+    """
+
+    email: str
+    id: Optional[UUID] = None
+    full_name: Optional[str] = None
+    tenant_id: Optional[UUID] = None
+    temporary_password: Optional[str] = None
+    error: Optional[str] = None
+
+
 class UserUpdate(UserBase):
     email: Optional[EmailStr] = None
     full_name: Optional[str] = None
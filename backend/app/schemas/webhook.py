@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict
+
+
+class WebhookBase(BaseModel):
+    url: AnyHttpUrl
+
+
+class WebhookCreate(WebhookBase):
+    pass
+
+
+class WebhookUpdate(BaseModel):
+    is_active: bool
+
+
+class WebhookInDBBase(WebhookBase):
+    id: UUID
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookPublic(WebhookInDBBase):
+    pass
+
+
+class WebhookCreated(WebhookInDBBase):
+    """
+    Returned once on registration: the only time the signing secret is shown.
+    """
+
+    secret: str
+
+
+class LowStockEvent(BaseModel):
+    type: str = "inventory.low_stock"
+    inventory_id: UUID
+    product_id: UUID
+    min_stock: int
+    current_stock: int
+    occurred_at: datetime
+
+
+class WebhookBatch(BaseModel):
+    """
+    Body of one webhook delivery: every event for a tenant within the batch window.
+    """
+
+    id: UUID
+    tenant_id: UUID
+    events: List[LowStockEvent]
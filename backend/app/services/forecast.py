@@ -0,0 +1,175 @@
+"""
+Demand forecast and projected stockout dates for all of a tenant's items.
+
+A trigger on `inventories` adds every stock decrease to `inventory_consumption`,
+summed per item and UTC day. A forecast loads the tenant's last
+`FORECAST_HISTORY_DAYS` complete days in one query and lays them out as an
+items x days matrix. Demand for every item is then computed at once with NumPy,
+either as a moving average over the last `FORECAST_WINDOW_DAYS` (`sma`) or as
+an exponentially weighted average with factor `FORECAST_SMOOTHING` (`ema`).
+Each worker caches a tenant's forecast until the tenant's inventory changes
+again or the day rolls over.
+"""
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+
+
+def demand_matrix(idx: np.ndarray, age: np.ndarray, quantity: np.ndarray, items: int, days: int) -> np.ndarray:
+    """
+    Units consumed per item (rows) and day (columns, oldest first); `age` runs from 1 (yesterday) to `days`.
+    """
+    cells = np.bincount(idx * days + (days - age), weights=quantity, minlength=items * days)
+    return cells.reshape(items, days)
+
+
+def moving_average(matrix: np.ndarray, window: int) -> np.ndarray:
+    return matrix[:, -window:].mean(axis=1)
+
+
+def exponential_smoothing(matrix: np.ndarray, alpha: float) -> np.ndarray:
+    # Weight alpha * (1 - alpha)^k for the day k days before the newest, normalised
+    # over the history so a short history isn't biased towards zero
+    weights = alpha * (1 - alpha) ** np.arange(matrix.shape[1])[::-1]
+    return matrix @ weights / weights.sum()
+
+
+def project_stockout(current_stock: np.ndarray, demand: np.ndarray) -> np.ndarray:
+    """
+    Days until each item runs out at its forecast demand; infinite if nothing is consumed.
+    """
+    days = np.full(current_stock.shape, np.inf)
+    np.divide(current_stock, demand, out=days, where=demand > 0)
+    return np.where(current_stock <= 0, 0.0, days)
+
+
+def forecast(history: Dict[str, List[Any]], *, today: date, method: str) -> List[Dict[str, Any]]:
+    """
+    Forecast rows for the columns from `crud.inventory.get_consumption_history`,
+    soonest stockout first.
+    """
+    items = len(history["id"])
+    if not items:
+        return []
+    ids = np.asarray(history["id"], dtype=object)
+    product_ids = np.asarray(history["product_id"], dtype=object)
+    current_stock = np.nan_to_num(np.asarray(history["current_stock"], dtype=np.float64))
+    min_stock = np.nan_to_num(np.asarray(history["min_stock"], dtype=np.float64))
+
+    # Flatten the per-item arrays into (item, age, quantity) triples
+    ages = [value or () for value in history["ages"]]
+    lengths = np.fromiter(map(len, ages), dtype=np.int64, count=items)
+    total = int(lengths.sum())
+    matrix = demand_matrix(
+        np.repeat(np.arange(items), lengths),
+        np.fromiter(chain.from_iterable(ages), dtype=np.int64, count=total),
+        np.fromiter(chain.from_iterable(value or () for value in history["quantities"]), dtype=np.float64, count=total),
+        items,
+        settings.FORECAST_HISTORY_DAYS,
+    )
+    if method == "ema":
+        demand = exponential_smoothing(matrix, settings.FORECAST_SMOOTHING)
+    else:
+        demand = moving_average(matrix, min(settings.FORECAST_WINDOW_DAYS, settings.FORECAST_HISTORY_DAYS))
+
+    days_until = project_stockout(current_stock, demand)
+    finite = np.isfinite(days_until)
+    stockout = np.full(items, np.datetime64("NaT"), dtype="datetime64[D]")
+    stockout[finite] = np.datetime64(today, "D") + np.floor(days_until[finite]).astype("timedelta64[D]")
+    suggested = np.ceil(demand * settings.REORDER_LEAD_TIME_HOURS / 24 - 1e-9).astype(np.int64)
+
+    order = np.argsort(days_until, kind="stable")
+    days_out = np.round(days_until, 2).astype(object)
+    days_out[~finite] = None
+    dates_out = stockout.astype(object)
+    columns = zip(
+        ids[order],
+        product_ids[order],
+        current_stock[order].astype(np.int64).tolist(),
+        min_stock[order].astype(np.int64).tolist(),
+        np.round(demand[order], 3).tolist(),
+        days_out[order],
+        dates_out[order],
+        suggested[order].tolist(),
+    )
+    return [
+        {
+            "id": id_,
+            "product_id": product_id,
+            "current_stock": stock,
+            "min_stock": minimum,
+            "daily_demand": daily,
+            "days_until_stockout": days_left,
+            "stockout_date": stockout_day,
+            "suggested_min_stock": suggested_min,
+        }
+        for id_, product_id, stock, minimum, daily, days_left, stockout_day, suggested_min in columns
+    ]
+
+
+class ForecastCache:
+    def __init__(self, size: int):
+        """
+        Latest forecast per tenant, least recently used tenants evicted first.
+        """
+        self.size = size
+        self._entries: "OrderedDict[UUID, Tuple[Hashable, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def get(self, tenant_id: UUID, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(tenant_id)
+        if entry is None or entry[0] != key:
+            return None
+        self._entries.move_to_end(tenant_id)
+        return entry[1]
+
+    def put(self, tenant_id: UUID, key: Hashable, rows: List[Dict[str, Any]]) -> None:
+        self._entries[tenant_id] = (key, rows)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+forecast_cache = ForecastCache(settings.FORECAST_CACHE_TENANTS)
+
+
+async def get_tenant_forecast(
+    db: AsyncSession,
+    *,
+    tenant_id: UUID,
+    method: str = "sma",
+    cache: ForecastCache = forecast_cache,
+    today: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Forecast for every item of the tenant, recomputed only after its inventory changed.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    # Read before the history, so a write landing in between only costs a recompute
+    key = (await crud.inventory.get_change_version(db, tenant_id=tenant_id), today, method)
+    rows = cache.get(tenant_id, key)
+    if rows is None:
+        history = await crud.inventory.get_consumption_history(
+            db, tenant_id=tenant_id, until=today, days=settings.FORECAST_HISTORY_DAYS
+        )
+        rows = forecast(history, today=today, method=method)
+        cache.put(tenant_id, key, rows)
+    return rows
+
+
+def history_cutoff(today: date) -> date:
+    """
+    Consumption older than this is never read again.
+    """
+    return today - timedelta(days=settings.FORECAST_HISTORY_DAYS)
@@ -0,0 +1,190 @@
+"""
+Tenant-scoped inventory change stream, pushed as server-sent events.
+
+A trigger on `inventories` appends every write to `inventory_changes` and
+NOTIFYs the tenant id. Each worker keeps a single LISTEN connection, opened
+while it has subscribers, and uses it only to wake that tenant's streams; the
+streams then read the log from their own cursor. Writes arriving within
+`INVENTORY_STREAM_COALESCE_MS` are sent as one batch, with one event per item
+carrying its latest state. The SSE event id is the cursor, so a reconnecting
+client resumes via `Last-Event-ID` without losing changes.
+
+Each shard has its own change log and hub. Cursors don't carry over between
+databases: when a tenant moves, its open streams end and reconnect to the new
+shard, where a cursor is answered with `reset` for as long as the old shard's
+log could have been resumed from.
+"""
+
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set
+from uuid import UUID
+
+import asyncpg
+import orjson
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.logger import get_logger
+from app.models.inventory_change import INVENTORY_CHANGES_CHANNEL
+from app.schemas.inventory import InventoryChangeEvent
+
+log = get_logger(__name__)
+
+# Seconds between liveness checks on the LISTEN connection
+LISTENER_PING_SECONDS = 30
+LISTENER_RECONNECT_SECONDS = 1
+
+
+class InventoryChangeHub:
+    def __init__(self, database_url: str):
+        """
+        Fan NOTIFY wakeups from one LISTEN connection out to every subscribed stream.
+        """
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._subscribers: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def subscribe(self, tenant_id: UUID) -> AsyncIterator[asyncio.Event]:
+        """
+        Yield an event that is set whenever the tenant's inventory may have changed.
+        """
+        key = str(tenant_id)
+        wakeup = asyncio.Event()
+        self._subscribers[key].add(wakeup)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            yield wakeup
+        finally:
+            self._subscribers[key].discard(wakeup)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+            if not self._subscribers and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+
+    def _wake(self, tenant_id: str) -> None:
+        for wakeup in self._subscribers.get(tenant_id, ()):
+            wakeup.set()
+
+    def _wake_all(self) -> None:
+        for tenant_id in list(self._subscribers):
+            self._wake(tenant_id)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._wake(payload)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                try:
+                    lost = asyncio.Event()
+                    connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                    await connection.add_listener(INVENTORY_CHANGES_CHANNEL, self._on_notify)
+                    # Anything committed before LISTEN took effect must still be delivered
+                    self._wake_all()
+                    while not lost.is_set():
+                        try:
+                            await asyncio.wait_for(lost.wait(), timeout=LISTENER_PING_SECONDS)
+                        except asyncio.TimeoutError:
+                            await connection.execute("SELECT 1")
+                finally:
+                    await connection.close(timeout=5)
+            except (OSError, asyncpg.PostgresError, asyncio.TimeoutError) as exc:
+                log.warning("Inventory change listener disconnected: %s", exc)
+            await asyncio.sleep(LISTENER_RECONNECT_SECONDS)
+
+
+inventory_change_hub = InventoryChangeHub(settings.DATABASE_URL)
+_shard_hubs: Dict[str, InventoryChangeHub] = {shards.DEFAULT_SHARD: inventory_change_hub}
+
+
+def get_change_hub(shard: str) -> InventoryChangeHub:
+    """
+    The worker's hub for a shard's change log.
+    """
+    if shard not in _shard_hubs:
+        _shard_hubs[shard] = InventoryChangeHub(shards.get_url(shard))
+    return _shard_hubs[shard]
+
+
+async def _still_placed(tenant_id: UUID, shard: str) -> bool:
+    async with shards.get_sessionmaker(shards.DEFAULT_SHARD)() as db:
+        return await crud.tenant.get_shard(db, tenant_id=tenant_id) == shard
+
+
+async def _moved_recently(db: AsyncSession, *, tenant_id: UUID) -> bool:
+    # A cursor from before the move belongs to the old shard's log
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.INVENTORY_CHANGES_RETENTION_HOURS)
+    return await crud.tenant.moved_since(db, tenant_id=tenant_id, since=since)
+
+
+def _sse(event: str, data: bytes, cursor: Optional[int] = None) -> bytes:
+    head = f"id: {cursor}\n".encode() if cursor is not None else b""
+    return head + f"event: {event}\ndata: ".encode() + data + b"\n\n"
+
+
+def _changes_message(rows: List[dict], cursor: int) -> bytes:
+    events = [InventoryChangeEvent.model_validate(row).model_dump(mode="json") for row in rows]
+    return _sse("inventory", orjson.dumps(events), cursor)
+
+
+async def inventory_change_events(
+    db: AsyncSession,
+    *,
+    tenant_id: UUID,
+    cursor: Optional[int],
+    hub: Optional[InventoryChangeHub] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for a tenant's inventory changes after `cursor`.
+
+    The stream opens with a `ready` event. Each `inventory` event then holds a
+    JSON list of changed items. A `reset` event means the cursor is too old to
+    resume from: reload `GET /inventory/` and keep reading. Comment lines are
+    sent as keep-alives while nothing changes. The stream ends when the tenant
+    moves to another shard.
+    """
+    coalesce = settings.INVENTORY_STREAM_COALESCE_MS / 1000
+    heartbeat = settings.INVENTORY_STREAM_HEARTBEAT_SECONDS
+    shard = shards.shard_of(db)
+    hub = hub or get_change_hub(shard)
+
+    async with hub.subscribe(tenant_id) as wakeup:
+        if cursor is not None and (
+            await crud.inventory.changes_pruned_since(db, cursor=cursor)
+            or (shards.is_sharded() and await _moved_recently(db, tenant_id=tenant_id))
+        ):
+            yield _sse("reset", b"{}")
+            cursor = None
+        if cursor is None:
+            cursor = await crud.inventory.get_change_watermark(db)
+        yield _sse("ready", b"{}", cursor)
+
+        pending = True
+        while True:
+            if pending or wakeup.is_set():
+                wakeup.clear()
+                rows, cursor, pending = await crud.inventory.get_changes_since(db, tenant_id=tenant_id, cursor=cursor)
+                # Hand the connection back to the pool while waiting
+                await db.rollback()
+                if rows:
+                    yield _changes_message(rows, cursor)
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=coalesce if pending else heartbeat)
+                # Let a burst of writes settle into one batch
+                await asyncio.sleep(coalesce)
+            except asyncio.TimeoutError:
+                if shards.is_sharded() and not await _still_placed(tenant_id, shard):
+                    return
+                if not pending:
+                    yield b": keep-alive\n\n"
@@ -0,0 +1,123 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.schemas.product import ProductCreate, ProductImportRowError
+
+CSV_CONTENT_TYPE = "text/csv"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+SUPPORTED_CONTENT_TYPES = (CSV_CONTENT_TYPE, NDJSON_CONTENT_TYPE)
+
+# Only the first errors are echoed back; the rejected count is always exact
+MAX_REPORTED_ERRORS = 100
+
+# (line, sku, name, description) — the column order of the COPY staging table
+StagedRow = Tuple[int, str, str, Optional[str]]
+
+
+class ProductImportFormatError(ValueError):
+    """
+    Raised when the upload as a whole cannot be parsed (e.g. a CSV without a header).
+    """
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Decode a byte stream into lines without buffering more than one chunk.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+class ProductImportParser:
+    def __init__(self, content_type: str):
+        """
+        Streaming parser for product catalog uploads.
+
+        CSV uploads need a header row naming `sku`, `name` and optionally `description`,
+        with one record per line. NDJSON uploads hold one JSON object per line.
+        Invalid records are counted and reported instead of aborting the import.
+        """
+        if content_type not in SUPPORTED_CONTENT_TYPES:
+            raise ProductImportFormatError(f"Unsupported content type: {content_type or 'none'}")
+        self.content_type = content_type
+        self.rejected = 0
+        self.errors: List[ProductImportRowError] = []
+
+    async def rows(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[StagedRow]:
+        """
+        Yield validated rows ready to be staged with COPY.
+        """
+        header: Optional[List[str]] = None
+        line_no = 0
+        async for line in iter_lines(chunks):
+            line_no += 1
+            if not line.strip():
+                continue
+            if self.content_type == CSV_CONTENT_TYPE and header is None:
+                header = [column.strip().lower() for column in next(csv.reader([line]))]
+                if "sku" not in header or "name" not in header:
+                    raise ProductImportFormatError("CSV header must include 'sku' and 'name' columns")
+                continue
+
+            record = self._parse_csv(line_no, line, header) if header else self._parse_ndjson(line_no, line)
+            if record is None:
+                continue
+
+            row = self._validate(line_no, record)
+            if row is not None:
+                yield row
+
+    def _parse_csv(self, line_no: int, line: str, header: List[str]) -> Optional[dict]:
+        values = next(csv.reader([line]))
+        if len(values) != len(header):
+            self.reject(line_no, f"Expected {len(header)} columns, got {len(values)}")
+            return None
+        return dict(zip(header, values))
+
+    def _parse_ndjson(self, line_no: int, line: str) -> Optional[dict]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            self.reject(line_no, f"Invalid JSON: {exc.msg}")
+            return None
+        if not isinstance(record, dict):
+            self.reject(line_no, "Expected a JSON object")
+            return None
+        return record
+
+    def _validate(self, line_no: int, record: dict) -> Optional[StagedRow]:
+        try:
+            product = ProductCreate.model_validate(record)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            self.reject(line_no, f"{location}: {error['msg']}")
+            return None
+
+        sku = product.sku.strip()
+        name = product.name.strip()
+        if not sku or not name:
+            self.reject(line_no, "sku and name must not be empty")
+            return None
+
+        return line_no, sku, name, product.description or None
+
+    def reject(self, line_no: int, detail: str) -> None:
+        """
+        Count a record as rejected, reporting it if there is room.
+        """
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ProductImportRowError(line=line_no, detail=detail))
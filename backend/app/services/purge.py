@@ -0,0 +1,96 @@
+"""
+Background purge of soft-deleted products and tenants.
+
+Deleting a product or tenant only sets its `deleted_at`, which hides it from
+CRUD reads, and queues a `PurgeJob`. The purger then deletes the rows that
+depend on it, table by table, `PURGE_BATCH_SIZE` rows per transaction with a
+`PURGE_PAUSE_MS` pause in between. Each batch holds its locks only briefly, so
+the purge never blocks normal traffic for long. The record itself is deleted
+last, when hardly anything is left to cascade to. Progress is counted on the
+job with each batch, and an interrupted purge continues where it stopped.
+
+Deletes start a purge in the background. `python -m scripts.purge` also runs
+one, e.g. from cron, for purges whose worker stopped. An advisory lock keeps
+purges from overlapping. Each shard queues and runs its own purges; by default
+the purger works through every shard in turn.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.logger import get_logger
+
+log = get_logger(__name__)
+
+# (table, column referencing the deleted record), in the order they are emptied.
+# Tables that only reference it through these (e.g. via inventories) are emptied
+# by their own cascade, one batch at a time.
+PURGE_STEPS: Dict[str, List[Tuple[str, str]]] = {
+    "products": [("inventories", "product_id")],
+    "tenants": [
+        ("reservations", "tenant_id"),
+        ("supply_orders", "tenant_id"),
+        ("inventory_consumption", "tenant_id"),
+        ("inventories", "tenant_id"),
+        ("webhooks", "tenant_id"),
+        ("idempotency_keys", "tenant_id"),
+        ("users", "tenant_id"),
+    ],
+}
+
+
+class Purger:
+    def __init__(
+        self,
+        *,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: Optional[int] = None,
+        pause_ms: Optional[int] = None,
+    ):
+        """
+        Configure a purge of one database, or of every shard without `session_factory`;
+        sizes default to the PURGE_* settings.
+        """
+        self.session_factories: Sequence[Callable[[], AsyncSession]] = (
+            [session_factory] if session_factory else [shards.get_sessionmaker(name) for name in shards.shard_names()]
+        )
+        self.batch_size = batch_size or settings.PURGE_BATCH_SIZE
+        self.pause = (settings.PURGE_PAUSE_MS if pause_ms is None else pause_ms) / 1000
+
+    async def run(self) -> Optional[int]:
+        """
+        Purge every pending job. Returns the number purged, or None if other purges hold every lock.
+        """
+        results = [await self._run(session_factory) for session_factory in self.session_factories]
+        if all(purged is None for purged in results):
+            return None
+        return sum(purged or 0 for purged in results)
+
+    async def _run(self, session_factory: Callable[[], AsyncSession]) -> Optional[int]:
+        async with session_factory() as lock_db:
+            if not await crud.purge_job.try_lock(lock_db):
+                log.info("Purge already running elsewhere, skipping")
+                return None
+            try:
+                purged = 0
+                async with session_factory() as db:
+                    while (job := await crud.purge_job.get_next_pending(db)) is not None:
+                        for table, column in PURGE_STEPS[job.table_name]:
+                            while await crud.purge_job.delete_batch(
+                                db, job=job, table=table, column=column, limit=self.batch_size
+                            ):
+                                log.debug(
+                                    "Purging %s %s: %s rows deleted", job.table_name, job.entity_id, job.rows_deleted
+                                )
+                                await asyncio.sleep(self.pause)
+                        await crud.purge_job.finish(db, job=job)
+                        log.info("Purged %s %s, %s rows in all", job.table_name, job.entity_id, job.rows_deleted)
+                        purged += 1
+                return purged
+            finally:
+                await lock_db.rollback()
@@ -0,0 +1,166 @@
+"""
+Reorder engine: sweeps low-stock inventory across all tenants and places supply orders.
+
+Each sweep walks the low-stock partial index in (tenant_id, id) order, one page
+of `REORDER_BATCH_SIZE` rows at a time. The reorder quantity is computed in the
+query: `target_stock` (or `min_stock * REORDER_TARGET_MULTIPLIER`), minus current
+stock, minus orders still open within `REORDER_LEAD_TIME_HOURS`. A page's lines
+are grouped per tenant into one supplier request. Its orders are recorded as
+pending, together with the run's cursor, before anything is sent. Requests run
+with at most `REORDER_CONCURRENCY` in flight, while the next pages are read.
+
+If the process dies, the next run resumes from the cursor and resends the
+orders still pending. The supplier de-duplicates them by reference. An
+advisory lock keeps sweeps from overlapping. Each shard is swept on its own,
+for the tenants placed on it.
+
+Run it from a scheduler with `python -m scripts.reorder`.
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.db.shards import DEFAULT_SHARD
+from app.logger import get_logger
+from app.models.supply_order import SUPPLY_ORDER_FAILED, SUPPLY_ORDER_PENDING, SUPPLY_ORDER_PLACED
+from app.schemas.inventory import SupplyLine
+from app.services.supply_service import SupplyService
+
+log = get_logger(__name__)
+
+
+@dataclass
+class ReorderSummary:
+    run_id: uuid.UUID
+    lines: int
+    orders: int
+    failed: int
+
+
+class ReorderEngine:
+    def __init__(
+        self,
+        supply_service: SupplyService,
+        *,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        shard: str = DEFAULT_SHARD,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        """
+        Configure a sweep of the shard `session_factory` opens sessions on; sizes
+        default to the REORDER_* settings.
+        """
+        self.supply_service = supply_service
+        self.session_factory = session_factory
+        self.shard = shard
+        self.batch_size = batch_size or settings.REORDER_BATCH_SIZE
+        self.concurrency = concurrency or settings.REORDER_CONCURRENCY
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._failed = 0
+
+    async def run(self) -> Optional[ReorderSummary]:
+        """
+        Run (or resume) one sweep. Returns None if another sweep holds the lock.
+        """
+        async with self.session_factory() as lock_db:
+            if not await crud.reorder_run.try_lock(lock_db):
+                log.info("Reorder sweep already running elsewhere, skipping")
+                return None
+            try:
+                async with self.session_factory() as db:
+                    return await self._sweep(db)
+            finally:
+                await lock_db.rollback()
+
+    async def _sweep(self, db: AsyncSession) -> ReorderSummary:
+        run = await crud.reorder_run.get_or_start(db)
+        in_flight: Set[asyncio.Task] = set()
+
+        # Orders recorded by an interrupted run but never confirmed by the supplier
+        for reference, lines in _by_reference(await crud.supply_order.get_pending(db)).items():
+            in_flight.add(asyncio.create_task(self._place(reference, lines)))
+
+        cursor = (run.cursor_tenant_id, run.cursor_inventory_id)
+        while True:
+            rows = await crud.supply_order.get_reorder_candidates(
+                db,
+                after=cursor,
+                limit=self.batch_size,
+                target_multiplier=settings.REORDER_TARGET_MULTIPLIER,
+                lead_time=timedelta(hours=settings.REORDER_LEAD_TIME_HOURS),
+                shard=self.shard,
+            )
+            if not rows:
+                break
+            cursor = (rows[-1]["tenant_id"], rows[-1]["inventory_id"])
+
+            requests: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            references: Dict[uuid.UUID, str] = {}
+            for row in rows:
+                if row["quantity"] > 0:
+                    reference = references.setdefault(row["tenant_id"], uuid.uuid4().hex)
+                    requests[reference].append(row)
+
+            orders = [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": row["tenant_id"],
+                    "inventory_id": row["inventory_id"],
+                    "quantity": row["quantity"],
+                    "status": SUPPLY_ORDER_PENDING,
+                    "reference": reference,
+                }
+                for reference, lines in requests.items()
+                for row in lines
+            ]
+            await crud.reorder_run.checkpoint(db, run=run, cursor=cursor, orders=orders, requests=len(requests))
+
+            for reference, lines in requests.items():
+                in_flight.add(asyncio.create_task(self._place(reference, lines)))
+            # Keep reading ahead only while the supplier keeps up
+            while len(in_flight) > self.concurrency * 2:
+                _, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+        await asyncio.gather(*in_flight)
+        await crud.reorder_run.finish(db, run=run)
+        log.info("Reorder run %s placed %s lines in %s orders", run.id, run.lines, run.orders)
+        return ReorderSummary(run_id=run.id, lines=run.lines, orders=run.orders, failed=self._failed)
+
+    async def _place(self, reference: str, lines: List[Dict[str, Any]]) -> None:
+        supply_lines = [
+            SupplyLine(product_sku=line["product_sku"], product_name=line["product_name"], quantity=line["quantity"])
+            for line in lines
+        ]
+        async with self._slots:
+            try:
+                response = await self.supply_service.request_restock_batch(
+                    tenant_name=lines[0]["tenant_name"], lines=supply_lines, reference=reference
+                )
+                status, external_reference_id = SUPPLY_ORDER_PLACED, response.external_reference_id
+            except Exception:
+                # Failed orders stop counting as open, so the next sweep reorders them
+                log.exception("Supplier request %s failed", reference)
+                self._failed += 1
+                status, external_reference_id = SUPPLY_ORDER_FAILED, None
+
+        async with self.session_factory() as db:
+            await crud.supply_order.set_status(
+                db, reference=reference, status=status, external_reference_id=external_reference_id
+            )
+
+
+def _by_reference(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        grouped[row["reference"]].append(row)
+    return grouped
@@ -0,0 +1,70 @@
+"""
+Expiry of stock reservations.
+
+A reservation holds stock by adding its quantity to the item's `reserved_stock`,
+so available stock (`current_stock - reserved_stock`) is read off the item's row
+instead of summing holds on every request. Committing or releasing a hold moves
+the counter back in the same statement; holds that simply lapse are expired by
+the sweeper: `RESERVATION_SWEEP_BATCH_SIZE` of the oldest per transaction, found
+through the `expires_at` index, until none are due.
+
+Until the sweeper has run an expired hold still counts as reserved, so stock is
+never oversold, only briefly held back; expired holds can no longer be committed.
+`python -m scripts.expire_reservations --every 5` keeps sweeping. An advisory lock
+keeps sweeps of a database from overlapping; by default every shard is swept.
+"""
+
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class ReservationSweeper:
+    def __init__(
+        self,
+        *,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Configure a sweep of one database, or of every shard without `session_factory`;
+        the batch size defaults to RESERVATION_SWEEP_BATCH_SIZE.
+        """
+        self.session_factories: Sequence[Callable[[], AsyncSession]] = (
+            [session_factory] if session_factory else [shards.get_sessionmaker(name) for name in shards.shard_names()]
+        )
+        self.batch_size = batch_size or settings.RESERVATION_SWEEP_BATCH_SIZE
+
+    async def run(self) -> Optional[int]:
+        """
+        Expire every reservation that is due. Returns the number expired, or None if other sweeps hold every lock.
+        """
+        results = [await self._run(session_factory) for session_factory in self.session_factories]
+        if all(expired is None for expired in results):
+            return None
+        return sum(expired or 0 for expired in results)
+
+    async def _run(self, session_factory: Callable[[], AsyncSession]) -> Optional[int]:
+        async with session_factory() as lock_db:
+            if not await crud.reservation.try_lock_sweep(lock_db):
+                log.info("Reservation sweep already running elsewhere, skipping")
+                return None
+            try:
+                expired = 0
+                async with session_factory() as db:
+                    while batch := await crud.reservation.expire_batch(db, limit=self.batch_size):
+                        expired += batch
+                        if batch < self.batch_size:
+                            break
+                if expired:
+                    log.info("Expired %s reservations", expired)
+                return expired
+            finally:
+                await lock_db.rollback()
@@ -0,0 +1,53 @@
+"""
+Pruning of the append-only logs.
+
+Every inventory write appends to `inventory_changes`, and consumption adds a row
+per item and day to `inventory_consumption`. The change log only has to reach
+back `INVENTORY_CHANGES_RETENTION_HOURS` for streams to resume, and forecasts
+never read consumption older than `FORECAST_HISTORY_DAYS`; anything older is
+deleted. Nothing else prunes them, whether or not anyone is subscribed to a
+change stream: run `python -m scripts.prune_logs --every 3600` (or hourly from
+cron). By default every shard is pruned.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.logger import get_logger
+from app.services.forecast import history_cutoff
+
+log = get_logger(__name__)
+
+
+class LogPruner:
+    def __init__(self, *, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        """
+        Configure pruning of one database, or of every shard without `session_factory`.
+        """
+        self.session_factories: Sequence[Callable[[], AsyncSession]] = (
+            [session_factory] if session_factory else [shards.get_sessionmaker(name) for name in shards.shard_names()]
+        )
+
+    async def run(self) -> int:
+        """
+        Delete changes and consumption past their retention. Returns the rows deleted.
+        """
+        return sum([await self._run(session_factory) for session_factory in self.session_factories])
+
+    async def _run(self, session_factory: Callable[[], AsyncSession]) -> int:
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            changes = await crud.inventory.prune_changes(
+                db, older_than=now - timedelta(hours=settings.INVENTORY_CHANGES_RETENTION_HOURS)
+            )
+            consumption = await crud.inventory.prune_consumption(db, before=history_cutoff(now.date()))
+        if changes:
+            log.info("Pruned %s inventory changes", changes)
+        if consumption:
+            log.info("Pruned %s item-days of inventory consumption", consumption)
+        return changes + consumption
@@ -0,0 +1,154 @@
+"""
+Reference rows on shards.
+
+A shard's tables reference products and tenants, and its queries join them, so
+every shard keeps copies of those rows (see app/db/shards.py). The default
+database stays the source of truth. Product writes are copied to every other
+shard as they happen, and a tenant's row is copied to the shard it moves to.
+Deletes run the same soft delete on every shard, so each shard's purger removes
+the rows depending on them there.
+
+Rows are read and copied in primary-key order, a batch per transaction; a copy
+overwrites whatever the shard held for the same key.
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Table, delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from app.crud.base import CRUDBase
+from app.db import shards
+from app.models.product import Product
+from app.models.tenant import Tenant
+
+# Rows per read and per copy transaction when copying a whole table
+COPY_BATCH_SIZE = 5000
+
+
+async def read_batches(
+    db: AsyncSession,
+    table: Table,
+    *,
+    where: Sequence[ColumnElement] = (),
+    batch_size: int = COPY_BATCH_SIZE,
+    keys_only: bool = False,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Rows of `table` matching `where` (only their primary keys with `keys_only`), as
+    column dicts, `batch_size` at a time in primary-key order.
+    """
+    key = list(table.primary_key.columns)
+    last = None
+    while True:
+        query = select(*key) if keys_only else select(table)
+        query = query.where(*where).order_by(*key).limit(batch_size)
+        if last is not None:
+            query = query.where(tuple_(*key) > tuple_(*last))
+        rows = [dict(row) for row in (await db.execute(query)).mappings()]
+        if not rows:
+            return
+        yield rows
+        last = [rows[-1][column.name] for column in key]
+
+
+async def upsert_rows(db: AsyncSession, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """
+    Write `rows` into `table`, replacing rows with the same primary key. Does not commit.
+    """
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={column.name: statement.excluded[column.name] for column in table.columns if not column.primary_key},
+    )
+    await db.execute(statement, rows)
+
+
+async def missing_keys(
+    source: AsyncSession,
+    target: AsyncSession,
+    table: Table,
+    *,
+    where: Sequence[ColumnElement] = (),
+    batch_size: int = COPY_BATCH_SIZE,
+) -> List[Tuple[Any, ...]]:
+    """
+    Primary keys of the rows of `table` matching `where` that `target` holds and `source` does not.
+    """
+    kept = {
+        tuple(row.values())
+        async for rows in read_batches(source, table, where=where, batch_size=batch_size, keys_only=True)
+        for row in rows
+    }
+    return [
+        tuple(row.values())
+        async for rows in read_batches(target, table, where=where, batch_size=batch_size, keys_only=True)
+        for row in rows
+        if tuple(row.values()) not in kept
+    ]
+
+
+async def delete_rows(db: AsyncSession, table: Table, keys: Sequence[Tuple[Any, ...]]) -> int:
+    """
+    Delete the rows of `table` with these primary keys. Does not commit; returns the rows deleted.
+    """
+    if not keys:
+        return 0
+    result = await db.execute(delete(table).where(tuple_(*table.primary_key.columns).in_(keys)))
+    return result.rowcount
+
+
+async def copy_rows(
+    source: AsyncSession, target: AsyncSession, table: Table, *, where: Sequence[ColumnElement] = ()
+) -> int:
+    """
+    Copy the rows of `table` matching `where` from one database to another. Returns the rows copied.
+    """
+    copied = 0
+    async for rows in read_batches(source, table, where=where):
+        await upsert_rows(target, table, rows)
+        await target.commit()
+        copied += len(rows)
+    return copied
+
+
+async def replicate_products(
+    db: AsyncSession, *, ids: Optional[Sequence[UUID]] = None, since: Optional[datetime] = None
+) -> None:
+    """
+    Copy products from the default database (`db`) to every other shard: those in
+    `ids`, those written at or after `since`, or with neither, the whole catalog.
+    """
+    if not shards.is_sharded():
+        return
+    where = []
+    if ids is not None:
+        where.append(Product.id.in_(ids))
+    if since is not None:
+        where.append(Product.updated_at >= since)
+    for shard in shards.extra_shards():
+        async with shards.get_sessionmaker(shard)() as target:
+            await copy_rows(db, target, Product.__table__, where=where)
+
+
+async def remove_from_shards(crud_obj: CRUDBase, *, id: UUID, only: Optional[Sequence[str]] = None) -> None:
+    """
+    Delete a record's copies on the other shards (`only` these, if given) as the
+    default database did, queueing their purge on each.
+    """
+    for shard in only if only is not None else shards.extra_shards():
+        if shard == shards.DEFAULT_SHARD:
+            continue
+        async with shards.get_sessionmaker(shard)() as target:
+            await crud_obj.remove(target, id=id)
+
+
+async def copy_tenant(db: AsyncSession, target: AsyncSession, *, tenant_id: UUID) -> None:
+    """
+    Copy a tenant's row from the default database (`db`) to a shard.
+    """
+    await copy_rows(db, target, Tenant.__table__, where=[Tenant.id == tenant_id])
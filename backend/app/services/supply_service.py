@@ -1,8 +1,11 @@
 import asyncio
-import logging
-from app.schemas.inventory import SupplyResponse
+from typing import List
+from app.core.metrics import SUPPLIER_LATENCY
+from app.core.server_timing import timing_phase
+from app.logger import get_logger
+from app.schemas.inventory import SupplyLine, SupplyResponse
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class SupplyService:
@@ -19,10 +22,26 @@ class SupplyService:
         """
         Simulates sending a restock request to an external supplier API.
         """
-        await asyncio.sleep(1.5)
+        with SUPPLIER_LATENCY.labels("request_restock").time(), timing_phase("supplier"):
+            await asyncio.sleep(1.5)
 
         message = f"{tenant_name} requested {quantity} of product: {product_name} (SKU: {product_sku})"
 
-        logger.info(f"Sending to {self.supplier_url} using key {self.api_key[:4]}*** : {message}")
+        logger.info("Sending to %s using key %s*** : %s", self.supplier_url, self.api_key[:4], message)
 
         return SupplyResponse(status="success", message=message, external_reference_id="MOCK-REQ-999")
+
+    async def request_restock_batch(self, tenant_name: str, lines: List[SupplyLine], reference: str) -> SupplyResponse:
+        """
+        Simulates one restock request covering several products. The supplier
+        treats `reference` as an idempotency key, so resending a batch is safe.
+        """
+        with SUPPLIER_LATENCY.labels("request_restock_batch").time(), timing_phase("supplier"):
+            await asyncio.sleep(1.5)
+
+        units = sum(line.quantity for line in lines)
+        message = f"{tenant_name} requested {units} units across {len(lines)} products (ref {reference})"
+
+        logger.info("Sending to %s using key %s*** : %s", self.supplier_url, self.api_key[:4], message)
+
+        return SupplyResponse(status="success", message=message, external_reference_id=f"MOCK-{reference}")
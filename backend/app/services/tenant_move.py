@@ -0,0 +1,273 @@
+"""
+Online move of a tenant's data to another shard.
+
+1. The tenant's row and the product catalog are copied to the target, so the
+   tenant's rows can reference them there.
+2. The tenant's rows in `MOVED_TABLES` are copied, `TENANT_MOVE_BATCH_SIZE` per
+   transaction, while the tenant keeps working on the source. Each further
+   round copies only what was written since the previous one started, until a
+   round finds little left (or `TENANT_MOVE_MAX_ROUNDS` have run). Items deleted
+   meanwhile are found in the change log and deleted from the target too.
+3. Cutover: the source's reorder sweep is held off and the tenant's move lock
+   taken, which waits for its writes in flight and answers new ones with 503.
+   A last round copies the final writes, rows the source no longer has are
+   deleted from the target, and the tenant's reservations are copied. Then
+   `tenants.shard` is switched and the lock released in the same commit. Reads
+   are served throughout.
+4. The tenant's rows are deleted from the source in batches.
+
+Rows copied or deleted by a move stay out of the change log; open change
+streams end and reconnect to the new shard. Every copy overwrites, so a move
+that failed can simply be run again. `python -m scripts.move_tenant` runs one.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.logger import get_logger
+from app.models.inventory import Inventory
+from app.models.inventory_consumption import InventoryConsumption
+from app.models.product import Product
+from app.models.reservation import Reservation
+from app.models.supply_order import SupplyOrder
+from app.models.tenant import Tenant
+from app.services.sharding import copy_rows, copy_tenant, delete_rows, missing_keys, read_batches, upsert_rows
+
+log = get_logger(__name__)
+
+# The tenant's tables, in foreign-key order, each with the column its writes move
+# forward. Consumption is summed into the current day's row only. Summaries are
+# kept by the inventory triggers on both shards.
+MOVED_TABLES: List[Tuple[Table, ColumnElement]] = [
+    (Inventory.__table__, Inventory.updated_at),
+    (SupplyOrder.__table__, SupplyOrder.updated_at),
+    (InventoryConsumption.__table__, InventoryConsumption.day),
+]
+
+# Rows written later than this are still to be copied: rows carry their writing
+# transaction's start time, and a transaction still running may commit later. The
+# mover's own sessions (`:movers`) stay open for the whole move but write no rows.
+_WATERMARK_SQL = """
+SELECT least(now(), min(xact_start)) FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> ALL(:movers)
+"""
+
+
+class TenantMoveError(ValueError):
+    """
+    Raised when a tenant cannot be moved to the requested shard.
+    """
+
+
+@dataclass
+class TenantMoveSummary:
+    tenant_id: UUID
+    source: str
+    target: str
+    rounds: int
+    rows_copied: int
+    rows_deleted: int
+
+
+class TenantMover:
+    def __init__(
+        self,
+        *,
+        batch_size: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+        pause_ms: Optional[int] = None,
+    ):
+        """
+        Configure moves; sizes default to the TENANT_MOVE_* settings, and the pause
+        between deletes on the source to PURGE_PAUSE_MS.
+        """
+        self.batch_size = batch_size or settings.TENANT_MOVE_BATCH_SIZE
+        self.max_rounds = max_rounds or settings.TENANT_MOVE_MAX_ROUNDS
+        self.pause = (settings.PURGE_PAUSE_MS if pause_ms is None else pause_ms) / 1000
+
+    async def move(self, tenant_id: UUID, target: str) -> TenantMoveSummary:
+        """
+        Move a tenant's data to the `target` shard while it stays in use.
+        """
+        target_factory = shards.get_sessionmaker(target)
+        primary_factory = shards.get_sessionmaker(shards.DEFAULT_SHARD)
+        async with primary_factory() as claim_db, primary_factory() as primary:
+            tenant = await crud.tenant.get(primary, id=tenant_id)
+            if tenant is None:
+                raise TenantMoveError(f"Tenant {tenant_id} not found")
+            source = tenant.shard
+            if source == target:
+                raise TenantMoveError(f"Tenant {tenant_id} is already on {target}")
+            if not await crud.tenant.try_claim_move(claim_db, tenant_id=tenant_id):
+                raise TenantMoveError(f"Tenant {tenant_id} is already being moved")
+            movers = [await db.scalar(select(func.pg_backend_pid())) for db in (claim_db, primary)]
+            try:
+                if target != shards.DEFAULT_SHARD:
+                    async with target_factory() as target_db:
+                        await copy_tenant(primary, target_db, tenant_id=tenant_id)
+                        await copy_rows(primary, target_db, Product.__table__)
+
+                summary = TenantMoveSummary(tenant_id, source, target, rounds=0, rows_copied=0, rows_deleted=0)
+                since = None
+                while summary.rounds < self.max_rounds:
+                    copied, since = await self._copy_round(tenant_id, source, target, since=since, movers=movers)
+                    summary.rounds += 1
+                    summary.rows_copied += copied
+                    log.info(
+                        "Moving tenant %s to %s: round %s copied %s rows", tenant_id, target, summary.rounds, copied
+                    )
+                    if copied < self.batch_size:
+                        break
+
+                summary.rows_copied += await self._cut_over(
+                    primary, tenant_id, source, target, since=since, movers=movers
+                )
+                log.info("Tenant %s now served from %s", tenant_id, target)
+                summary.rows_deleted = await self._delete_source_rows(tenant_id, source)
+            finally:
+                await claim_db.rollback()
+
+        log.info(
+            "Moved tenant %s from %s to %s: %s rows copied, %s deleted",
+            tenant_id,
+            source,
+            target,
+            summary.rows_copied,
+            summary.rows_deleted,
+        )
+        return summary
+
+    async def _copy_round(
+        self, tenant_id: UUID, source: str, target: str, *, since: Optional[datetime], movers: Sequence[int]
+    ) -> Tuple[int, datetime]:
+        """
+        Copy the tenant's rows written at or after `since` (all of them without it),
+        and delete the items deleted since then from the target. Returns the rows
+        copied and the `since` for the next round.
+        """
+        copied = 0
+        async with shards.get_sessionmaker(source)() as source_db, shards.get_sessionmaker(target)() as target_db:
+            watermark = await source_db.scalar(text(_WATERMARK_SQL), {"movers": list(movers)})
+            for table, written in MOVED_TABLES:
+                where = [table.c.tenant_id == tenant_id, *_live_products(table)]
+                if since is not None:
+                    where.append(
+                        written >= (since.astimezone(timezone.utc).date() if isinstance(written.type, Date) else since)
+                    )
+                async for rows in read_batches(source_db, table, where=where, batch_size=self.batch_size):
+                    await crud.tenant.skip_change_log(target_db)
+                    await upsert_rows(target_db, table, rows)
+                    await target_db.commit()
+                    copied += len(rows)
+            if since is not None:
+                deleted = await crud.inventory.get_deleted_since(source_db, tenant_id=tenant_id, since=since)
+                # Their consumption and supply orders go with them
+                await self._delete_target_rows(target_db, Inventory.__table__, [(id,) for id in deleted])
+        return copied, watermark
+
+    async def _cut_over(
+        self,
+        primary: AsyncSession,
+        tenant_id: UUID,
+        source: str,
+        target: str,
+        *,
+        since: Optional[datetime],
+        movers: Sequence[int],
+    ) -> int:
+        async with shards.get_sessionmaker(source)() as sweep_lock_db:
+            # A sweep already past this tenant's rows could still order for them on the source
+            await crud.reorder_run.lock(sweep_lock_db)
+            movers = [*movers, await sweep_lock_db.scalar(select(func.pg_backend_pid()))]
+            await crud.tenant.lock_for_move(primary, tenant_id=tenant_id)
+            copied, _ = await self._copy_round(tenant_id, source, target, since=since, movers=movers)
+            await self._delete_missing_rows(tenant_id, source, target)
+            copied += await self._copy_reservations(tenant_id, source, target)
+            # The shard copies first: each shard's sweep only orders for tenants marked as its own
+            for shard in (target, source):
+                if shard != shards.DEFAULT_SHARD:
+                    async with shards.get_sessionmaker(shard)() as db:
+                        await crud.tenant.set_shard(db, tenant_id=tenant_id, shard=target)
+            # The shard map last: its commit also releases the move lock
+            await crud.tenant.set_shard(primary, tenant_id=tenant_id, shard=target)
+            await sweep_lock_db.rollback()
+        return copied
+
+    async def _delete_missing_rows(self, tenant_id: UUID, source: str, target: str) -> None:
+        """
+        Delete the tenant's rows the source no longer has from the target. Copy
+        rounds only see rows that still exist, and the change log only covers
+        items, so this catches every other delete (consumption pruned, say) while
+        the tenant can't write.
+        """
+        async with shards.get_sessionmaker(source)() as source_db, shards.get_sessionmaker(target)() as target_db:
+            for table, _ in reversed(MOVED_TABLES):
+                keys = await missing_keys(
+                    source_db, target_db, table, where=[table.c.tenant_id == tenant_id], batch_size=self.batch_size
+                )
+                await self._delete_target_rows(target_db, table, keys)
+
+    async def _delete_target_rows(self, target_db: AsyncSession, table: Table, keys: Sequence[Tuple]) -> None:
+        for start in range(0, len(keys), self.batch_size):
+            await crud.tenant.skip_change_log(target_db)
+            deleted = await delete_rows(target_db, table, keys[start : start + self.batch_size])
+            await target_db.commit()
+            log.info("Deleted %s rows from %s that were deleted on the source", deleted, table.name)
+
+    async def _copy_reservations(self, tenant_id: UUID, source: str, target: str) -> int:
+        """
+        Replace the tenant's reservations on the target with the source's, and
+        recount its items' holds from them. Holds end by being deleted, which copy
+        rounds can't carry over, so they are copied once, while the tenant can't
+        write. Recounting keeps the target's counters true to its rows even if the
+        source's sweeper expires a hold meanwhile.
+        """
+        copied = 0
+        async with shards.get_sessionmaker(source)() as source_db, shards.get_sessionmaker(target)() as target_db:
+            while await crud.tenant.delete_moved_rows(
+                target_db, table=Reservation.__tablename__, tenant_id=tenant_id, limit=self.batch_size
+            ):
+                pass
+            where = [Reservation.tenant_id == tenant_id]
+            async for rows in read_batches(source_db, Reservation.__table__, where=where, batch_size=self.batch_size):
+                await upsert_rows(target_db, Reservation.__table__, rows)
+                await target_db.commit()
+                copied += len(rows)
+            await crud.reservation.recount_reserved(target_db, tenant_id=tenant_id)
+        return copied
+
+    async def _delete_source_rows(self, tenant_id: UUID, source: str) -> int:
+        deleted = 0
+        async with shards.get_sessionmaker(source)() as db:
+            for table in [Reservation.__tablename__, *(table.name for table, _ in reversed(MOVED_TABLES))]:
+                while batch := await crud.tenant.delete_moved_rows(
+                    db, table=table, tenant_id=tenant_id, limit=self.batch_size
+                ):
+                    deleted += batch
+                    await asyncio.sleep(self.pause)
+            if source != shards.DEFAULT_SHARD:
+                # Its reference copy goes too; nothing on the shard points at it any more
+                deleted += await crud.tenant.delete_moved_rows(
+                    db, table=Tenant.__tablename__, tenant_id=tenant_id, limit=1, column="id"
+                )
+        return deleted
+
+
+def _live_products(table: Table) -> List[ColumnElement]:
+    """
+    Leave out rows of deleted products: their copies on the target may already be purged.
+    """
+    live = select(Product.id).where(Product.deleted_at.is_(None))
+    if "product_id" in table.c:
+        return [table.c.product_id.in_(live)]
+    return [table.c.inventory_id.in_(select(Inventory.id).where(Inventory.product_id.in_(live)))]
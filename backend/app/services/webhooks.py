@@ -0,0 +1,226 @@
+"""
+Batched, signed webhook delivery for low-stock alerts.
+
+Events are buffered per tenant for `WEBHOOK_BATCH_WINDOW_SECONDS` and then
+POSTed as one batch to each of the tenant's active webhooks. Retryable failures
+(network errors, 408, 429 and 5xx) are retried with exponential backoff and
+jitter, up to `WEBHOOK_MAX_ATTEMPTS`. Deliveries share one pooled HTTP client.
+Buffers live in memory, so a batch still waiting when a worker is killed is
+lost; shutdown through the lifespan flushes them.
+
+Each request carries `X-Webhook-Id` (the batch id, for de-duplicating retries),
+`X-Webhook-Timestamp` and `X-Webhook-Signature: sha256=<hex>`, an HMAC-SHA256 of
+`"{timestamp}.{body}"` keyed with the webhook's secret.
+
+Webhook URLs are tenant input, so they must not reach into the deployment's own
+network: a URL's host has to resolve to public addresses only, checked when it
+is registered and again before each delivery. The delivery then connects to the
+address that was checked, so a DNS answer changed in between can't redirect it.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Union
+from uuid import UUID
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.logger import get_logger
+from app.models.inventory import Inventory
+from app.schemas.webhook import LowStockEvent, WebhookBatch
+
+log = get_logger(__name__)
+
+RETRYABLE_STATUS = {408, 429}
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+Resolver = Callable[[str], Awaitable[List[IPAddress]]]
+
+
+class UnsafeWebhookURL(ValueError):
+    """
+    Raised for a webhook URL whose host is, or resolves to, an address that isn't public.
+    """
+
+
+async def resolve_host(host: str) -> List[IPAddress]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return [ipaddress.ip_address(info[4][0]) for info in infos]
+
+
+async def public_address(url: str, resolve: Optional[Resolver] = None) -> IPAddress:
+    """
+    Resolve the URL's host and return its first address, if every address it has
+    is public (not loopback, private, link-local such as cloud metadata, ...).
+    """
+    host = httpx.URL(url).host
+    try:
+        addresses = await (resolve or resolve_host)(host)
+    except (OSError, ValueError) as exc:
+        raise UnsafeWebhookURL(f"Webhook host {host} could not be resolved") from exc
+    # An IPv4 address written as IPv6 (::ffff:127.0.0.1) is judged as IPv4
+    addresses = [getattr(address, "ipv4_mapped", None) or address for address in addresses]
+    if not addresses or not all(address.is_global for address in addresses):
+        raise UnsafeWebhookURL(f"Webhook host {host} does not resolve to a public address")
+    return addresses[0]
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    Signature sent in X-Webhook-Signature; receivers recompute it to verify a delivery.
+    """
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def is_low_stock(inventory: Inventory) -> bool:
+    return (inventory.current_stock or 0) < (inventory.min_stock or 0)
+
+
+def low_stock_event(inventory: Inventory) -> LowStockEvent:
+    return LowStockEvent(
+        inventory_id=inventory.id,
+        product_id=inventory.product_id,
+        min_stock=inventory.min_stock or 0,
+        current_stock=inventory.current_stock or 0,
+        occurred_at=datetime.now(timezone.utc),
+    )
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        resolve: Optional[Resolver] = None,
+    ):
+        """
+        Buffer events per tenant and deliver them in the background.
+        `transport` and `resolve` let tests route deliveries to an in-process receiver.
+        """
+        self.session_factory = session_factory
+        self.transport = transport
+        self.resolve = resolve
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Dict[UUID, List[LowStockEvent]] = {}
+        self._timers: Dict[UUID, asyncio.Task] = {}
+        self._deliveries: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=settings.WEBHOOK_MAX_CONNECTIONS),
+            )
+        return self._client
+
+    def publish(self, tenant_id: UUID, event: LowStockEvent) -> None:
+        """
+        Queue an event; the tenant's batch is sent when its window closes.
+        """
+        self._pending.setdefault(tenant_id, []).append(event)
+        if tenant_id not in self._timers:
+            timer = asyncio.create_task(self._flush_after_window(tenant_id))
+            timer.add_done_callback(_log_failure)
+            self._timers[tenant_id] = timer
+
+    async def _flush_after_window(self, tenant_id: UUID) -> None:
+        await asyncio.sleep(settings.WEBHOOK_BATCH_WINDOW_SECONDS)
+        del self._timers[tenant_id]
+        await self._dispatch(tenant_id, self._pending.pop(tenant_id, []))
+
+    async def _dispatch(self, tenant_id: UUID, events: List[LowStockEvent]) -> None:
+        if not events:
+            return
+        async with self.session_factory() as db:
+            webhooks = await crud.webhook.get_active_by_tenant(db, tenant_id=tenant_id)
+        if not webhooks:
+            return
+
+        batch = WebhookBatch(id=uuid.uuid4(), tenant_id=tenant_id, events=events)
+        body = batch.model_dump_json().encode()
+        for webhook in webhooks:
+            task = asyncio.create_task(self._deliver(webhook.url, webhook.secret, batch.id, body))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+            task.add_done_callback(_log_failure)
+
+    async def _deliver(self, url: str, secret: str, batch_id: UUID, body: bytes) -> bool:
+        try:
+            address = await public_address(url, self.resolve)
+        except UnsafeWebhookURL as exc:
+            log.warning("Not delivering batch %s: %s", batch_id, exc)
+            return False
+        target = httpx.URL(url)
+        pinned = target.copy_with(host=str(address))
+        # The checked address, with the URL's own name for the Host header and TLS
+        extensions = {"sni_hostname": target.host} if target.scheme == "https" else {}
+        for attempt in range(1, settings.WEBHOOK_MAX_ATTEMPTS + 1):
+            timestamp = str(int(time.time()))
+            headers = {
+                "Host": target.netloc.decode(),
+                "Content-Type": "application/json",
+                "X-Webhook-Id": str(batch_id),
+                "X-Webhook-Timestamp": timestamp,
+                "X-Webhook-Signature": sign(secret, timestamp, body),
+            }
+            try:
+                response = await self.client.post(pinned, content=body, headers=headers, extensions=extensions)
+            except httpx.HTTPError as exc:
+                outcome = type(exc).__name__
+            else:
+                if response.is_success:
+                    return True
+                outcome = str(response.status_code)
+                if response.status_code < 500 and response.status_code not in RETRYABLE_STATUS:
+                    log.warning("Webhook %s rejected batch %s with %s", url, batch_id, outcome)
+                    return False
+
+            if attempt < settings.WEBHOOK_MAX_ATTEMPTS:
+                delay = settings.WEBHOOK_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                log.info("Webhook %s failed (%s), retry %s in %.1fs", url, outcome, attempt, delay)
+                # Full jitter spreads retries from many batches hitting the same receiver
+                await asyncio.sleep(random.uniform(0, delay))
+
+        log.warning("Giving up on webhook %s for batch %s after %s attempts", url, batch_id, attempt)
+        return False
+
+    async def flush(self) -> None:
+        """
+        Send every buffered batch now and wait for all deliveries to finish.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        pending, self._pending = self._pending, {}
+        await asyncio.gather(*(self._dispatch(tenant_id, events) for tenant_id, events in pending.items()))
+        await asyncio.gather(*self._deliveries)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    # Background tasks nobody awaits would otherwise fail silently
+    if not task.cancelled() and task.exception() is not None:
+        log.error("Webhook task failed", exc_info=task.exception())
+
+
+webhook_dispatcher = WebhookDispatcher()
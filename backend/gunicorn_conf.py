@@ -0,0 +1,76 @@
+"""
+Gunicorn settings for running the API in production:
+
+    gunicorn app.main:app -c gunicorn_conf.py
+
+Every value can be overridden through the environment variable named next to it.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def default_workers(cpu_count: int, workers_per_core: float = 1.0, max_workers: int = 0) -> int:
+    """
+    One worker per core by default (the event loop already multiplexes I/O), at least 2.
+    """
+    workers = max(int(cpu_count * workers_per_core), 2)
+    return min(workers, max_workers) if max_workers > 0 else workers
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+worker_class = "app.core.worker.ProductionUvicornWorker"
+
+# WEB_CONCURRENCY pins the worker count; otherwise it follows the CPU count
+workers = _env_int(
+    "WEB_CONCURRENCY",
+    default_workers(
+        multiprocessing.cpu_count(),
+        float(os.getenv("WORKERS_PER_CORE", "1")),
+        _env_int("MAX_WORKERS", 0),
+    ),
+)
+
+# Pending connections queued by the kernel while every worker is busy
+backlog = _env_int("BACKLOG", 2048)
+# Seconds an idle keep-alive connection stays open; keep above the load balancer's idle timeout
+keepalive = _env_int("KEEPALIVE", 75)
+# Seconds in-flight requests get to finish after SIGTERM before workers are killed
+graceful_timeout = _env_int("GRACEFUL_TIMEOUT", 30)
+# Seconds a worker may go without heartbeating before the master restarts it
+timeout = _env_int("TIMEOUT", 60)
+
+# Recycle workers after this many requests (0 disables) to cap slow memory growth;
+# the jitter keeps them from all restarting at once
+max_requests = _env_int("MAX_REQUESTS", 10000)
+max_requests_jitter = _env_int("MAX_REQUESTS_JITTER", 1000)
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = _env_bool("PRELOAD", True)
+
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+# Multiprocess metrics need an empty directory on every start. Done here rather than
+# in a hook because with preload_app the app (and its metrics) load before any hook runs.
+_metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir)
+
+
+def child_exit(server, worker) -> None:
+    if _metrics_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
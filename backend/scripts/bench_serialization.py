@@ -0,0 +1,84 @@
+"""
+Benchmark the list-endpoint serialization paths.
+
+Compares the previous path (ORM objects revalidated through
+`List[InventoryPublic]` with `from_attributes=True`, then dumped by Pydantic)
+against the fast path (plain column rows encoded by orjson via
+`FastJSONResponse`). Only serialization is measured; the database is not used.
+
+Usage:
+    cd backend
+    python -m scripts.bench_serialization
+    python -m scripts.bench_serialization --sizes 1000 10000 --repeat 3
+"""
+
+import argparse
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from asyncpg.pgproto.pgproto import UUID as PgUUID
+from pydantic import TypeAdapter
+
+import app.db.base  # noqa: F401  (registers all models so mappers configure)
+from app.core.responses import FastJSONResponse
+from app.models.inventory import Inventory
+from app.schemas.inventory import InventoryPublic
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+_adapter = TypeAdapter(List[InventoryPublic])
+
+
+def make_rows(n: int) -> list[dict]:
+    # UUIDs are built as asyncpg returns them, so the orjson fallback is measured too
+    return [
+        {
+            "id": PgUUID(str(uuid.uuid4())),
+            "product_id": PgUUID(str(uuid.uuid4())),
+            "min_stock": i % 50,
+            "current_stock": i % 500,
+            "target_stock": i % 1000 if i % 2 else None,
+            "version": 1 + i % 7,
+        }
+        for i in range(n)
+    ]
+
+
+def orm_path(objs: list[Inventory]) -> bytes:
+    validated = _adapter.validate_python(objs, from_attributes=True)
+    return _adapter.dump_json(validated)
+
+
+def fast_path(rows: list[dict]) -> bytes:
+    return FastJSONResponse(rows).body
+
+
+def best_of(fn: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8} | {'orm (ms)':>10} | {'fast (ms)':>10} | {'speedup':>7}")
+    print("-" * 45)
+    for n in args.sizes:
+        rows = make_rows(n)
+        objs = [Inventory(**row) for row in rows]
+
+        orm_s = best_of(lambda objs=objs: orm_path(objs), args.repeat)
+        fast_s = best_of(lambda rows=rows: fast_path(rows), args.repeat)
+        print(f"{n:>8} | {orm_s * 1000:>10.1f} | {fast_s * 1000:>10.1f} | {orm_s / fast_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark server throughput: the old development CMD against the production runner.
+
+Each server is started in turn, warmed up, then driven by a small keep-alive
+HTTP/1.1 load generator for a fixed duration. Reports requests per second and
+latency percentiles. Point DATABASE_URL at a migrated, seeded database first
+(`python -m scripts.seed --generate ...`).
+
+Usage:
+    cd backend
+    python -m scripts.bench_server
+    python -m scripts.bench_server --servers production --connections 128 --duration 30
+"""
+
+import argparse
+import asyncio
+import os
+import shlex
+import statistics
+import subprocess
+import time
+from typing import List
+
+SERVERS = {
+    "reload": "uvicorn app.main:app --host 127.0.0.1 --port {port} --reload",
+    "uvicorn": "uvicorn app.main:app --host 127.0.0.1 --port {port}",
+    "production": "gunicorn app.main:app -c gunicorn_conf.py --bind 127.0.0.1:{port}",
+}
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, raw: bytes) -> int:
+    writer.write(raw)
+    status_line = await reader.readline()
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _connection(port: int, raw: bytes, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, raw)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def drive(port: int, path: str, connections: int, duration: float) -> tuple[List[float], List[int]]:
+    raw = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_connection(port, raw, deadline, latencies, errors) for _ in range(connections)))
+    return latencies, errors
+
+
+async def wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await _request(reader, writer, b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            writer.close()
+            return
+        except (OSError, asyncio.IncompleteReadError, IndexError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up")
+
+
+def bench(name: str, args: argparse.Namespace) -> None:
+    command = SERVERS[name].format(port=args.port)
+    env = {**os.environ, "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(shlex.split(command), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_until_ready(args.port))
+        asyncio.run(drive(args.port, args.path, args.connections, args.warmup))
+        latencies, errors = asyncio.run(drive(args.port, args.path, args.connections, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        f"{name:>10} | {len(latencies) / args.duration:>9,.0f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms | p99 {p99 * 1000:>7.2f} ms | errors {len(errors)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=["reload", "production"])
+    parser.add_argument("--path", default="/api/v1/products/")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.connections} connections, {args.duration:.0f}s, {os.cpu_count()} CPUs")
+    for name in args.servers:
+        bench(name, args)
+
+
+if __name__ == "__main__":
+    main()
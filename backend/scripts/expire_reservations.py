@@ -0,0 +1,41 @@
+"""
+Expire lapsed stock reservations (see app/services/reservations.py).
+
+Usage:
+    cd backend
+    python -m scripts.expire_reservations                # expire whatever is due, once
+    python -m scripts.expire_reservations --every 5      # keep sweeping every 5 seconds
+    python -m scripts.expire_reservations --batch-size 5000
+"""
+
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.db import shards
+from app.services.reservations import ReservationSweeper
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Return the stock of expired reservations.")
+    parser.add_argument("--batch-size", type=int, default=settings.RESERVATION_SWEEP_BATCH_SIZE)
+    parser.add_argument("--every", type=float, default=None, help="Repeat every N seconds")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        while True:
+            expired = await ReservationSweeper(batch_size=args.batch_size).run()
+            if expired:
+                print(f"Expired {expired} reservations")
+            if args.every is None:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await shards.dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
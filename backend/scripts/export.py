@@ -0,0 +1,57 @@
+"""
+Export inventory joined with products as Arrow IPC or Parquet (see app/services/export.py).
+
+Usage:
+    cd backend
+    python -m scripts.export --format parquet --output inventory.parquet
+    python -m scripts.export --tenant-id <uuid> --columns sku,current_stock,min_stock > stock.arrow
+"""
+
+import argparse
+import asyncio
+import sys
+from contextlib import AsyncExitStack
+from uuid import UUID
+
+from app import crud
+from app.core.config import settings
+from app.db import shards
+from app.services.export import ARROW_FORMAT, MEDIA_TYPES, EXPORT_COLUMNS, export_inventory, resolve_columns
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export inventory and catalog rows for analytics.")
+    parser.add_argument("--format", choices=sorted(MEDIA_TYPES), default=ARROW_FORMAT)
+    parser.add_argument("--output", default="-", help="File to write, or - for stdout")
+    parser.add_argument("--tenant-id", type=UUID, default=None, help="Only export this tenant")
+    parser.add_argument("--columns", default=None, help=f"Comma-separated projection of: {', '.join(EXPORT_COLUMNS)}")
+    parser.add_argument("--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    columns = resolve_columns(args.columns)
+    try:
+        async with AsyncExitStack() as stack:
+            # Closed by the stack last, after the sessions
+            out = sys.stdout.buffer if args.output == "-" else stack.enter_context(open(args.output, "wb"))
+            names = shards.shard_names()
+            if args.tenant_id is not None and shards.is_sharded():
+                async with shards.get_sessionmaker(shards.DEFAULT_SHARD)() as db:
+                    names = [await crud.tenant.get_shard(db, tenant_id=args.tenant_id)]
+            sessions = [
+                await stack.enter_async_context(shards.get_sessionmaker(name)()) for name in names if name is not None
+            ]
+            chunks = export_inventory(
+                sessions, fmt=args.format, columns=columns, tenant_id=args.tenant_id, batch_size=args.batch_size
+            )
+            async for chunk in chunks:
+                # Off the event loop, so disk writes don't stall the database cursor
+                await asyncio.to_thread(out.write, chunk)
+    finally:
+        await shards.dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Move a tenant's data to another shard while it stays in use (see app/services/tenant_move.py).
+
+Usage:
+    cd backend
+    python -m scripts.move_tenant <tenant-id> <shard>
+    python -m scripts.move_tenant <tenant-id> default --batch-size 20000 --pause-ms 0
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from app.core.config import settings
+from app.db import shards
+from app.services.tenant_move import TenantMoveError, TenantMover
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Move a tenant's data to another database shard.")
+    parser.add_argument("tenant_id", type=UUID)
+    parser.add_argument("shard", choices=shards.shard_names())
+    parser.add_argument("--batch-size", type=int, default=settings.TENANT_MOVE_BATCH_SIZE)
+    parser.add_argument("--max-rounds", type=int, default=settings.TENANT_MOVE_MAX_ROUNDS)
+    parser.add_argument("--pause-ms", type=int, default=settings.PURGE_PAUSE_MS)
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    mover = TenantMover(batch_size=args.batch_size, max_rounds=args.max_rounds, pause_ms=args.pause_ms)
+    try:
+        summary = await mover.move(args.tenant_id, args.shard)
+    except TenantMoveError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        await shards.dispose_engines()
+    print(
+        f"Moved tenant {summary.tenant_id} from {summary.source} to {summary.target} in {summary.rounds} rounds: "
+        f"{summary.rows_copied} rows copied, {summary.rows_deleted} deleted"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
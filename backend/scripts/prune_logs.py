@@ -0,0 +1,38 @@
+"""
+Prune the inventory change log and old consumption (see app/services/retention.py).
+
+Usage:
+    cd backend
+    python -m scripts.prune_logs                # prune once, e.g. hourly from cron
+    python -m scripts.prune_logs --every 3600   # keep pruning every hour
+"""
+
+import argparse
+import asyncio
+
+from app.db import shards
+from app.services.retention import LogPruner
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Delete inventory changes and consumption past their retention.")
+    parser.add_argument("--every", type=float, default=None, help="Repeat every N seconds")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        while True:
+            pruned = await LogPruner().run()
+            if pruned:
+                print(f"Pruned {pruned} log rows")
+            if args.every is None:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await shards.dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
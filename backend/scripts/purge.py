@@ -0,0 +1,42 @@
+"""
+Run the purger for deleted products and tenants (see app/services/purge.py).
+
+Usage:
+    cd backend
+    python -m scripts.purge                  # purge whatever is pending, e.g. from cron
+    python -m scripts.purge --every 300      # check every 5 minutes until stopped
+    python -m scripts.purge --batch-size 5000 --pause-ms 0
+"""
+
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.db import shards
+from app.services.purge import Purger
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Remove deleted products and tenants with their dependent rows.")
+    parser.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE)
+    parser.add_argument("--pause-ms", type=int, default=settings.PURGE_PAUSE_MS)
+    parser.add_argument("--every", type=float, default=None, help="Repeat every N seconds")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        while True:
+            purged = await Purger(batch_size=args.batch_size, pause_ms=args.pause_ms).run()
+            if purged:
+                print(f"Purged {purged} deleted records")
+            if args.every is None:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await shards.dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
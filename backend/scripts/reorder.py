@@ -0,0 +1,54 @@
+"""
+Run the reorder engine (see app/services/reorder.py).
+
+Usage:
+    cd backend
+    python -m scripts.reorder                  # one sweep of each shard, e.g. from cron
+    python -m scripts.reorder --every 900      # sweep every 15 minutes until stopped
+    python -m scripts.reorder --batch-size 10000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+
+from app.api.deps import get_supply_service
+from app.core.config import settings
+from app.db import shards
+from app.services.reorder import ReorderEngine
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Place supply orders for low-stock inventory across all tenants.")
+    parser.add_argument("--batch-size", type=int, default=settings.REORDER_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.REORDER_CONCURRENCY)
+    parser.add_argument("--every", type=float, default=None, help="Repeat a sweep every N seconds")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        while True:
+            for shard in shards.shard_names():
+                reorder = ReorderEngine(
+                    get_supply_service(),
+                    session_factory=shards.get_sessionmaker(shard),
+                    shard=shard,
+                    batch_size=args.batch_size,
+                    concurrency=args.concurrency,
+                )
+                summary = await reorder.run()
+                if summary:
+                    print(
+                        f"{shard} run {summary.run_id}: {summary.lines} lines in {summary.orders} orders, "
+                        f"{summary.failed} failed"
+                    )
+            if args.every is None:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await shards.dispose_engines()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,8 +4,12 @@ Seed script to populate the local database with mock data.
 Usage:
     cd backend
     python -m scripts.seed
+
+Generator mode builds a benchmark-sized dataset instead (see scripts/synthetic.py):
+    python -m scripts.seed --generate --tenants 500 --products 200000 --inventory-density 0.5 --workers 8
 """
 
+import argparse
 import asyncio
 import uuid
 
@@ -17,6 +21,7 @@ from app.models.user import User
 from app.models.product import Product
 from app.models.inventory import Inventory
 from app.core.security import get_password_hash
+from scripts.synthetic import GeneratorConfig, generate
 
 
 # ---------------------------------------------------------------------------
@@ -236,7 +241,43 @@ async def seed(session: AsyncSession) -> None:
     await session.commit()
 
 
+def parse_args() -> argparse.Namespace:
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Populate the local database with mock data.")
+    parser.add_argument("--generate", action="store_true", help="Generate a synthetic dataset of the given size")
+    parser.add_argument("--tenants", type=int, default=defaults.tenants)
+    parser.add_argument("--users-per-tenant", type=int, default=defaults.users_per_tenant)
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument(
+        "--inventory-density",
+        type=float,
+        default=defaults.inventory_density,
+        help="Fraction of the catalog each tenant stocks (0-1)",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed; same seed, same data")
+    parser.add_argument("--batch-tenants", type=int, default=defaults.batch_tenants, help="Tenants per COPY batch")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Parallel COPY worker processes")
+    return parser.parse_args()
+
+
 async def main() -> None:
+    args = parse_args()
+    if args.generate:
+        config = GeneratorConfig(
+            tenants=args.tenants,
+            users_per_tenant=args.users_per_tenant,
+            products=args.products,
+            inventory_density=args.inventory_density,
+            seed=args.seed,
+            batch_tenants=args.batch_tenants,
+            workers=args.workers,
+        )
+        print(f"Generating synthetic data: {config}")
+        await generate(config, password=DEFAULT_PASSWORD)
+        print(f"\nDefault password for all users: {DEFAULT_PASSWORD}")
+        await engine.dispose()
+        return
+
     print("Seeding database...")
 
     async with AsyncSessionLocal() as session:
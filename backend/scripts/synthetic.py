@@ -0,0 +1,153 @@
+"""
+Synthetic data generator for benchmark-sized databases.
+
+Rows are generated deterministically from a seed and written with COPY.
+Inventory is split into tenant batches that run in parallel worker processes,
+each with its own connection, so generation and COPY scale with CPU count.
+All users share one precomputed password hash.
+
+Run it against an empty, migrated database (SKUs and emails are fixed per
+seed, so a second run with the same seed collides). See `scripts/seed.py`
+for the command line.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.inventory_change import SKIP_CHANGES_SETTING
+
+USER_COLUMNS = ("id", "email", "full_name", "hashed_password", "is_active", "is_superuser", "tenant_id")
+INVENTORY_COLUMNS = ("id", "tenant_id", "product_id", "min_stock", "current_stock")
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    tenants: int = 100
+    users_per_tenant: int = 5
+    products: int = 10_000
+    # Fraction of the catalog each tenant stocks (0-1)
+    inventory_density: float = 0.1
+    seed: int = 42
+    batch_tenants: int = 10
+    workers: int = 4
+
+
+def _dsn() -> str:
+    """asyncpg wants a plain postgresql:// URL, not the SQLAlchemy driver form."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _rng(seed: int, scope: str) -> random.Random:
+    return random.Random(f"{seed}:{scope}")
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def tenant_ids(config: GeneratorConfig) -> List[uuid.UUID]:
+    rng = _rng(config.seed, "tenants")
+    return [_uuid(rng) for _ in range(config.tenants)]
+
+
+def product_ids(config: GeneratorConfig) -> List[uuid.UUID]:
+    rng = _rng(config.seed, "products")
+    return [_uuid(rng) for _ in range(config.products)]
+
+
+def inventory_rows(
+    config: GeneratorConfig, tenants: Sequence[Tuple[int, uuid.UUID]], products: Sequence[uuid.UUID]
+) -> Iterator[tuple]:
+    """
+    Yield inventory rows for the given `(tenant_index, tenant_id)` pairs.
+    Each tenant has its own RNG, so output does not depend on how tenants are batched.
+    """
+    per_tenant = round(config.inventory_density * len(products))
+    for index, tenant_id in tenants:
+        rng = _rng(config.seed, f"inventory:{index}")
+        for product_index in rng.sample(range(len(products)), per_tenant):
+            min_stock = rng.randint(0, 50)
+            yield _uuid(rng), tenant_id, products[product_index], min_stock, rng.randint(0, min_stock * 10)
+
+
+async def _copy_inventory_batch(
+    config: GeneratorConfig, tenants: Sequence[Tuple[int, uuid.UUID]], products: Sequence[uuid.UUID]
+) -> int:
+    conn = await asyncpg.connect(_dsn())
+    try:
+        async with conn.transaction():
+            # Generated stock is not a change anyone is streaming; keep it out of the change log
+            await conn.execute(f"SELECT set_config('{SKIP_CHANGES_SETTING}', 'on', true)")
+            result = await conn.copy_records_to_table(
+                "inventories", records=inventory_rows(config, tenants, products), columns=INVENTORY_COLUMNS
+            )
+    finally:
+        await conn.close()
+    # asyncpg returns the command tag, e.g. "COPY 50000"
+    return int(result.split()[-1])
+
+
+def _inventory_batch_worker(
+    config: GeneratorConfig, tenants: Sequence[Tuple[int, uuid.UUID]], products: Sequence[uuid.UUID]
+) -> int:
+    return asyncio.run(_copy_inventory_batch(config, tenants, products))
+
+
+async def generate(config: GeneratorConfig, password: str) -> None:
+    started = time.perf_counter()
+    hashed = get_password_hash(password)
+    tenants = tenant_ids(config)
+    products = product_ids(config)
+
+    conn = await asyncpg.connect(_dsn())
+    try:
+        await conn.copy_records_to_table(
+            "tenants",
+            records=((tenant_id, f"Tenant {i:05d}") for i, tenant_id in enumerate(tenants)),
+            columns=("id", "name"),
+        )
+        print(f"  Created {len(tenants)} tenants")
+
+        user_rng = _rng(config.seed, "users")
+        users = (
+            (_uuid(user_rng), f"user{u}@tenant{t:05d}.example.com", f"User {t}-{u}", hashed, True, False, tenant_id)
+            for t, tenant_id in enumerate(tenants)
+            for u in range(config.users_per_tenant)
+        )
+        await conn.copy_records_to_table("users", records=users, columns=USER_COLUMNS)
+        print(f"  Created {len(tenants) * config.users_per_tenant} tenant users")
+
+        await conn.copy_records_to_table(
+            "products",
+            records=(
+                (product_id, f"Product {i:08d}", f"Synthetic product {i}", f"GEN-{config.seed}-{i:08d}")
+                for i, product_id in enumerate(products)
+            ),
+            columns=("id", "name", "description", "sku"),
+        )
+        print(f"  Created {len(products)} products")
+    finally:
+        await conn.close()
+
+    indexed = list(enumerate(tenants))
+    batches = [indexed[i : i + config.batch_tenants] for i in range(0, len(indexed), config.batch_tenants)]
+    loop = asyncio.get_running_loop()
+    total = 0
+    with ProcessPoolExecutor(max_workers=config.workers) as pool:
+        futures = [loop.run_in_executor(pool, _inventory_batch_worker, config, batch, products) for batch in batches]
+        for done, future in enumerate(asyncio.as_completed(futures), start=1):
+            total += await future
+            print(f"  Inventory batch {done}/{len(batches)} done ({total} rows)")
+
+    print(f"  Created {total} inventory items in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,50 @@
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.security import create_access_token
+from app.schemas.tenant import TenantCreate
+from app.schemas.user import UserCreate
+
+
+def _auth_headers(user) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+@pytest.fixture
+async def tenant(db_session: AsyncSession):
+    return await crud.tenant.create(db_session, obj_in=TenantCreate(name="API Test Tenant"))
+
+
+@pytest.fixture
+async def tenant_user(db_session: AsyncSession, tenant):
+    user_in = UserCreate(
+        email=f"api-{uuid.uuid4().hex[:8]}@example.com",
+        full_name="API User",
+        password="password123",
+        tenant_id=tenant.id,
+    )
+    return await crud.user.create(db_session, obj_in=user_in)
+
+
+@pytest.fixture
+async def superuser(db_session: AsyncSession):
+    user_in = UserCreate(
+        email=f"admin-{uuid.uuid4().hex[:8]}@example.com",
+        full_name="API Admin",
+        password="password123",
+        is_superuser=True,
+    )
+    return await crud.user.create(db_session, obj_in=user_in)
+
+
+@pytest.fixture
+def auth_headers(tenant_user) -> dict:
+    return _auth_headers(tenant_user)
+
+
+@pytest.fixture
+def superuser_headers(superuser) -> dict:
+    return _auth_headers(superuser)
@@ -0,0 +1,132 @@
+import asyncio
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app import crud
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.inventory import Inventory
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def product(db_session):
+    sku = f"IDEM-{uuid.uuid4().hex[:8]}"
+    return await crud.product.create(db_session, obj_in=ProductCreate(name="Idempotent Product", sku=sku))
+
+
+def _create(client, headers, product, key, current_stock=10):
+    body = {"product_id": str(product.id), "min_stock": 1, "current_stock": current_stock}
+    return client.post("/api/v1/inventory/", json=body, headers={**headers, "Idempotency-Key": key})
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_first_response(client: AsyncClient, auth_headers, product):
+    key = uuid.uuid4().hex
+
+    first = await _create(client, auth_headers, product, key)
+    retry = await _create(client, auth_headers, product, key)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_execute_once(client: AsyncClient, auth_headers, product, db_session):
+    key = uuid.uuid4().hex
+
+    responses = await asyncio.gather(*(_create(client, auth_headers, product, key) for _ in range(10)))
+
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum("idempotent-replayed" in response.headers for response in responses) == 9
+    count = await db_session.scalar(select(func.count()).where(Inventory.product_id == product.id))
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_different_request(client: AsyncClient, auth_headers, product):
+    key = uuid.uuid4().hex
+
+    await _create(client, auth_headers, product, key)
+    response = await _create(client, auth_headers, product, key, current_stock=99)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_per_tenant(client: AsyncClient, db_session, auth_headers, product):
+    key = uuid.uuid4().hex
+    other_tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name="Other Idempotency Tenant"))
+    other_user = await crud.user.create(
+        db_session,
+        obj_in=UserCreate(
+            email=f"idem-{uuid.uuid4().hex[:8]}@example.com",
+            full_name="Other",
+            password="password123",
+            tenant_id=other_tenant.id,
+        ),
+    )
+    other_headers = {"Authorization": f"Bearer {create_access_token(other_user.id)}"}
+
+    first = await _create(client, auth_headers, product, key)
+    other = await _create(client, other_headers, product, key)
+
+    assert other.status_code == 201
+    assert "idempotent-replayed" not in other.headers
+    assert other.json()["id"] != first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_tenantless_callers_bypass_keys(client: AsyncClient, superuser_headers, product):
+    response = await _create(client, superuser_headers, product, uuid.uuid4().hex)
+
+    assert response.status_code == 400
+    assert "idempotent-replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_requests_without_key_are_untouched(client: AsyncClient, auth_headers, product):
+    body = {"product_id": str(product.id), "min_stock": 1, "current_stock": 10}
+
+    assert (await client.post("/api/v1/inventory/", json=body, headers=auth_headers)).status_code == 201
+    # The duplicate hits the unique check again
+    assert (await client.post("/api/v1/inventory/", json=body, headers=auth_headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_claim_taken_over_after_its_lock_lapsed(client: AsyncClient, auth_headers, product, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 0)
+    key = uuid.uuid4().hex
+    gate = asyncio.Event()
+    lookups = []
+    get_product = crud.product.get
+
+    async def slow_first_lookup(db, id):
+        lookups.append(id)
+        if len(lookups) == 1:
+            await gate.wait()
+        return await get_product(db, id=id)
+
+    monkeypatch.setattr(crud.product, "get", slow_first_lookup)
+
+    # The first request outlives its lock, so the retry claims the key and runs
+    first = asyncio.create_task(_create(client, auth_headers, product, key))
+    while not lookups:
+        await asyncio.sleep(0.01)
+    retry = await _create(client, auth_headers, product, key)
+    gate.set()
+    first = await first
+
+    assert (retry.status_code, first.status_code) == (201, 400)
+    # The first request's late response doesn't replace the retry's
+    replay = await _create(client, auth_headers, product, key)
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == retry.json()
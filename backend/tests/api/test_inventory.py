@@ -0,0 +1,323 @@
+import uuid
+
+import pyarrow.ipc as ipc
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app import crud
+from app.api import deps
+from app.main import app
+from app.models.inventory import Inventory
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.tenant_move import TenantMover
+
+
+@pytest.fixture
+async def product(db_session):
+    sku = f"API-INV-{uuid.uuid4().hex[:8]}"
+    return await crud.product.create(db_session, obj_in=ProductCreate(name="API Inventory Product", sku=sku))
+
+
+@pytest.fixture
+async def inventory(db_session, tenant, product):
+    inv_in = InventoryCreate(product_id=product.id, min_stock=5, current_stock=40)
+    return await crud.inventory.create_with_tenant(db_session, obj_in=inv_in, tenant_id=tenant.id)
+
+
+@pytest.mark.asyncio
+async def test_read_inventories_matches_public_schema(client: AsyncClient, auth_headers, inventory):
+    response = await client.get("/api/v1/inventory/", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [
+        {
+            "id": str(inventory.id),
+            "product_id": str(inventory.product_id),
+            "min_stock": 5,
+            "current_stock": 40,
+            "target_stock": None,
+            "version": 1,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_inventories_requires_auth(client: AsyncClient):
+    response = await client.get("/api/v1/inventory/")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_read_inventories_query_budget(client: AsyncClient, auth_headers, inventory, query_budget):
+    # current user lookup + inventory list
+    with query_budget(2):
+        response = await client.get("/api/v1/inventory/", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_request_more_supply_query_budget(client: AsyncClient, auth_headers, inventory, query_budget):
+    # current user, inventory item, product, tenant, supply order
+    with query_budget(5):
+        response = await client.post(
+            f"/api/v1/inventory/{inventory.id}/resupply", json={"quantity": 10}, headers=auth_headers
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_inventory_changes_requires_auth(client: AsyncClient):
+    response = await client.get("/api/v1/inventory/changes")
+
+    assert response.status_code == 401
+
+
+class _RecordingDispatcher:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, tenant_id, event):
+        self.published.append((tenant_id, event))
+
+
+@pytest.mark.asyncio
+async def test_update_inventory_publishes_low_stock_once(client: AsyncClient, auth_headers, inventory):
+    dispatcher = _RecordingDispatcher()
+    app.dependency_overrides[deps.get_webhook_dispatcher] = lambda: dispatcher
+    url = f"/api/v1/inventory/{inventory.id}"
+
+    # Still above the minimum, then below it, then lower still
+    for stock in (inventory.min_stock, inventory.min_stock - 1, 0):
+        response = await client.patch(url, headers=auth_headers, json={"current_stock": stock})
+        assert response.status_code == 200
+
+    assert len(dispatcher.published) == 1
+    tenant_id, event = dispatcher.published[0]
+    assert tenant_id == inventory.tenant_id
+    assert event.current_stock == inventory.min_stock - 1
+
+
+@pytest.mark.asyncio
+async def test_read_inventory_forecast(client: AsyncClient, auth_headers, inventory):
+    response = await client.get("/api/v1/inventory/forecast", headers=auth_headers, params={"method": "ema"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "id": str(inventory.id),
+            "product_id": str(inventory.product_id),
+            "current_stock": 40,
+            "min_stock": 5,
+            "daily_demand": 0.0,
+            "days_until_stockout": None,
+            "stockout_date": None,
+            "suggested_min_stock": 0,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_inventory_forecast_rejects_unknown_method(client: AsyncClient, auth_headers):
+    response = await client.get("/api/v1/inventory/forecast", headers=auth_headers, params={"method": "arima"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_read_inventory_summary(client: AsyncClient, auth_headers, inventory, product, query_budget):
+    # current user lookup + summary rows
+    with query_budget(2):
+        response = await client.get("/api/v1/inventory/summary", headers=auth_headers)
+
+    assert response.status_code == 200
+    counts = {"sku_count": 1, "total_units": 40, "low_stock_count": 0, "out_of_stock_count": 0}
+    assert response.json() == {**counts, "prefixes": [{**counts, "sku_prefix": "API"}]}
+
+
+@pytest.mark.asyncio
+async def test_batch_get_inventories(client: AsyncClient, auth_headers, db_session, inventory, product, query_budget):
+    # Another tenant's item for the same product must not be visible
+    other_tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Other {uuid.uuid4().hex[:8]}"))
+    await crud.inventory.create_with_tenant(
+        db_session,
+        obj_in=InventoryCreate(product_id=product.id, min_stock=1, current_stock=1),
+        tenant_id=other_tenant.id,
+    )
+    expected = {
+        "id": str(inventory.id),
+        "product_id": str(product.id),
+        "min_stock": 5,
+        "current_stock": 40,
+        "target_stock": None,
+        "version": 1,
+    }
+
+    unknown = str(uuid.uuid4())
+
+    # current user lookup + items; ids are product ids, as in GET /inventory/{product_id}
+    with query_budget(2):
+        response = await client.post(
+            "/api/v1/inventory/batch-get", headers=auth_headers, json={"ids": [unknown, str(product.id)]}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [None, expected], "missing": [unknown]}
+
+    response = await client.post(
+        "/api/v1/inventory/batch-get", headers=auth_headers, json={"skus": [product.sku, "API-INV-NONE"]}
+    )
+
+    assert response.json() == {"items": [expected, None], "missing": ["API-INV-NONE"]}
+
+
+@pytest.mark.asyncio
+async def test_export_inventories_arrow(client: AsyncClient, auth_headers, inventory, product):
+    response = await client.get(
+        "/api/v1/inventory/export", headers=auth_headers, params={"columns": "sku,current_stock"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    assert ipc.open_stream(response.content).read_all().to_pylist() == [{"sku": product.sku, "current_stock": 40}]
+
+
+@pytest.mark.asyncio
+async def test_items_of_deleted_products_are_hidden(client: AsyncClient, auth_headers, db_session, inventory, product):
+    await crud.product.remove(db_session, id=product.id)
+
+    response = await client.get("/api/v1/inventory/", headers=auth_headers)
+    assert response.json() == []
+
+    response = await client.post("/api/v1/inventory/batch-get", headers=auth_headers, json={"skus": [product.sku]})
+    assert response.json() == {"items": [None], "missing": [product.sku]}
+
+    response = await client.get("/api/v1/inventory/export", headers=auth_headers, params={"columns": "sku"})
+    assert ipc.open_stream(response.content).read_all().num_rows == 0
+
+    response = await client.get("/api/v1/inventory/summary", headers=auth_headers)
+    assert response.json()["sku_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_items_of_deleted_products_cannot_be_read_or_written(
+    client: AsyncClient, auth_headers, db_session, inventory, product
+):
+    inventory_id = inventory.id
+    await crud.product.remove(db_session, id=product.id)
+
+    response = await client.get(f"/api/v1/inventory/{product.id}", headers=auth_headers)
+    assert response.status_code == 404
+    response = await client.get(f"/api/v1/inventory/{inventory.id}/availability", headers=auth_headers)
+    assert response.status_code == 404
+    response = await client.get("/api/v1/inventory/forecast", headers=auth_headers)
+    assert response.json() == []
+    response = await client.patch(f"/api/v1/inventory/{inventory.id}", headers=auth_headers, json={"current_stock": 1})
+    assert response.status_code == 404
+    response = await client.post(
+        f"/api/v1/inventory/{inventory.id}/resupply", headers=auth_headers, json={"quantity": 10}
+    )
+    assert response.status_code == 404
+    response = await client.post(
+        "/api/v1/reservations/", headers=auth_headers, json={"inventory_id": str(inventory.id), "quantity": 1}
+    )
+    assert response.status_code == 404
+
+    # Left for the purger, untouched
+    db_session.expire_all()
+    assert await db_session.scalar(select(Inventory.current_stock).where(Inventory.id == inventory_id)) == 40
+
+
+@pytest.mark.asyncio
+async def test_create_inventory_for_deleted_product(client: AsyncClient, auth_headers, db_session, product):
+    await crud.product.remove(db_session, id=product.id)
+
+    response = await client.post(
+        "/api/v1/inventory/",
+        headers=auth_headers,
+        json={"product_id": str(product.id), "min_stock": 0, "current_stock": 1},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_inventories_rejects_unknown_column(client: AsyncClient, auth_headers):
+    response = await client.get("/api/v1/inventory/export", headers=auth_headers, params={"columns": "sku,price"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_inventory_is_served_from_the_tenant_shard(
+    client: AsyncClient, auth_headers, db_session, shard_session_factory, sharded, inventory, product
+):
+    await TenantMover(pause_ms=0).move(inventory.tenant_id, sharded)
+
+    response = await client.get("/api/v1/inventory/", headers=auth_headers)
+    assert [item["id"] for item in response.json()] == [str(inventory.id)]
+
+    response = await client.patch(f"/api/v1/inventory/{inventory.id}", headers=auth_headers, json={"current_stock": 7})
+    assert response.status_code == 200
+    async with shard_session_factory() as shard_db:
+        assert (await crud.inventory.get(shard_db, id=inventory.id)).current_stock == 7
+    assert await crud.inventory.get(db_session, id=inventory.id) is None
+
+
+@pytest.mark.asyncio
+async def test_writes_wait_out_a_tenant_cutover(
+    client: AsyncClient, auth_headers, test_session_factory, sharded, inventory
+):
+    async with test_session_factory() as mover_db:
+        await crud.tenant.lock_for_move(mover_db, tenant_id=inventory.tenant_id)
+
+        response = await client.patch(
+            f"/api/v1/inventory/{inventory.id}", headers=auth_headers, json={"current_stock": 7}
+        )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        # Reads carry on from the current shard
+        response = await client.get("/api/v1/inventory/", headers=auth_headers)
+        assert response.status_code == 200
+
+    response = await client.patch(f"/api/v1/inventory/{inventory.id}", headers=auth_headers, json={"current_stock": 7})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_update_inventory_with_if_match(client: AsyncClient, auth_headers, inventory, product, query_budget):
+    response = await client.get(f"/api/v1/inventory/{product.id}", headers=auth_headers)
+    etag = response.headers["etag"]
+    assert etag == f'"{response.json()["version"]}"'
+    url = f"/api/v1/inventory/{inventory.id}"
+
+    # Two clients edit the same version: the second one is turned away.
+    # current user lookup + the conditional update, no read of the item
+    with query_budget(2):
+        response = await client.patch(url, headers={**auth_headers, "If-Match": etag}, json={"current_stock": 8})
+    assert response.status_code == 200
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+
+    response = await client.patch(url, headers={**auth_headers, "If-Match": etag}, json={"current_stock": 3})
+    assert response.status_code == 412
+    assert response.headers["etag"] == new_etag
+
+    response = await client.get(f"/api/v1/inventory/{product.id}", headers=auth_headers)
+    assert response.json()["current_stock"] == 8
+
+    # Any of several tags, or `*`, will do; weak tags never match
+    for if_match, status_code in ((f'"0", {new_etag}', 200), ("*", 200), ('W/"1"', 412)):
+        response = await client.patch(url, headers={**auth_headers, "If-Match": if_match}, json={"min_stock": 2})
+        assert response.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_update_inventory_if_match_missing_item(client: AsyncClient, auth_headers):
+    response = await client.patch(
+        f"/api/v1/inventory/{uuid.uuid4()}", headers={**auth_headers, "If-Match": '"1"'}, json={"current_stock": 1}
+    )
+    assert response.status_code == 404
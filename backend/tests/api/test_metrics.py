@@ -0,0 +1,29 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_metrics_labels_requests_by_route_template(client: AsyncClient):
+    await client.get("/api/v1/products/")
+    await client.get("/api/v1/products/not-a-uuid")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/products/",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="/api/v1/products/{product_id}",status="422"}' in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert "http_requests_in_progress" in body
+    assert "db_pool_connections_checked_out" in body
+    assert "password_hash_queue_depth" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_unmatched_routes_share_one_label(client: AsyncClient):
+    await client.get("/no/such/path/12345")
+
+    response = await client.get("/metrics")
+
+    assert 'route="unmatched",status="404"' in response.text
+    assert "/no/such/path" not in response.text
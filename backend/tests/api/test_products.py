@@ -0,0 +1,221 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app import crud
+from app.api import deps
+from app.core.config import settings
+from app.main import app
+from app.schemas.product import ProductCreate
+
+
+@pytest.mark.asyncio
+async def test_read_products_matches_public_schema(client: AsyncClient, db_session):
+    product = await crud.product.create(
+        db_session, obj_in=ProductCreate(name="Listed Product", sku="API-LIST-001", description="desc")
+    )
+
+    response = await client.get("/api/v1/products/", params={"limit": 1000})
+
+    assert response.status_code == 200
+    listed = {item["id"]: item for item in response.json()}
+    assert listed[str(product.id)] == {
+        "name": "Listed Product",
+        "description": "desc",
+        "sku": "API-LIST-001",
+        "id": str(product.id),
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_products_query_budget(client: AsyncClient, query_budget):
+    with query_budget(1):
+        response = await client.get("/api/v1/products/")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv(client: AsyncClient, db_session, superuser_headers):
+    await crud.product.create(db_session, obj_in=ProductCreate(name="Old Name", sku="IMP-CSV-EXISTING"))
+    await crud.product.create(db_session, obj_in=ProductCreate(name="Same", sku="IMP-CSV-SAME"))
+    body = (
+        "sku,name,description\n"
+        "IMP-CSV-NEW,New Product,Fresh\n"
+        "IMP-CSV-EXISTING,New Name,\n"
+        "IMP-CSV-SAME,Same,\n"
+        ",Missing Sku,\n"
+        "IMP-CSV-BAD,too,many,columns\n"
+    )
+
+    response = await client.post(
+        "/api/v1/products/import",
+        content=body.encode(),
+        headers={**superuser_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["unchanged"], data["rejected"]) == (1, 1, 1, 2)
+    assert [error["line"] for error in data["errors"]] == [5, 6]
+
+    db_session.expire_all()
+    assert (await crud.product.get_by_sku(db_session, sku="IMP-CSV-NEW")).description == "Fresh"
+    assert (await crud.product.get_by_sku(db_session, sku="IMP-CSV-EXISTING")).name == "New Name"
+
+
+@pytest.mark.asyncio
+async def test_import_products_ndjson_last_duplicate_wins(client: AsyncClient, db_session, superuser_headers):
+    lines = [
+        '{"sku": "IMP-ND-1", "name": "First"}',
+        "not json",
+        '{"sku": "IMP-ND-1", "name": "Second"}',
+        '{"name": "No Sku"}',
+    ]
+    body = "\n".join(lines) + "\n"
+
+    response = await client.post(
+        "/api/v1/products/import",
+        content=body.encode(),
+        headers={**superuser_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 0, 2)
+    assert (await crud.product.get_by_sku(db_session, sku="IMP-ND-1")).name == "Second"
+
+
+@pytest.mark.asyncio
+async def test_import_products_refuses_skus_still_being_deleted(client: AsyncClient, db_session, superuser_headers):
+    sku = f"IMP-DEL-{uuid.uuid4().hex[:8]}"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(sku=sku, name="Old Name"))
+    await crud.product.remove(db_session, id=product.id)
+    body = f'{{"sku": "{sku}", "name": "New Name"}}\n{{"sku": "{sku}-2", "name": "Other"}}\n'
+
+    response = await client.post(
+        "/api/v1/products/import",
+        content=body.encode(),
+        headers={**superuser_headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["unchanged"], data["rejected"]) == (1, 0, 0, 1)
+    assert data["errors"] == [{"line": 1, "detail": "The product with this SKU is still being deleted."}]
+    db_session.expire_all()
+    assert (await crud.product.get_by_sku(db_session, sku=sku, include_deleted=True)).name == "Old Name"
+
+
+@pytest.mark.asyncio
+async def test_import_products_rejects_bad_header(client: AsyncClient, superuser_headers):
+    response = await client.post(
+        "/api/v1/products/import",
+        content=b"code,title\nX,Y\n",
+        headers={**superuser_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_products_unsupported_content_type(client: AsyncClient, superuser_headers):
+    response = await client.post(
+        "/api/v1/products/import",
+        content=b"{}",
+        headers={**superuser_headers, "Content-Type": "application/json"},
+    )
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_import_products_requires_superuser(client: AsyncClient, auth_headers):
+    response = await client.post(
+        "/api/v1/products/import",
+        content=b"sku,name\nX,Y\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_batch_get_products_keeps_request_order(client: AsyncClient, db_session, query_budget):
+    first = await crud.product.create(db_session, obj_in=ProductCreate(name="Batch One", sku="API-BATCH-001"))
+    second = await crud.product.create(db_session, obj_in=ProductCreate(name="Batch Two", sku="API-BATCH-002"))
+    unknown = str(uuid.uuid4())
+
+    with query_budget(1):
+        response = await client.post(
+            "/api/v1/products/batch-get", json={"ids": [str(second.id), unknown, str(first.id), str(second.id)]}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item and item["sku"] for item in data["items"]] == ["API-BATCH-002", None, "API-BATCH-001", "API-BATCH-002"]
+    assert data["missing"] == [unknown]
+
+    response = await client.post("/api/v1/products/batch-get", json={"skus": ["API-BATCH-001", "API-BATCH-NONE"]})
+
+    assert response.json() == {
+        "items": [{"name": "Batch One", "description": None, "sku": "API-BATCH-001", "id": str(first.id)}, None],
+        "missing": ["API-BATCH-NONE"],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [{}, {"ids": [], "skus": []}, {"skus": ["SKU"] * (settings.BATCH_GET_MAX_KEYS + 1)}],
+)
+async def test_batch_get_products_rejects_invalid_keys(client: AsyncClient, body):
+    response = await client.post("/api/v1/products/batch-get", json=body)
+
+    assert response.status_code == 422
+
+
+class _RecordingPurger:
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self):
+        self.runs += 1
+
+
+@pytest.mark.asyncio
+async def test_delete_product_hides_it_and_starts_purge(client: AsyncClient, db_session, superuser_headers):
+    purger = _RecordingPurger()
+    app.dependency_overrides[deps.get_purger] = lambda: purger
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name="Deleted", sku="API-DELETE-001"))
+
+    response = await client.delete(f"/api/v1/products/{product.id}", headers=superuser_headers)
+
+    assert response.status_code == 200
+    assert purger.runs == 1
+    assert (await client.get(f"/api/v1/products/{product.id}")).status_code == 404
+    assert (await client.delete(f"/api/v1/products/{product.id}", headers=superuser_headers)).status_code == 404
+    # The SKU stays taken until the purge has removed the product
+    response = await client.post(
+        "/api/v1/products/", headers=superuser_headers, json={"name": "Again", "sku": "API-DELETE-001"}
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_product_writes_reach_every_shard(client: AsyncClient, superuser_headers, shard_session_factory, sharded):
+    sku = f"API-SHARD-{uuid.uuid4().hex[:8]}"
+    response = await client.post("/api/v1/products/", headers=superuser_headers, json={"name": "Sharded", "sku": sku})
+    assert response.status_code == 201
+    product_id = response.json()["id"]
+
+    response = await client.patch(f"/api/v1/products/{product_id}", headers=superuser_headers, json={"name": "Renamed"})
+    assert response.status_code == 200
+    async with shard_session_factory() as shard_db:
+        assert (await crud.product.get(shard_db, id=product_id)).name == "Renamed"
+
+    app.dependency_overrides[deps.get_purger] = lambda: _RecordingPurger()
+    response = await client.delete(f"/api/v1/products/{product_id}", headers=superuser_headers)
+    assert response.status_code == 200
+    async with shard_session_factory() as shard_db:
+        # Deleted there too, with its own purge queued
+        assert await crud.product.get(shard_db, id=product_id) is None
+        assert [job.entity_id for job in await crud.purge_job.get_recent(shard_db, pending=True)].count(
+            uuid.UUID(product_id)
+        ) == 1
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import profiling
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_superuser_can_profile_a_request(client: AsyncClient, superuser_headers, profile_dir):
+    response = await client.get("/api/v1/products/", headers={**superuser_headers, "X-Profile": "1"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert (profile_dir / f"{profile_id}.speedscope.json").is_file()
+
+    download = await client.get(f"/api/v1/profiles/{profile_id}", headers=superuser_headers)
+    assert download.status_code == 200
+    assert "speedscope" in download.json()["$schema"]
+
+
+@pytest.mark.asyncio
+async def test_profile_header_ignored_for_regular_users(client: AsyncClient, auth_headers, profile_dir):
+    response = await client.get("/api/v1/products/", headers={**auth_headers, "X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert not list(profile_dir.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_sample_rate_profiles_anonymous_requests(client: AsyncClient, monkeypatch, profile_dir):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+
+    response = await client.get("/api/v1/products/")
+
+    assert "X-Profile-Id" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_profile_retention_is_bounded(client: AsyncClient, monkeypatch, profile_dir):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_MAX_FILES", 2)
+
+    for _ in range(4):
+        await client.get("/api/v1/products/")
+
+    assert len(list(profile_dir.iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_responses_are_not_profiled(client: AsyncClient, auth_headers, monkeypatch, profile_dir):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+
+    response = await client.get("/api/v1/inventory/export", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert not list(profile_dir.iterdir())
+    assert not profiling._profiling_lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_profile_requested_while_another_runs_is_skipped(client: AsyncClient, superuser_headers, profile_dir):
+    async with profiling._profiling_lock:
+        response = await asyncio.wait_for(
+            client.get("/api/v1/products/", headers={**superuser_headers, "X-Profile": "1"}), timeout=5
+        )
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_profiling_stops_after_max_duration(monkeypatch, profile_dir):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_MAX_SECONDS", 0.01)
+    held = []
+
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(0.1)
+        held.append(profiling._profiling_lock.locked())
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"0")]})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/slow", "headers": []}
+    await profiling.ProfilingMiddleware(slow_app)(scope, receive, send)
+
+    # Free for other requests while this one still ran, and its profile is kept
+    assert held == [False]
+    assert len(list(profile_dir.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_download_requires_superuser(client: AsyncClient, auth_headers, superuser_headers):
+    assert (await client.get(f"/api/v1/profiles/{'0' * 32}", headers=auth_headers)).status_code == 403
+    assert (await client.get(f"/api/v1/profiles/{'0' * 32}", headers=superuser_headers)).status_code == 404
+    assert (await client.get("/api/v1/profiles/..%2Fetc", headers=superuser_headers)).status_code == 404
@@ -0,0 +1,28 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core import request_context
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed(client: AsyncClient):
+    response = await client.get("/api/v1/products/", headers={"X-Request-ID": "trace-123"})
+    assert response.headers["X-Request-ID"] == "trace-123"
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_generated(client: AsyncClient):
+    response = await client.get("/api/v1/products/")
+    assert len(response.headers["X-Request-ID"]) == 32
+
+
+@pytest.mark.asyncio
+async def test_access_log_carries_tenant(client: AsyncClient, auth_headers, tenant, monkeypatch):
+    lines = []
+    monkeypatch.setattr(request_context.log, "info", lambda *args, extra: lines.append((args, extra)))
+
+    await client.get("/api/v1/inventory/", headers=auth_headers)
+
+    ((args, extra),) = lines
+    assert args[1:] == ("GET", "/api/v1/inventory/", 200)
+    assert extra["tenant_id"] == str(tenant.id)
@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app import crud
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+
+
+@pytest.fixture
+async def inventory(db_session, tenant):
+    sku = f"API-HOLD-{uuid.uuid4().hex[:8]}"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=3, current_stock=5)
+    return await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+
+@pytest.mark.asyncio
+async def test_reservation_flow(client: AsyncClient, auth_headers, inventory, query_budget):
+    # current user lookup + the hold itself
+    with query_budget(2):
+        response = await client.post(
+            "/api/v1/reservations/", headers=auth_headers, json={"inventory_id": str(inventory.id), "quantity": 4}
+        )
+    assert response.status_code == 201
+    held = response.json()
+    assert (held["quantity"], held["available_stock"]) == (4, 1)
+
+    response = await client.post(
+        "/api/v1/reservations/", headers=auth_headers, json={"inventory_id": str(inventory.id), "quantity": 2}
+    )
+    assert response.status_code == 409
+
+    response = await client.get(f"/api/v1/inventory/{inventory.id}/availability", headers=auth_headers)
+    assert response.json() == {
+        "id": str(inventory.id),
+        "current_stock": 5,
+        "reserved_stock": 4,
+        "available_stock": 1,
+    }
+
+    response = await client.post(f"/api/v1/reservations/{held['id']}/commit", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["available_stock"] == 1
+    response = await client.delete(f"/api/v1/reservations/{held['id']}", headers=auth_headers)
+    assert response.status_code == 404
+
+    response = await client.get(f"/api/v1/inventory/{inventory.id}/availability", headers=auth_headers)
+    assert response.json()["current_stock"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reservation_validation(client: AsyncClient, auth_headers, inventory):
+    for body, status_code in (
+        ({"inventory_id": str(uuid.uuid4()), "quantity": 1}, 404),
+        ({"inventory_id": str(inventory.id), "quantity": 0}, 422),
+        ({"inventory_id": str(inventory.id), "quantity": 1, "ttl_seconds": 10**6}, 422),
+    ):
+        response = await client.post("/api/v1/reservations/", headers=auth_headers, json=body)
+        assert response.status_code == status_code
+
+
+@pytest.mark.asyncio
+async def test_stock_cannot_drop_below_reserved(client: AsyncClient, auth_headers, inventory):
+    url = f"/api/v1/inventory/{inventory.id}"
+    response = await client.post(
+        "/api/v1/reservations/", headers=auth_headers, json={"inventory_id": str(inventory.id), "quantity": 4}
+    )
+    assert response.status_code == 201
+
+    response = await client.patch(url, headers=auth_headers, json={"current_stock": 3})
+    assert response.status_code == 409
+
+    response = await client.get(f"{url}/availability", headers=auth_headers)
+    assert response.json()["current_stock"] == 5
+    response = await client.patch(url, headers=auth_headers, json={"current_stock": 4})
+    assert response.status_code == 200
@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+
+def _phases(response) -> set:
+    return {entry.split(";")[0].strip() for entry in response.headers["Server-Timing"].split(",")}
+
+
+@pytest.fixture
+def timing_token(monkeypatch) -> str:
+    monkeypatch.setattr(settings, "SERVER_TIMING_TOKEN", "timing-secret")
+    return "timing-secret"
+
+
+@pytest.mark.asyncio
+async def test_server_timing_absent_by_default(client: AsyncClient, auth_headers):
+    response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_server_timing_with_admin_token(client: AsyncClient, auth_headers, timing_token):
+    response = await client.get("/api/v1/auth/me", headers={**auth_headers, "X-Server-Timing-Token": timing_token})
+
+    assert response.status_code == 200
+    assert {"auth", "db", "serialize", "total"} <= _phases(response)
+
+
+@pytest.mark.asyncio
+async def test_server_timing_rejects_wrong_token(client: AsyncClient, timing_token):
+    response = await client.get("/api/v1/products/", headers={"X-Server-Timing-Token": "guess"})
+
+    assert "Server-Timing" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_server_timing_enabled_by_config(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+    response = await client.get("/api/v1/products/")
+
+    assert {"db", "serialize", "total"} <= _phases(response)
@@ -0,0 +1,61 @@
+import io
+
+import pyarrow.parquet as pq
+import pytest
+from httpx import AsyncClient
+
+from app import crud
+from app.api import deps
+from app.main import app
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+
+
+class _RecordingPurger:
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self):
+        self.runs += 1
+
+
+@pytest.mark.asyncio
+async def test_export_all_inventories_parquet(client: AsyncClient, db_session, superuser_headers, tenant):
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name="Exported", sku="API-EXPORT-001"))
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=7)
+    await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+    response = await client.get(
+        "/api/v1/tenants/export",
+        headers=superuser_headers,
+        params={"format": "parquet", "tenant_id": str(tenant.id), "columns": "tenant_id,name,current_stock"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="inventory.parquet"'
+    assert pq.read_table(io.BytesIO(response.content)).to_pylist() == [
+        {"tenant_id": str(tenant.id), "name": "Exported", "current_stock": 7}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_all_inventories_requires_superuser(client: AsyncClient, auth_headers):
+    response = await client.get("/api/v1/tenants/export", headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_delete_tenant_locks_out_users(client: AsyncClient, superuser_headers, auth_headers, tenant):
+    purger = _RecordingPurger()
+    app.dependency_overrides[deps.get_purger] = lambda: purger
+
+    response = await client.delete(f"/api/v1/tenants/{tenant.id}", headers=superuser_headers)
+
+    assert response.status_code == 200
+    assert purger.runs == 1
+    assert (await client.get("/api/v1/inventory/", headers=auth_headers)).status_code == 401
+    response = await client.get("/api/v1/purges/", headers=superuser_headers, params={"pending": True})
+    assert [
+        (job["table_name"], job["rows_deleted"]) for job in response.json() if job["entity_id"] == str(tenant.id)
+    ] == [("tenants", 0)]
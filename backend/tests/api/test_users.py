@@ -1,5 +1,17 @@
+import json
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.core.security import get_password_hash
+from app.crud import crud_user
+from app.models.user import User
+
+_FAKE_HASH = get_password_hash("not-a-real-password")
 
 
 @pytest.mark.asyncio
@@ -46,3 +58,74 @@ async def test_signup_missing_fields(client: AsyncClient):
     payload = {"full_name": "Incomplete User"}
     response = await client.post("/api/v1/auth/signup", json=payload)
     assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_streams_credentials(client: AsyncClient, auth_headers, tenant):
+    emails = [f"bulk-{uuid.uuid4().hex[:8]}@example.com" for _ in range(2)]
+    payload = {"users": [{"email": email, "full_name": "Bulk"} for email in emails]}
+
+    response = await client.post("/api/v1/auth/invite/bulk", json=payload, headers=auth_headers)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["email"] for line in lines] == emails
+    assert all(line["tenant_id"] == str(tenant.id) and len(line["temporary_password"]) == 12 for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_at_the_limit(client: AsyncClient, auth_headers, db_session, monkeypatch):
+    hashed_chunks = []
+
+    async def fake_hashes(passwords):
+        hashed_chunks.append(len(passwords))
+        return [_FAKE_HASH] * len(passwords)
+
+    # bcrypt at full cost would take minutes for this many users
+    monkeypatch.setattr(crud_user, "get_password_hashes_parallel", fake_hashes)
+    prefix = f"limit-{uuid.uuid4().hex[:8]}"
+    users = [{"email": f"{prefix}-{i}@example.com", "full_name": "Bulk"} for i in range(settings.BULK_INVITE_MAX_USERS)]
+
+    response = await client.post("/api/v1/auth/invite/bulk", json={"users": users}, headers=auth_headers)
+
+    assert response.status_code == 201
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == settings.BULK_INVITE_MAX_USERS
+    assert not [line for line in lines if "error" in line]
+    assert hashed_chunks == [settings.BULK_INVITE_CHUNK_SIZE] * (
+        settings.BULK_INVITE_MAX_USERS // settings.BULK_INVITE_CHUNK_SIZE
+    )
+    created = select(func.count()).select_from(User).where(User.email.startswith(prefix))
+    assert await db_session.scalar(created) == settings.BULK_INVITE_MAX_USERS
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_rejects_too_many(client: AsyncClient, auth_headers):
+    users = [{"email": f"u{i}@example.com", "full_name": "Bulk"} for i in range(settings.BULK_INVITE_MAX_USERS + 1)]
+
+    response = await client.post("/api/v1/auth/invite/bulk", json={"users": users}, headers=auth_headers)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_flow(client: AsyncClient, tenant_user):
+    limiter.reset()
+    login = await client.post("/api/v1/auth/login", data={"username": tenant_user.email, "password": "password123"})
+    assert login.status_code == 200
+    refresh_token = login.json()["refresh_token"]
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refresh_token"] != refresh_token
+    me = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert me.json()["id"] == str(tenant_user.id)
+
+    # Replaying the first token revokes the one just issued too
+    replay = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert replay.status_code == 401
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": data["refresh_token"]})
+    assert response.status_code == 401
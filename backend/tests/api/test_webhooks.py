@@ -0,0 +1,76 @@
+import ipaddress
+
+import pytest
+from httpx import AsyncClient
+
+from app import crud
+from app.services import webhooks
+from app.schemas.tenant import TenantCreate
+from app.schemas.webhook import WebhookCreate
+
+
+@pytest.fixture(autouse=True)
+def dns(monkeypatch):
+    """
+    Names resolve without a network; IP literals and localhost go to the real resolver.
+    """
+    resolve_host = webhooks.resolve_host
+    names = {"example.com": "93.184.215.14", "intranet.example.com": "10.1.2.3"}
+
+    async def resolve(host):
+        if host in names:
+            return [ipaddress.ip_address(names[host])]
+        return await resolve_host(host)
+
+    monkeypatch.setattr(webhooks, "resolve_host", resolve)
+
+
+@pytest.mark.asyncio
+async def test_create_webhook_returns_secret_once(client: AsyncClient, auth_headers):
+    response = await client.post("/api/v1/webhooks/", headers=auth_headers, json={"url": "https://example.com/hook"})
+
+    assert response.status_code == 201
+    created = response.json()
+    assert created["secret"]
+    assert created["is_active"] is True
+
+    listed = (await client.get("/api/v1/webhooks/", headers=auth_headers)).json()
+    assert [hook["id"] for hook in listed] == [created["id"]]
+    assert "secret" not in listed[0]
+
+
+@pytest.mark.asyncio
+async def test_create_webhook_rejects_invalid_url(client: AsyncClient, auth_headers):
+    response = await client.post("/api/v1/webhooks/", headers=auth_headers, json={"url": "not a url"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_webhook_rejects_non_public_hosts(client: AsyncClient, auth_headers):
+    for url in (
+        "http://127.0.0.1/hook",
+        "http://localhost:8000/hook",
+        "http://169.254.169.254/latest/meta-data/",
+        "https://intranet.example.com/hook",
+        "http://[::ffff:10.0.0.1]/hook",
+        "http://[::1]/hook",
+    ):
+        response = await client.post("/api/v1/webhooks/", headers=auth_headers, json={"url": url})
+        assert response.status_code == 422, url
+
+    assert (await client.get("/api/v1/webhooks/", headers=auth_headers)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_webhooks_are_tenant_scoped(client: AsyncClient, db_session, auth_headers):
+    other_tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name="Other Webhook Tenant"))
+    other_hook = await crud.webhook.create_with_tenant(
+        db_session, obj_in=WebhookCreate(url="https://example.com/other"), tenant_id=other_tenant.id
+    )
+
+    response = await client.delete(f"/api/v1/webhooks/{other_hook.id}", headers=auth_headers)
+    assert response.status_code == 404
+
+    response = await client.patch(f"/api/v1/webhooks/{other_hook.id}", headers=auth_headers, json={"is_active": False})
+    assert response.status_code == 404
@@ -2,9 +2,11 @@ import uuid
 
 import pytest
 from app import crud
+from app.models.product import Product
 from app.schemas.tenant import TenantCreate
 from app.schemas.product import ProductCreate
 from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -96,6 +98,7 @@ async def test_update_inventory(db_session, tenant, product):
     assert updated.current_stock == 99
     assert updated.min_stock == 15
     assert updated.product_id == product.id
+    assert updated.version == 2
 
 
 # 6. Test Delete
@@ -132,3 +135,79 @@ async def test_tenant_a_cannot_see_tenant_b_inventory(db_session, tenant, produc
     tenant_b_ids = {inv.id for inv in tenant_b_inventory}
     tenant_a_ids = {inv.id for inv in tenant_a_inventory}
     assert tenant_a_ids.isdisjoint(tenant_b_ids)
+
+
+# 8. Test Get Multi Rows by Tenant
+@pytest.mark.asyncio
+async def test_get_multi_rows_by_tenant(db_session, tenant, product):
+    inv_in = InventoryCreate(product_id=product.id, min_stock=4, current_stock=8)
+    inventory = await crud.inventory.create_with_tenant(db_session, obj_in=inv_in, tenant_id=tenant.id)
+
+    rows = await crud.inventory.get_multi_rows_by_tenant(
+        db_session, tenant_id=tenant.id, columns=("id", "current_stock")
+    )
+
+    assert {"id": inventory.id, "current_stock": 8} in rows
+    assert all(set(row) == {"id", "current_stock"} for row in rows)
+
+
+# 9. Test Change Log Coalescing
+@pytest.mark.asyncio
+async def test_get_changes_since_coalesces_per_item(db_session, tenant, product):
+    cursor = await crud.inventory.get_change_watermark(db_session)
+    await db_session.commit()
+
+    inv_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=10)
+    inventory = await crud.inventory.create_with_tenant(db_session, obj_in=inv_in, tenant_id=tenant.id)
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=7))
+    # Writes that leave stock untouched are not recorded
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=7))
+
+    rows, next_cursor, pending = await crud.inventory.get_changes_since(db_session, tenant_id=tenant.id, cursor=cursor)
+
+    assert [(row["id"], row["current_stock"], row["deleted"]) for row in rows] == [(inventory.id, 7, False)]
+    assert next_cursor > cursor
+    assert not pending
+
+    rows, _, _ = await crud.inventory.get_changes_since(db_session, tenant_id=tenant.id, cursor=next_cursor)
+    assert rows == []
+
+
+# 10. Test Summary Maintained by Triggers
+@pytest.mark.asyncio
+async def test_summary_tracks_inventory_writes(db_session, tenant):
+    prefix = f"SUM{uuid.uuid4().hex[:6]}".upper()
+
+    async def stock(suffix, min_stock, current_stock):
+        product_in = ProductCreate(name=suffix, sku=f"{prefix}-{suffix}-{uuid.uuid4().hex[:6]}")
+        product = await crud.product.create(db_session, obj_in=product_in)
+        inv_in = InventoryCreate(product_id=product.id, min_stock=min_stock, current_stock=current_stock)
+        return product, await crud.inventory.create_with_tenant(db_session, obj_in=inv_in, tenant_id=tenant.id)
+
+    async def counts():
+        summary = await crud.inventory.get_summary(db_session, tenant_id=tenant.id)
+        await db_session.commit()
+        return {
+            p.sku_prefix: (p.sku_count, p.total_units, p.low_stock_count, p.out_of_stock_count)
+            for p in summary["prefixes"]
+        }
+
+    _, healthy = await stock("A", 5, 50)
+    low_product, low = await stock("B", 5, 2)
+    await stock("C", 5, 0)
+    assert await counts() == {prefix: (3, 52, 2, 1)}
+
+    await crud.inventory.update(db_session, db_obj=low, obj_in=InventoryUpdate(current_stock=20))
+    await crud.inventory.update(db_session, db_obj=healthy, obj_in=InventoryUpdate(min_stock=60))
+    assert await counts() == {prefix: (3, 70, 2, 1)}
+
+    # Renaming a SKU moves its counts to the new prefix
+    await crud.product.update(db_session, db_obj=low_product, obj_in={"sku": f"{prefix}X-B"})
+    assert await counts() == {prefix: (2, 50, 2, 1), f"{prefix}X": (1, 20, 0, 0)}
+
+    # Deleting the product cascades to its inventory; empty prefixes disappear
+    await db_session.execute(delete(Product).where(Product.id == low_product.id))
+    await crud.inventory.remove(db_session, id=healthy.id)
+    summary = await crud.inventory.get_summary(db_session, tenant_id=tenant.id)
+    assert (summary["sku_count"], summary["total_units"], summary["low_stock_count"]) == (1, 0, 1)
+    assert [p.sku_prefix for p in summary["prefixes"]] == [prefix]
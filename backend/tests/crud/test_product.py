@@ -69,3 +69,18 @@ async def test_delete_product(db_session: AsyncSession):
 
     deleted_product = await crud.product.get(db_session, id=product.id)
     assert deleted_product is None
+
+
+@pytest.mark.asyncio
+async def test_delete_product_is_soft_until_purged(db_session: AsyncSession):
+    sku = "TEST-SOFT-DELETE-001"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name="Soft Delete", sku=sku))
+
+    removed = await crud.product.remove(db_session, id=product.id)
+
+    assert removed.deleted_at is not None
+    assert await crud.product.remove(db_session, id=product.id) is None
+    assert await crud.product.get_by_sku(db_session, sku=sku) is None
+    assert (await crud.product.get_by_sku(db_session, sku=sku, include_deleted=True)).id == product.id
+    rows = await crud.product.get_rows_by(db_session, column="sku", values=[sku], columns=("id",))
+    assert rows == {}
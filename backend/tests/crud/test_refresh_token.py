@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.security import hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def user(db_session: AsyncSession):
+    user_in = UserCreate(email=f"refresh-{uuid.uuid4().hex[:8]}@example.com", full_name="Refresh", password="pw")
+    return await crud.user.create(db_session, obj_in=user_in)
+
+
+@pytest.mark.asyncio
+async def test_rotate_issues_new_token_once(db_session: AsyncSession, user):
+    token = await crud.refresh_token.issue(db_session, user_id=user.id)
+
+    user_id, rotated = await crud.refresh_token.rotate(db_session, token=token)
+
+    assert user_id == user.id
+    assert rotated != token
+    stored = (await db_session.execute(select(RefreshToken).where(RefreshToken.user_id == user.id))).scalars().all()
+    assert {row.token_hash for row in stored} == {hash_refresh_token(token), hash_refresh_token(rotated)}
+    assert len({row.family_id for row in stored}) == 1
+    assert await crud.refresh_token.rotate(db_session, token=rotated) is not None
+
+
+@pytest.mark.asyncio
+async def test_reused_token_revokes_family(db_session: AsyncSession, user):
+    token = await crud.refresh_token.issue(db_session, user_id=user.id)
+    other_login = await crud.refresh_token.issue(db_session, user_id=user.id)
+    _, rotated = await crud.refresh_token.rotate(db_session, token=token)
+
+    # The old token turns up again: whoever holds `rotated` may be the attacker
+    assert await crud.refresh_token.rotate(db_session, token=token) is None
+    assert await crud.refresh_token.rotate(db_session, token=rotated) is None
+    assert await crud.refresh_token.rotate(db_session, token=other_login) is not None
+
+
+@pytest.mark.asyncio
+async def test_rotate_rejects_expired_unknown_and_inactive(db_session: AsyncSession, user):
+    expired = await crud.refresh_token.issue(db_session, user_id=user.id)
+    await db_session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(expired))
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    await db_session.commit()
+    active = await crud.refresh_token.issue(db_session, user_id=user.id)
+
+    assert await crud.refresh_token.rotate(db_session, token=expired) is None
+    assert await crud.refresh_token.rotate(db_session, token="not-a-token") is None
+
+    await db_session.refresh(user)
+    await crud.user.update(db_session, db_obj=user, obj_in={"is_active": False})
+    assert await crud.refresh_token.rotate(db_session, token=active) is None
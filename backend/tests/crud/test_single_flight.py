@@ -0,0 +1,111 @@
+import asyncio
+import uuid
+from contextlib import AsyncExitStack
+
+import pytest
+
+from app import crud
+from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+
+
+@pytest.fixture
+async def product(db_session):
+    sku = f"SF-{uuid.uuid4().hex[:8]}"
+    return await crud.product.create(db_session, obj_in=ProductCreate(name="Single Flight Product", sku=sku))
+
+
+@pytest.fixture
+async def sessions(test_session_factory):
+    async with AsyncExitStack() as stack:
+        yield [await stack.enter_async_context(test_session_factory()) for _ in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_one_query(sessions, product, query_budget):
+    with query_budget(1):
+        results = await asyncio.gather(*(crud.product.get(db, id=product.id) for db in sessions))
+
+    assert {result.id for result in results} == {product.id}
+    # Every caller gets its own instance, attached to its own session
+    assert len({id(result) for result in results}) == len(sessions)
+    assert all(result in db for result, db in zip(results, sessions))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sku_lookups_share_one_query(sessions, product, query_budget):
+    with query_budget(1):
+        results = await asyncio.gather(*(crud.product.get_by_sku(db, sku=product.sku) for db in sessions))
+
+    assert {result.id for result in results} == {product.id}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_query(sessions, query_budget):
+    missing = uuid.uuid4()
+    with query_budget(1):
+        results = await asyncio.gather(*(crud.product.get(db, id=missing) for db in sessions))
+
+    assert results == [None] * len(sessions)
+
+
+@pytest.mark.asyncio
+async def test_tenant_lookups_never_share_rows(db_session, sessions, product, query_budget):
+    items = {}
+    for name in ("A", "B"):
+        tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Single Flight {name}"))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=10)
+        items[tenant.id] = await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+    tenant_ids = list(items) * (len(sessions) // 2)
+
+    with query_budget(2):
+        results = await asyncio.gather(
+            *(
+                crud.inventory.get_by_product_and_tenant(db, product_id=product.id, tenant_id=tenant_id)
+                for db, tenant_id in zip(sessions, tenant_ids)
+            )
+        )
+
+    assert [result.id for result in results] == [items[tenant_id].id for tenant_id in tenant_ids]
+
+
+@pytest.mark.asyncio
+async def test_shared_result_can_be_updated(sessions, product):
+    leader, follower = await asyncio.gather(*(crud.product.get(db, id=product.id) for db in sessions[:2]))
+
+    updated = await crud.product.update(sessions[1], db_obj=follower, obj_in={"name": "Renamed"})
+
+    assert updated.name == "Renamed"
+    assert leader.name == "Single Flight Product"
+
+
+@pytest.mark.asyncio
+async def test_session_with_uncommitted_writes_reads_its_own(db_session, sessions, product):
+    writer = sessions[0]
+    item = await crud.product.get(writer, id=product.id)
+    item.name = "Uncommitted"
+    await writer.flush()
+
+    # The writer sees its own change even while another lookup is in flight
+    others, mine = await asyncio.gather(
+        crud.product.get(sessions[1], id=product.id), crud.product.get(writer, id=product.id)
+    )
+
+    assert mine.name == "Uncommitted"
+    assert others.name == "Single Flight Product"
+    await writer.rollback()
+
+
+@pytest.mark.asyncio
+async def test_inventory_update_after_shared_lookup(db_session, sessions, product):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name="Single Flight Update"))
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=10)
+    item = await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+    shared = await asyncio.gather(*(crud.inventory.get(db, id=item.id) for db in sessions[:3]))
+    for stock, (db, obj) in enumerate(zip(sessions, shared)):
+        await crud.inventory.update(db, db_obj=obj, obj_in=InventoryUpdate(current_stock=stock))
+
+    await db_session.refresh(item)
+    assert item.current_stock == 2
@@ -1,6 +1,7 @@
 import pytest
 from app import crud
 from app.schemas.tenant import TenantCreate, TenantUpdate
+from app.schemas.user import UserCreate
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -62,3 +63,18 @@ async def test_delete_tenant(db_session: AsyncSession):
 
     deleted_tenant = await crud.tenant.get(db_session, id=tenant.id)
     assert deleted_tenant is None
+
+
+@pytest.mark.asyncio
+async def test_delete_tenant_deactivates_users(db_session: AsyncSession):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name="Deactivated"))
+    user_in = UserCreate(
+        email="deactivated@example.com", full_name="Deactivated", password="password123", tenant_id=tenant.id
+    )
+    user = await crud.user.create(db_session, obj_in=user_in)
+
+    await crud.tenant.remove(db_session, id=tenant.id)
+
+    await db_session.refresh(user)
+    assert not user.is_active
+    assert tenant.id not in {listed.id for listed in await crud.tenant.get_multi(db_session, limit=1000)}
@@ -132,6 +132,36 @@ async def test_invite_user(db_session: AsyncSession, tenant):
     assert authed.id == user.id
 
 
+@pytest.mark.asyncio
+async def test_bulk_invite_users(db_session: AsyncSession, tenant, query_budget):
+    existing = await crud.user.create(
+        db_session, obj_in=UserCreate(email=_unique_email(), full_name="Existing", password="password123")
+    )
+    first, second = _unique_email(), _unique_email()
+    invites = [
+        UserInviteRequest(email=first, full_name="First"),
+        UserInviteRequest(email=existing.email, full_name="Taken"),
+        UserInviteRequest(email=second, full_name="Second"),
+        UserInviteRequest(email=first, full_name="Repeated"),
+    ]
+
+    # email lookup, then an insert and commit per chunk
+    with query_budget(5):
+        chunks = crud.user.bulk_invite(db_session, invites=invites, tenant_id=tenant.id, chunk_size=3)
+        results = [result async for chunk in chunks for result in chunk]
+
+    assert [(result["email"], result.get("error")) for result in results] == [
+        (first, None),
+        (existing.email, "User with this email already exists"),
+        (second, None),
+        (first, "Email listed more than once"),
+    ]
+    for result in (results[0], results[2]):
+        authed = await crud.user.authenticate(db_session, email=result["email"], password=result["temporary_password"])
+        assert authed.id == result["id"]
+        assert authed.tenant_id == tenant.id
+
+
 # ---------------------------------------------------------------------------
 # update
 # ---------------------------------------------------------------------------
@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import instrumentation
+from app.db.instrumentation import track_queries
+
+
+@pytest.fixture
+def captured_warnings(caplog):
+    with caplog.at_level(logging.WARNING, logger=instrumentation.log.name):
+        yield caplog
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_statements(db_session: AsyncSession):
+    with track_queries() as stats:
+        await db_session.execute(text("SELECT 1"))
+        await db_session.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.statements["SELECT 1"] == 1
+
+
+@pytest.mark.asyncio
+async def test_nested_trackers_both_record(db_session: AsyncSession):
+    with track_queries() as outer:
+        await db_session.execute(text("SELECT 1"))
+        with track_queries() as inner:
+            await db_session.execute(text("SELECT 2"))
+
+    assert outer.count == 2
+    assert inner.count == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_flagged_as_n_plus_one(db_session: AsyncSession, captured_warnings):
+    statement = "SELECT CAST(:value AS integer)"
+    with track_queries() as stats:
+        for value in range(settings.N_PLUS_ONE_THRESHOLD + 2):
+            await db_session.execute(text(statement), {"value": value})
+
+    assert len(stats.n_plus_one) == 1
+    flagged = [record for record in captured_warnings.records if "Possible N+1" in record.getMessage()]
+    assert len(flagged) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged_with_params_redacted(db_session: AsyncSession, captured_warnings, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+
+    await db_session.execute(text("SELECT CAST(:secret AS text)"), {"secret": "hunter2"})
+
+    messages = [record.getMessage() for record in captured_warnings.records if "Slow query" in record.getMessage()]
+    assert messages
+    assert "1 params redacted" in messages[-1]
+    assert "hunter2" not in messages[-1]
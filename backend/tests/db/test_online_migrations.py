@@ -0,0 +1,89 @@
+import time
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from alembic.util import load_python_file
+from sqlalchemy import exc, text
+
+# Registers the operations on `op`, as env.py does
+load_python_file(Path(__file__).parents[2] / "alembic", "online_ops.py")
+
+TABLE = "online_ops_items"
+ROWS = 5000
+
+
+@pytest.fixture
+async def migrate(test_engine):
+    """
+    Run `operations(op)` as a migration would, on a table of ROWS rows.
+    """
+    async with test_engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await conn.execute(text(f"CREATE TABLE {TABLE} (id serial PRIMARY KEY, sku text, qty int, qty_doubled int)"))
+        await conn.execute(
+            text(f"INSERT INTO {TABLE} (sku, qty) SELECT 'SKU-' || n, n FROM generate_series(1, {ROWS}) n")
+        )
+
+    async def run(operations):
+        def upgrade(connection):
+            context = MigrationContext.configure(connection)
+            with context.begin_transaction():
+                return operations(Operations(context))
+
+        async with test_engine.connect() as conn:
+            return await conn.run_sync(upgrade)
+
+    yield run
+
+    async with test_engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+async def _scalar(migrate, sql):
+    return await migrate(lambda op: op.get_bind().scalar(text(sql)))
+
+
+@pytest.mark.asyncio
+async def test_create_index_concurrently_rebuilds_invalid_index(migrate):
+    valid = f"SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass('ix_{TABLE}_sku')"
+    await migrate(lambda op: op.execute(f"INSERT INTO {TABLE} (sku, qty) VALUES ('SKU-1', 0)"))
+
+    # A duplicate fails the unique build and leaves an invalid index behind
+    with pytest.raises(exc.IntegrityError):
+        await migrate(lambda op: op.create_index_concurrently(f"ix_{TABLE}_sku", TABLE, ["sku"], unique=True))
+    assert await _scalar(migrate, valid) is False
+
+    await migrate(lambda op: op.execute(f"DELETE FROM {TABLE} WHERE qty = 0"))
+    await migrate(lambda op: op.create_index_concurrently(f"ix_{TABLE}_sku", TABLE, ["sku"], unique=True))
+    assert await _scalar(migrate, valid) is True
+
+    await migrate(lambda op: op.drop_index_concurrently(f"ix_{TABLE}_sku"))
+    assert await _scalar(migrate, valid) is None
+
+
+@pytest.mark.asyncio
+async def test_backfill_commits_batches_and_resumes(migrate, monkeypatch):
+    def backfill(op):
+        return op.backfill(TABLE, {"qty_doubled": "qty * 2"}, where="qty_doubled IS NULL", batch_size=1000, pause_ms=0)
+
+    batches = []
+
+    class Interrupted(Exception):
+        pass
+
+    def interrupt(seconds):
+        batches.append(seconds)
+        if len(batches) == 2:
+            raise Interrupted
+
+    monkeypatch.setattr(time, "sleep", interrupt)
+    with pytest.raises(Interrupted):
+        await migrate(backfill)
+    # The batches before the interruption are committed
+    assert await _scalar(migrate, f"SELECT count(qty_doubled) FROM {TABLE}") == 2000
+
+    monkeypatch.undo()
+    assert await migrate(backfill) == ROWS - 2000
+    assert await _scalar(migrate, f"SELECT count(*) FROM {TABLE} WHERE qty_doubled IS DISTINCT FROM qty * 2") == 0
@@ -0,0 +1,76 @@
+import io
+import uuid
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pytest
+
+from app import crud
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.export import EXPORT_COLUMNS, ExportColumnError, export_inventory, resolve_columns
+
+
+def test_resolve_columns():
+    assert resolve_columns(None) == list(EXPORT_COLUMNS)
+    assert resolve_columns(" sku, current_stock,sku") == ["sku", "current_stock"]
+    with pytest.raises(ExportColumnError, match="price"):
+        resolve_columns("sku,price")
+
+
+@pytest.fixture
+async def stocked_tenant(db_session):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Export {uuid.uuid4().hex[:8]}"))
+    items = []
+    for current_stock in range(5):
+        sku = f"EXP-{uuid.uuid4().hex[:8]}"
+        product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=2, current_stock=current_stock)
+        item = await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+        items.append({"id": str(item.id), "sku": sku, "current_stock": current_stock})
+    return tenant, items
+
+
+async def _export(db, **kwargs) -> list:
+    return [chunk async for chunk in export_inventory(db, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_export_arrow_stream_in_batches(db_session, stocked_tenant):
+    tenant, items = stocked_tenant
+
+    chunks = await _export(
+        db_session, fmt="arrow", columns=["id", "sku", "current_stock"], tenant_id=tenant.id, batch_size=2
+    )
+
+    reader = ipc.open_stream(b"".join(chunks))
+    assert reader.schema.names == ["id", "sku", "current_stock"]
+    batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    rows = pa.Table.from_batches(batches).to_pylist()
+    assert sorted(rows, key=lambda row: row["current_stock"]) == items
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_row_group_per_batch(db_session, stocked_tenant):
+    tenant, _ = stocked_tenant
+
+    chunks = await _export(db_session, fmt="parquet", columns=list(EXPORT_COLUMNS), tenant_id=tenant.id, batch_size=3)
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.schema.field("updated_at").type == pa.timestamp("us", tz="UTC")
+    assert set(table.column("tenant_id").to_pylist()) == {str(tenant.id)}
+    assert sorted(table.column("current_stock").to_pylist()) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_export_empty_tenant_has_schema(db_session):
+    chunks = await _export(db_session, fmt="arrow", columns=["sku"], tenant_id=uuid.uuid4())
+
+    reader = ipc.open_stream(b"".join(chunks))
+    assert reader.schema.names == ["sku"]
+    assert reader.read_all().num_rows == 0
@@ -0,0 +1,117 @@
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+
+from app import crud
+from app.models.inventory_consumption import InventoryConsumption
+from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.forecast import (
+    ForecastCache,
+    demand_matrix,
+    exponential_smoothing,
+    get_tenant_forecast,
+    moving_average,
+    project_stockout,
+)
+
+TODAY = date(2026, 3, 10)
+
+
+def test_demand_matrix_places_days_oldest_first():
+    matrix = demand_matrix(np.array([0, 0, 1, 0]), np.array([1, 3, 2, 1]), np.array([2.0, 5.0, 4.0, 1.0]), 2, 3)
+
+    assert matrix.tolist() == [[5.0, 0.0, 3.0], [0.0, 4.0, 0.0]]
+
+
+def test_moving_average_and_smoothing():
+    matrix = np.array([[0.0, 0.0, 6.0, 6.0], [4.0, 4.0, 4.0, 4.0]])
+
+    assert moving_average(matrix, 2).tolist() == [6.0, 4.0]
+    smoothed = exponential_smoothing(matrix, 0.5)
+    # Recent days weigh more; a flat series stays flat
+    assert 3.0 < smoothed[0] < 6.0
+    assert smoothed[1] == pytest.approx(4.0)
+
+
+def test_project_stockout():
+    days = project_stockout(np.array([10.0, 10.0, 0.0]), np.array([4.0, 0.0, 1.0]))
+
+    assert days.tolist() == [2.5, np.inf, 0.0]
+
+
+@pytest.fixture
+async def stocked_tenant(db_session):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Forecast {uuid.uuid4().hex[:8]}"))
+    items = []
+    for current_stock in (100, 30, 50):
+        sku = f"FC-{uuid.uuid4().hex[:8]}"
+        product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=5, current_stock=current_stock)
+        items.append(await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id))
+    return tenant, items
+
+
+async def _consume(db, item, days):
+    await db.execute(
+        insert(InventoryConsumption),
+        [
+            {"inventory_id": item.id, "tenant_id": item.tenant_id, "day": TODAY - timedelta(days=age), "quantity": q}
+            for age, q in days.items()
+        ],
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_forecast_orders_by_stockout(db_session, stocked_tenant):
+    tenant, (steady, fast, idle) = stocked_tenant
+    await _consume(db_session, steady, {age: 5 for age in range(1, 29)})
+    await _consume(db_session, fast, {age: 10 for age in range(1, 29)})
+    # Consumption from today (incomplete) and before the window is ignored
+    await _consume(db_session, idle, {0: 40, 100: 40})
+
+    rows = await get_tenant_forecast(db_session, tenant_id=tenant.id, cache=ForecastCache(4), today=TODAY)
+
+    assert [row["id"] for row in rows] == [fast.id, steady.id, idle.id]
+    assert rows[0]["daily_demand"] == 10.0
+    assert rows[0]["days_until_stockout"] == 3.0
+    assert rows[0]["stockout_date"] == date(2026, 3, 13)
+    assert rows[0]["suggested_min_stock"] == 30
+    assert rows[1]["days_until_stockout"] == 20.0
+    assert rows[2]["daily_demand"] == 0.0
+    assert rows[2]["days_until_stockout"] is None
+    assert rows[2]["stockout_date"] is None
+
+
+@pytest.mark.asyncio
+async def test_stock_decreases_are_recorded_per_day(db_session, stocked_tenant):
+    tenant, (item, *_) = stocked_tenant
+    for stock in (90, 95, 70):
+        await crud.inventory.update(db_session, db_obj=item, obj_in=InventoryUpdate(current_stock=stock))
+
+    # Counted as yesterday's consumption when forecasting from tomorrow
+    tomorrow = date.today() + timedelta(days=1)
+    history = await crud.inventory.get_consumption_history(db_session, tenant_id=tenant.id, until=tomorrow, days=1)
+
+    consumed = {id_: q for id_, q in zip(history["id"], history["quantities"]) if q is not None}
+    assert consumed == {item.id: [35]}
+
+
+@pytest.mark.asyncio
+async def test_forecast_cached_until_inventory_changes(db_session, stocked_tenant):
+    tenant, (item, *_) = stocked_tenant
+    cache = ForecastCache(4)
+
+    first = await get_tenant_forecast(db_session, tenant_id=tenant.id, cache=cache, today=TODAY)
+    assert await get_tenant_forecast(db_session, tenant_id=tenant.id, cache=cache, today=TODAY) is first
+
+    await crud.inventory.update(db_session, db_obj=item, obj_in=InventoryUpdate(current_stock=1))
+    refreshed = await get_tenant_forecast(db_session, tenant_id=tenant.id, cache=cache, today=TODAY)
+
+    assert refreshed is not first
+    assert {row["id"]: row["current_stock"] for row in refreshed}[item.id] == 1
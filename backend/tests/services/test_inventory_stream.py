@@ -0,0 +1,129 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from sqlalchemy import func, select
+
+from app import crud
+from app.core.config import settings
+from app.models.inventory_change import InventoryChange
+from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.inventory_stream import InventoryChangeHub, inventory_change_events
+
+
+@pytest.fixture
+async def inventory(db_session):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name="Stream Tenant"))
+    product = await crud.product.create(
+        db_session, obj_in=ProductCreate(name="Stream Product", sku=f"STR-{uuid.uuid4().hex[:8]}")
+    )
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=10)
+    return await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+
+@pytest.fixture
+def hub(test_engine):
+    return InventoryChangeHub(test_engine.url.render_as_string(hide_password=False))
+
+
+@pytest.fixture(autouse=True)
+def fast_stream(monkeypatch):
+    monkeypatch.setattr(settings, "INVENTORY_STREAM_COALESCE_MS", 20)
+    monkeypatch.setattr(settings, "INVENTORY_STREAM_HEARTBEAT_SECONDS", 1)
+
+
+def _parse(message: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in message.decode().strip().splitlines() if not line.startswith(":"))
+    return {"event": fields.get("event"), "id": fields.get("id"), "data": orjson.loads(fields.get("data", "null"))}
+
+
+async def _next_event(stream, name: str) -> dict:
+    while True:
+        message = await asyncio.wait_for(anext(stream), timeout=5)
+        if not message.startswith(b":") and (event := _parse(message))["event"] == name:
+            return event
+
+
+@pytest.mark.asyncio
+async def test_notify_wakes_tenant_subscribers(db_session, hub, inventory):
+    async with hub.subscribe(inventory.tenant_id) as wakeup, hub.subscribe(uuid.uuid4()) as other_tenant:
+        # The listener wakes everyone once LISTEN is active
+        await asyncio.wait_for(wakeup.wait(), timeout=5)
+        wakeup.clear()
+        other_tenant.clear()
+
+        await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=3))
+
+        await asyncio.wait_for(wakeup.wait(), timeout=5)
+        assert not other_tenant.is_set()
+
+
+@pytest.mark.asyncio
+async def test_stream_delivers_coalesced_changes(db_session, hub, inventory):
+    inventory_id = str(inventory.id)
+    stream = inventory_change_events(db_session, tenant_id=inventory.tenant_id, cursor=None, hub=hub)
+    try:
+        ready = await _next_event(stream, "ready")
+
+        await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=4))
+        await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=2))
+
+        changes = await _next_event(stream, "inventory")
+        while changes["data"][-1]["current_stock"] != 2:
+            changes = await _next_event(stream, "inventory")
+    finally:
+        await stream.aclose()
+
+    assert [item["id"] for item in changes["data"]] == [inventory_id]
+    assert int(changes["id"]) > int(ready["id"])
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_from_cursor(db_session, hub, inventory):
+    cursor = await crud.inventory.get_change_watermark(db_session)
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=9))
+
+    stream = inventory_change_events(db_session, tenant_id=inventory.tenant_id, cursor=cursor, hub=hub)
+    try:
+        changes = await _next_event(stream, "inventory")
+    finally:
+        await stream.aclose()
+
+    assert changes["data"][0]["current_stock"] == 9
+
+
+@pytest.mark.asyncio
+async def test_stream_resets_when_cursor_was_pruned(db_session, hub, inventory):
+    cursor = await crud.inventory.get_change_watermark(db_session)
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=6))
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=5))
+    await crud.inventory.prune_changes(db_session, older_than=datetime.now(timezone.utc) + timedelta(seconds=1))
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=8))
+
+    stream = inventory_change_events(db_session, tenant_id=inventory.tenant_id, cursor=cursor, hub=hub)
+    try:
+        first = _parse(await anext(stream))
+    finally:
+        await stream.aclose()
+
+    assert first["event"] == "reset"
+
+
+@pytest.mark.asyncio
+async def test_stream_resets_when_every_change_was_pruned(db_session, hub, inventory):
+    cursor = await crud.inventory.get_change_watermark(db_session)
+    await crud.inventory.update(db_session, db_obj=inventory, obj_in=InventoryUpdate(current_stock=6))
+    await crud.inventory.prune_changes(db_session, older_than=datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert await db_session.scalar(select(func.count()).select_from(InventoryChange)) == 0
+
+    stream = inventory_change_events(db_session, tenant_id=inventory.tenant_id, cursor=cursor, hub=hub)
+    try:
+        first = _parse(await anext(stream))
+    finally:
+        await stream.aclose()
+
+    assert first["event"] == "reset"
@@ -0,0 +1,63 @@
+import pytest
+
+from app.services.product_import import (
+    CSV_CONTENT_TYPE,
+    NDJSON_CONTENT_TYPE,
+    ProductImportFormatError,
+    ProductImportParser,
+    iter_lines,
+)
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(parser: ProductImportParser, data: bytes, size: int = 3) -> list:
+    return [row async for row in parser.rows(_chunks(data, size))]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_split_multibyte_chars():
+    data = "\ufeffsku,name\r\nCAFÉ-1,Café\nlast".encode("utf-8")
+
+    lines = [line async for line in iter_lines(_chunks(data, 1))]
+
+    assert lines == ["sku,name", "CAFÉ-1,Café", "last"]
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_and_rejections():
+    parser = ProductImportParser(CSV_CONTENT_TYPE)
+    data = b'name,sku\n"Desk, Standing",FURN-SD01\n\n  ,EMPTY\n'
+
+    rows = await _collect(parser, data)
+
+    assert rows == [(2, "FURN-SD01", "Desk, Standing", None)]
+    assert parser.rejected == 1
+    assert parser.errors[0].line == 4
+
+
+@pytest.mark.asyncio
+async def test_ndjson_rows():
+    parser = ProductImportParser(NDJSON_CONTENT_TYPE)
+    data = b'{"sku": "A", "name": "Alpha", "description": "first"}\n[1, 2]\n'
+
+    rows = await _collect(parser, data)
+
+    assert rows == [(1, "A", "Alpha", "first")]
+    assert parser.errors[0].detail == "Expected a JSON object"
+
+
+@pytest.mark.asyncio
+async def test_csv_without_required_header_fails():
+    parser = ProductImportParser(CSV_CONTENT_TYPE)
+
+    with pytest.raises(ProductImportFormatError):
+        await _collect(parser, b"code,title\nA,B\n")
+
+
+def test_unsupported_content_type():
+    with pytest.raises(ProductImportFormatError):
+        ProductImportParser("application/xml")
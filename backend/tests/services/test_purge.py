@@ -0,0 +1,98 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud
+from app.models.inventory import Inventory
+from app.models.product import Product
+from app.models.purge_job import PurgeJob
+from app.models.tenant import Tenant
+from app.models.user import User
+from app.models.webhook import Webhook
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.schemas.user import UserCreate
+from app.schemas.webhook import WebhookCreate
+from app.services.purge import Purger
+
+
+async def _count(db, model, *criteria) -> int:
+    return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+
+async def _job(db, entity_id) -> PurgeJob:
+    db.expire_all()
+    return (await db.execute(select(PurgeJob).where(PurgeJob.entity_id == entity_id))).scalars().one()
+
+
+@pytest.fixture
+def purger(test_session_factory):
+    return Purger(session_factory=test_session_factory, batch_size=2, pause_ms=0)
+
+
+@pytest.mark.asyncio
+async def test_purge_product_removes_inventory_in_batches(db_session, purger):
+    sku = f"PURGE-{uuid.uuid4().hex[:8]}"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+    for _ in range(3):
+        tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Purge {uuid.uuid4().hex[:8]}"))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=5)
+        await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+    product_id = product.id
+    await crud.product.remove(db_session, id=product_id)
+
+    # Hidden at once, removed only by the purge
+    assert await crud.product.get(db_session, id=product_id) is None
+    assert await _count(db_session, Inventory, Inventory.product_id == product_id) == 3
+    assert (await _job(db_session, product_id)).finished_at is None
+
+    assert await purger.run() >= 1
+
+    job = await _job(db_session, product_id)
+    assert job.finished_at is not None
+    assert job.rows_deleted == 4
+    assert await _count(db_session, Inventory, Inventory.product_id == product_id) == 0
+    assert await _count(db_session, Product, Product.id == product_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_tenant_removes_users_and_data(db_session, purger):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Purge {uuid.uuid4().hex[:8]}"))
+    user_in = UserCreate(
+        email=f"purge-{uuid.uuid4().hex[:8]}@example.com",
+        full_name="Purged",
+        password="password123",
+        tenant_id=tenant.id,
+    )
+    user = await crud.user.create(db_session, obj_in=user_in)
+    await crud.webhook.create_with_tenant(
+        db_session, obj_in=WebhookCreate(url="https://example.com/hook"), tenant_id=tenant.id
+    )
+    for _ in range(3):
+        sku = f"PURGE-{uuid.uuid4().hex[:8]}"
+        product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=5)
+        await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+    tenant_id = tenant.id
+    await crud.tenant.remove(db_session, id=tenant_id)
+
+    await db_session.refresh(user)
+    assert not user.is_active
+
+    await purger.run()
+
+    assert (await _job(db_session, tenant_id)).rows_deleted == 6
+    for model, column in ((Inventory, Inventory.tenant_id), (User, User.tenant_id), (Webhook, Webhook.tenant_id)):
+        assert await _count(db_session, model, column == tenant_id) == 0
+    assert await _count(db_session, Tenant, Tenant.id == tenant_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_skips_while_another_runs(db_session, purger):
+    assert await crud.purge_job.try_lock(db_session)
+
+    assert await purger.run() is None
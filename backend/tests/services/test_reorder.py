@@ -0,0 +1,152 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app import crud
+from app.models.reorder_run import ReorderRun
+from app.models.supply_order import SUPPLY_ORDER_FAILED, SUPPLY_ORDER_PENDING, SUPPLY_ORDER_PLACED, SupplyOrder
+from app.schemas.inventory import InventoryCreate, SupplyResponse
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.reorder import ReorderEngine
+
+
+class FakeSupplier:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    async def request_restock_batch(self, tenant_name, lines, reference):
+        self.calls.append((tenant_name, {line.product_sku: line.quantity for line in lines}, reference))
+        if self.fail:
+            raise RuntimeError("supplier down")
+        return SupplyResponse(status="success", message="ok", external_reference_id=f"EXT-{reference}")
+
+    def calls_for(self, tenant_name: str) -> list:
+        return [call for call in self.calls if call[0] == tenant_name]
+
+
+@pytest.fixture(autouse=True)
+async def no_unfinished_runs(db_session):
+    # Other tests' data shares the database; start every test with a fresh sweep
+    await db_session.execute(
+        update(ReorderRun).where(ReorderRun.finished_at.is_(None)).values(finished_at=datetime.now(timezone.utc))
+    )
+    await db_session.commit()
+
+
+@pytest.fixture
+async def stock(db_session):
+    """
+    Create a tenant stocking the given (min, current, target) levels; returns (tenant, {sku: inventory}).
+    """
+
+    async def _stock(*levels):
+        tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Reorder {uuid.uuid4().hex[:8]}"))
+        items = {}
+        for min_stock, current_stock, target_stock in levels:
+            sku = f"RO-{uuid.uuid4().hex[:8]}"
+            product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+            inventory_in = InventoryCreate(
+                product_id=product.id, min_stock=min_stock, current_stock=current_stock, target_stock=target_stock
+            )
+            items[sku] = await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+        return tenant, items
+
+    return _stock
+
+
+async def _orders(db_session, tenant_id) -> list:
+    result = await db_session.execute(select(SupplyOrder).where(SupplyOrder.tenant_id == tenant_id))
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_reorders_low_stock_up_to_target(db_session, test_session_factory, stock):
+    tenant, items = await stock((10, 2, None), (10, 3, 30), (5, 10, None))
+    default_target, explicit_target, healthy = items
+    supplier = FakeSupplier()
+
+    summary = await ReorderEngine(supplier, session_factory=test_session_factory).run()
+
+    [(_, lines, reference)] = supplier.calls_for(tenant.name)
+    assert lines == {default_target: 18, explicit_target: 27}
+    assert summary.failed == 0
+    orders = await _orders(db_session, tenant.id)
+    assert {order.status for order in orders} == {SUPPLY_ORDER_PLACED}
+    assert {order.external_reference_id for order in orders} == {f"EXT-{reference}"}
+
+
+@pytest.mark.asyncio
+async def test_open_orders_are_subtracted(db_session, test_session_factory, stock):
+    tenant, items = await stock((10, 5, None))
+    [inventory] = items.values()
+    await crud.supply_order.record_placed(db_session, inventory=inventory, quantity=15, external_reference_id="MANUAL")
+    supplier = FakeSupplier()
+
+    await ReorderEngine(supplier, session_factory=test_session_factory).run()
+
+    assert supplier.calls_for(tenant.name) == []
+
+
+@pytest.mark.asyncio
+async def test_second_sweep_does_not_reorder(test_session_factory, stock):
+    tenant, _ = await stock((10, 2, None))
+    supplier = FakeSupplier()
+
+    await ReorderEngine(supplier, session_factory=test_session_factory).run()
+    await ReorderEngine(supplier, session_factory=test_session_factory).run()
+
+    assert len(supplier.calls_for(tenant.name)) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_orders_are_retried_next_sweep(db_session, test_session_factory, stock):
+    tenant, _ = await stock((10, 2, None))
+
+    summary = await ReorderEngine(FakeSupplier(fail=True), session_factory=test_session_factory).run()
+    assert summary.failed >= 1
+    assert {order.status for order in await _orders(db_session, tenant.id)} == {SUPPLY_ORDER_FAILED}
+
+    supplier = FakeSupplier()
+    await ReorderEngine(supplier, session_factory=test_session_factory).run()
+    assert len(supplier.calls_for(tenant.name)) == 1
+
+
+@pytest.mark.asyncio
+async def test_resumes_interrupted_run(db_session, test_session_factory, stock):
+    tenant, items = await stock((10, 2, None), (10, 4, None))
+    first, second = sorted(items.values(), key=lambda inventory: inventory.id)
+    # A crashed run: the first row's order was recorded but never sent, cursor just past it
+    db_session.add(
+        SupplyOrder(
+            tenant_id=tenant.id,
+            inventory_id=first.id,
+            quantity=18,
+            status=SUPPLY_ORDER_PENDING,
+            reference="crashed",
+        )
+    )
+    db_session.add(ReorderRun(cursor_tenant_id=tenant.id, cursor_inventory_id=first.id, lines=1, orders=1))
+    await db_session.commit()
+    supplier = FakeSupplier()
+
+    await ReorderEngine(supplier, session_factory=test_session_factory).run()
+
+    calls = supplier.calls_for(tenant.name)
+    assert sorted(reference == "crashed" for _, _, reference in calls) == [False, True]
+    resumed = next(lines for _, lines, reference in calls if reference != "crashed")
+    assert list(resumed.values()) == [20 - second.current_stock]
+    assert {order.status for order in await _orders(db_session, tenant.id)} == {SUPPLY_ORDER_PLACED}
+
+
+@pytest.mark.asyncio
+async def test_sweeps_do_not_overlap(test_session_factory):
+    async with test_session_factory() as other_sweep:
+        assert await crud.reorder_run.try_lock(other_sweep)
+
+        assert await ReorderEngine(FakeSupplier(), session_factory=test_session_factory).run() is None
+
+        await other_sweep.rollback()
@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import crud
+from app.models.reservation import Reservation
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+from app.schemas.reservation import ReservationCreate
+from app.schemas.tenant import TenantCreate
+from app.services.reservations import ReservationSweeper
+
+
+@pytest.fixture
+async def item(db_session):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Hold {uuid.uuid4().hex[:8]}"))
+    sku = f"HOLD-{uuid.uuid4().hex[:8]}"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=2, current_stock=10)
+    return await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+
+
+async def _availability(db, item):
+    return await crud.inventory.get_availability(db, id=item.id, tenant_id=item.tenant_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_oversell(db_session, test_session_factory, item):
+    async def reserve():
+        async with test_session_factory() as db:
+            obj_in = ReservationCreate(inventory_id=item.id, quantity=3)
+            return await crud.reservation.reserve(db, obj_in=obj_in, tenant_id=item.tenant_id)
+
+    results = await asyncio.gather(*(reserve() for _ in range(8)))
+
+    held = [result for result in results if result is not None]
+    assert len(held) == 3
+    assert sorted(result["available_stock"] for result in held) == [1, 4, 7]
+    assert await _availability(db_session, item) == {
+        "id": item.id,
+        "current_stock": 10,
+        "reserved_stock": 9,
+        "available_stock": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_commit_and_release(db_session, item):
+    first, second = [
+        await crud.reservation.reserve(
+            db_session, obj_in=ReservationCreate(inventory_id=item.id, quantity=4), tenant_id=item.tenant_id
+        )
+        for _ in range(2)
+    ]
+
+    reservation, committed, was_low = await crud.reservation.commit(
+        db_session, id=first["id"], tenant_id=item.tenant_id
+    )
+    assert reservation["available_stock"] == 2
+    assert (committed.current_stock, committed.reserved_stock, committed.version) == (6, 4, 2)
+    assert was_low is False
+    # Each reservation ends once
+    assert await crud.reservation.commit(db_session, id=first["id"], tenant_id=item.tenant_id) is None
+    assert await crud.reservation.release(db_session, id=second["id"], tenant_id=uuid.uuid4()) is None
+
+    released = await crud.reservation.release(db_session, id=second["id"], tenant_id=item.tenant_id)
+    assert released["available_stock"] == 6
+    assert (await _availability(db_session, item))["reserved_stock"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sweeper_expires_due_holds_in_batches(db_session, test_session_factory, item):
+    holds = [
+        await crud.reservation.reserve(
+            db_session, obj_in=ReservationCreate(inventory_id=item.id, quantity=2), tenant_id=item.tenant_id
+        )
+        for _ in range(4)
+    ]
+    past = datetime.now(timezone.utc) - timedelta(minutes=1)
+    await db_session.execute(
+        update(Reservation).where(Reservation.id.in_([hold["id"] for hold in holds[:3]])).values(expires_at=past)
+    )
+    await db_session.commit()
+
+    # Expired holds still count until swept, but can no longer be committed
+    assert (await _availability(db_session, item))["available_stock"] == 2
+    assert await crud.reservation.commit(db_session, id=holds[0]["id"], tenant_id=item.tenant_id) is None
+
+    expired = await ReservationSweeper(session_factory=test_session_factory, batch_size=2).run()
+
+    assert expired >= 3
+    assert (await _availability(db_session, item))["available_stock"] == 8
+    remaining = select(func.count()).select_from(Reservation).where(Reservation.inventory_id == item.id)
+    assert await db_session.scalar(remaining) == 1
@@ -0,0 +1,45 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import crud
+from app.core.config import settings
+from app.models.inventory_change import InventoryChange
+from app.models.inventory_consumption import InventoryConsumption
+from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.schemas.product import ProductCreate
+from app.schemas.tenant import TenantCreate
+from app.services.retention import LogPruner
+
+
+@pytest.mark.asyncio
+async def test_pruner_deletes_only_rows_past_retention(db_session, test_session_factory):
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Prune {uuid.uuid4().hex[:8]}"))
+    sku = f"PRUNE-{uuid.uuid4().hex[:8]}"
+    product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+    inventory_in = InventoryCreate(product_id=product.id, min_stock=1, current_stock=10)
+    item = await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id)
+    await crud.inventory.update(db_session, db_obj=item, obj_in=InventoryUpdate(current_stock=7))
+
+    # Age the item's first change and move its consumption back past the forecast's history
+    stale = datetime.now(timezone.utc) - timedelta(hours=settings.INVENTORY_CHANGES_RETENTION_HOURS + 1)
+    first = select(func.min(InventoryChange.id)).where(InventoryChange.inventory_id == item.id).scalar_subquery()
+    await db_session.execute(update(InventoryChange).where(InventoryChange.id == first).values(changed_at=stale))
+    await db_session.execute(
+        update(InventoryConsumption)
+        .where(InventoryConsumption.inventory_id == item.id)
+        .values(day=date.today() - timedelta(days=settings.FORECAST_HISTORY_DAYS + 1))
+    )
+    await db_session.commit()
+
+    # Nobody is subscribed to a change stream
+    assert await LogPruner(session_factory=test_session_factory).run() >= 2
+
+    changes = select(func.count()).select_from(InventoryChange).where(InventoryChange.inventory_id == item.id)
+    assert await db_session.scalar(changes) == 1
+    consumed = (
+        select(func.count()).select_from(InventoryConsumption).where(InventoryConsumption.inventory_id == item.id)
+    )
+    assert await db_session.scalar(consumed) == 0
@@ -0,0 +1,191 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, func, select, update
+
+from app import crud
+from app.db.shards import DEFAULT_SHARD, UnknownShardError
+from app.models.inventory import Inventory
+from app.models.inventory_change import InventoryChange
+from app.models.inventory_consumption import InventoryConsumption
+from app.models.inventory_summary import InventorySummary
+from app.models.product import Product
+from app.models.reservation import Reservation
+from app.models.supply_order import SupplyOrder
+from app.models.tenant import Tenant
+from app.schemas.inventory import InventoryCreate
+from app.schemas.product import ProductCreate
+from app.schemas.reservation import ReservationCreate
+from app.schemas.tenant import TenantCreate
+from app.services.tenant_move import TenantMoveError, TenantMover
+
+
+async def _count(db, model, *criteria) -> int:
+    return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+
+@pytest.fixture
+def mover():
+    return TenantMover(batch_size=2, pause_ms=0)
+
+
+@pytest.fixture
+async def stocked_tenant(db_session):
+    """
+    A tenant with three items, one with consumption and one with a supply order.
+    """
+    tenant = await crud.tenant.create(db_session, obj_in=TenantCreate(name=f"Move {uuid.uuid4().hex[:8]}"))
+    items = []
+    for _ in range(3):
+        sku = f"MOVE-{uuid.uuid4().hex[:8]}"
+        product = await crud.product.create(db_session, obj_in=ProductCreate(name=sku, sku=sku))
+        inventory_in = InventoryCreate(product_id=product.id, min_stock=5, current_stock=10)
+        items.append(await crud.inventory.create_with_tenant(db_session, obj_in=inventory_in, tenant_id=tenant.id))
+    await crud.inventory.update(db_session, db_obj=items[0], obj_in={"current_stock": 4})
+    await crud.supply_order.record_placed(db_session, inventory=items[0], quantity=6, external_reference_id="ext-1")
+    return tenant.id, [item.id for item in items]
+
+
+@pytest.mark.asyncio
+async def test_move_copies_tenant_and_cleans_up_source(
+    db_session, sharded, shard_session_factory, mover, stocked_tenant
+):
+    tenant_id, item_ids = stocked_tenant
+
+    summary = await mover.move(tenant_id, sharded)
+
+    assert (summary.source, summary.target) == (DEFAULT_SHARD, sharded)
+    # Today's consumption rows are copied again by every catch-up round
+    assert summary.rows_copied >= 5
+    assert summary.rows_deleted == 5
+    assert await crud.tenant.get_shard(db_session, tenant_id=tenant_id) == sharded
+    for model in (Inventory, SupplyOrder, InventoryConsumption, InventorySummary):
+        assert await _count(db_session, model, model.tenant_id == tenant_id) == 0
+
+    async with shard_session_factory() as shard_db:
+        assert set(await shard_db.scalars(select(Inventory.id).where(Inventory.tenant_id == tenant_id))) == set(
+            item_ids
+        )
+        assert await shard_db.scalar(select(SupplyOrder.quantity).where(SupplyOrder.tenant_id == tenant_id)) == 6
+        consumed = select(InventoryConsumption.quantity).where(InventoryConsumption.tenant_id == tenant_id)
+        assert await shard_db.scalar(consumed) == 6
+        # Summaries are rebuilt by the triggers; the copy itself is not logged as changes
+        assert (
+            await shard_db.scalar(
+                select(func.sum(InventorySummary.sku_count)).where(InventorySummary.tenant_id == tenant_id)
+            )
+            == 3
+        )
+        assert await _count(shard_db, InventoryChange, InventoryChange.tenant_id == tenant_id) == 0
+        assert await shard_db.scalar(select(Tenant.shard).where(Tenant.id == tenant_id)) == sharded
+
+    # And back again: the shard's reference copy of the tenant goes with its data
+    await mover.move(tenant_id, DEFAULT_SHARD)
+
+    assert await _count(db_session, Inventory, Inventory.tenant_id == tenant_id) == 3
+    async with shard_session_factory() as shard_db:
+        assert await _count(shard_db, Inventory, Inventory.tenant_id == tenant_id) == 0
+        assert await _count(shard_db, Tenant, Tenant.id == tenant_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_move_catches_up_with_writes_made_while_copying(
+    db_session, test_session_factory, sharded, shard_session_factory, mover, stocked_tenant, monkeypatch
+):
+    tenant_id, item_ids = stocked_tenant
+    copy_round = TenantMover._copy_round
+    rounds = []
+
+    async def write_after_first_round(self, *args, **kwargs):
+        result = await copy_round(self, *args, **kwargs)
+        if not rounds:
+            async with test_session_factory() as db:
+                await db.execute(update(Inventory).where(Inventory.id == item_ids[1]).values(current_stock=1))
+                await db.commit()
+        rounds.append(result)
+        return result
+
+    monkeypatch.setattr(TenantMover, "_copy_round", write_after_first_round)
+    await mover.move(tenant_id, sharded)
+
+    assert len(rounds) >= 2
+    async with shard_session_factory() as shard_db:
+        assert await shard_db.scalar(select(Inventory.current_stock).where(Inventory.id == item_ids[1])) == 1
+        consumed = select(InventoryConsumption.quantity).where(InventoryConsumption.inventory_id == item_ids[1])
+        assert await shard_db.scalar(consumed) == 9
+
+
+@pytest.mark.asyncio
+async def test_move_carries_deletes_made_while_copying(
+    db_session, test_session_factory, sharded, shard_session_factory, mover, stocked_tenant, monkeypatch
+):
+    tenant_id, item_ids = stocked_tenant
+    copy_round = TenantMover._copy_round
+    rounds = []
+
+    async def delete_after_first_round(self, *args, **kwargs):
+        started = datetime.now(timezone.utc)
+        copied, watermark = await copy_round(self, *args, **kwargs)
+        if not rounds:
+            async with test_session_factory() as db:
+                await db.execute(delete(Inventory).where(Inventory.id == item_ids[0]))
+                # Not an item delete, so only the cutover finds it
+                await db.execute(delete(InventoryConsumption).where(InventoryConsumption.inventory_id == item_ids[1]))
+                await db.commit()
+        rounds.append((started, watermark))
+        return copied, watermark
+
+    monkeypatch.setattr(TenantMover, "_copy_round", delete_after_first_round)
+    await mover.move(tenant_id, sharded)
+
+    # The mover's own sessions, open since before the first round, don't hold the next one back
+    assert all(watermark >= started for started, watermark in rounds)
+    async with shard_session_factory() as shard_db:
+        assert set(await shard_db.scalars(select(Inventory.id).where(Inventory.tenant_id == tenant_id))) == set(
+            item_ids[1:]
+        )
+        assert await _count(shard_db, SupplyOrder, SupplyOrder.tenant_id == tenant_id) == 0
+        assert await _count(shard_db, InventoryConsumption, InventoryConsumption.tenant_id == tenant_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_move_carries_reservations(db_session, sharded, shard_session_factory, mover, stocked_tenant):
+    tenant_id, item_ids = stocked_tenant
+    obj_in = ReservationCreate(inventory_id=item_ids[1], quantity=3)
+    held = await crud.reservation.reserve(db_session, obj_in=obj_in, tenant_id=tenant_id)
+
+    await mover.move(tenant_id, sharded)
+
+    assert await _count(db_session, Reservation, Reservation.tenant_id == tenant_id) == 0
+    async with shard_session_factory() as shard_db:
+        assert await shard_db.scalar(select(Reservation.quantity).where(Reservation.id == held["id"])) == 3
+        availability = await crud.inventory.get_availability(shard_db, id=item_ids[1], tenant_id=tenant_id)
+        assert (availability["reserved_stock"], availability["available_stock"]) == (3, 7)
+
+
+@pytest.mark.asyncio
+async def test_move_skips_items_of_deleted_products(db_session, sharded, shard_session_factory, mover, stocked_tenant):
+    tenant_id, item_ids = stocked_tenant
+    product_id = await db_session.scalar(select(Inventory.product_id).where(Inventory.id == item_ids[2]))
+    await crud.product.remove(db_session, id=product_id)
+
+    await mover.move(tenant_id, sharded)
+
+    async with shard_session_factory() as shard_db:
+        assert set(await shard_db.scalars(select(Inventory.id).where(Inventory.tenant_id == tenant_id))) == set(
+            item_ids[:2]
+        )
+        assert await shard_db.scalar(select(Product.deleted_at).where(Product.id == product_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_move_rejects_current_or_unknown_shard(db_session, sharded, mover, stocked_tenant):
+    tenant_id, _ = stocked_tenant
+
+    with pytest.raises(TenantMoveError):
+        await mover.move(tenant_id, DEFAULT_SHARD)
+    with pytest.raises(TenantMoveError):
+        await mover.move(uuid.uuid4(), sharded)
+    with pytest.raises(UnknownShardError):
+        await mover.move(tenant_id, "nowhere")
@@ -0,0 +1,176 @@
+import ipaddress
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app import crud
+from app.core.config import settings
+from app.schemas.tenant import TenantCreate
+from app.schemas.webhook import LowStockEvent, WebhookCreate, WebhookUpdate
+from app.services.webhooks import WebhookDispatcher, sign
+
+
+class Receiver:
+    """
+    Stand-in webhook endpoint: records deliveries and answers with scripted statuses.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.statuses = []
+        self.app = Starlette(routes=[Route("/hook", self.handle, methods=["POST"])])
+
+    async def handle(self, request: Request) -> Response:
+        self.requests.append((dict(request.headers), await request.body()))
+        return Response(status_code=self.statuses.pop(0) if self.statuses else 200)
+
+
+@pytest.fixture
+def receiver():
+    return Receiver()
+
+
+# What the receiver's hosts resolve to
+HOSTS = {"receiver": "93.184.215.14", "intranet": "10.1.2.3"}
+
+
+async def _resolve(host):
+    return [ipaddress.ip_address(HOSTS[host])]
+
+
+@pytest.fixture
+async def dispatcher(receiver, test_session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_BATCH_WINDOW_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "WEBHOOK_RETRY_BACKOFF_SECONDS", 0.01)
+    dispatcher = WebhookDispatcher(
+        session_factory=test_session_factory, transport=httpx.ASGITransport(receiver.app), resolve=_resolve
+    )
+    yield dispatcher
+    await dispatcher.aclose()
+
+
+@pytest.fixture
+async def tenant(db_session):
+    return await crud.tenant.create(db_session, obj_in=TenantCreate(name="Webhook Tenant"))
+
+
+@pytest.fixture
+async def webhook(db_session, tenant):
+    return await crud.webhook.create_with_tenant(
+        db_session, obj_in=WebhookCreate(url="http://receiver/hook"), tenant_id=tenant.id
+    )
+
+
+def _event(current_stock: int = 1) -> LowStockEvent:
+    return LowStockEvent(
+        inventory_id=uuid.uuid4(),
+        product_id=uuid.uuid4(),
+        min_stock=5,
+        current_stock=current_stock,
+        occurred_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_and_signed(dispatcher, receiver, tenant, webhook):
+    for stock in range(3):
+        dispatcher.publish(tenant.id, _event(stock))
+
+    await dispatcher.flush()
+
+    assert len(receiver.requests) == 1
+    headers, body = receiver.requests[0]
+    payload = orjson.loads(body)
+    assert payload["tenant_id"] == str(tenant.id)
+    assert [event["current_stock"] for event in payload["events"]] == [0, 1, 2]
+    assert headers["x-webhook-signature"] == sign(webhook.secret, headers["x-webhook-timestamp"], body)
+    assert headers["host"] == "receiver"
+
+
+@pytest.mark.asyncio
+async def test_batch_window_sends_without_flush(dispatcher, receiver, tenant, webhook):
+    dispatcher.publish(tenant.id, _event())
+
+    # Only the window timer can have sent it
+    for task in list(dispatcher._timers.values()):
+        await task
+    for task in list(dispatcher._deliveries):
+        await task
+
+    assert len(receiver.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_with_the_same_batch_id(dispatcher, receiver, tenant, webhook):
+    receiver.statuses = [503, 429]
+
+    dispatcher.publish(tenant.id, _event())
+    await dispatcher.flush()
+
+    assert len(receiver.requests) == 3
+    assert len({headers["x-webhook-id"] for headers, _ in receiver.requests}) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(dispatcher, receiver, tenant, webhook):
+    receiver.statuses = [400]
+
+    dispatcher.publish(tenant.id, _event())
+    await dispatcher.flush()
+
+    assert len(receiver.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts(dispatcher, receiver, tenant, webhook, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_ATTEMPTS", 2)
+    receiver.statuses = [500, 500, 500]
+
+    dispatcher.publish(tenant.id, _event())
+    await dispatcher.flush()
+
+    assert len(receiver.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_inactive_webhooks_are_skipped(db_session, dispatcher, receiver, tenant, webhook):
+    await crud.webhook.update(db_session, db_obj=webhook, obj_in=WebhookUpdate(is_active=False))
+
+    dispatcher.publish(tenant.id, _event())
+    await dispatcher.flush()
+
+    assert receiver.requests == []
+
+
+@pytest.mark.asyncio
+async def test_hosts_resolving_to_private_addresses_are_not_called(db_session, dispatcher, receiver, tenant):
+    # Registered while public; the name has pointed inside the network since
+    await crud.webhook.create_with_tenant(
+        db_session, obj_in=WebhookCreate(url="http://intranet/hook"), tenant_id=tenant.id
+    )
+
+    dispatcher.publish(tenant.id, _event())
+    await dispatcher.flush()
+
+    assert receiver.requests == []
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_timers_are_logged(dispatcher, tenant, monkeypatch, caplog):
+    async def broken(tenant_id, events):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(dispatcher, "_dispatch", broken)
+    dispatcher.publish(tenant.id, _event())
+    timer = dispatcher._timers[tenant.id]
+    with pytest.raises(RuntimeError):
+        await timer
+
+    assert "Webhook task failed" in caplog.text
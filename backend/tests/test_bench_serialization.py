@@ -0,0 +1,9 @@
+from scripts import bench_serialization
+
+
+def test_benchmark_runs_with_the_current_schema(capsys):
+    # Catches schema changes that the benchmark rows no longer satisfy
+    bench_serialization.main(["--sizes", "10", "--repeat", "1"])
+
+    rows = capsys.readouterr().out.splitlines()[2:]
+    assert [row.split("|")[0].strip() for row in rows] == ["10"]
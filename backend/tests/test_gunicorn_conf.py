@@ -0,0 +1,11 @@
+from gunicorn_conf import default_workers
+
+
+def test_default_workers_follow_cpu_count():
+    assert default_workers(8) == 8
+    assert default_workers(8, workers_per_core=2) == 16
+
+
+def test_default_workers_bounds():
+    assert default_workers(1) == 2
+    assert default_workers(32, max_workers=12) == 12
@@ -0,0 +1,97 @@
+import logging
+import os
+import queue
+import sys
+import time
+
+import orjson
+
+from app.logger import (
+    ContextFilter,
+    DebugSampler,
+    DroppingQueueHandler,
+    JsonFormatter,
+    logger,
+    request_id_var,
+    tenant_id_var,
+)
+
+
+def _record(level: int = logging.INFO, msg: str = "hello %s", args: tuple = ("world",)) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_request_context():
+    request_token = request_id_var.set("req-1")
+    tenant_token = tenant_id_var.set("tenant-1")
+    try:
+        record = _record()
+        ContextFilter().filter(record)
+        record.duration_ms = 12.5
+    finally:
+        tenant_id_var.reset(tenant_token)
+        request_id_var.reset(request_token)
+
+    payload = orjson.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "req-1"
+    assert payload["tenant_id"] == "tenant-1"
+    assert payload["duration_ms"] == 12.5
+
+
+def test_json_formatter_omits_missing_context():
+    record = _record()
+    ContextFilter().filter(record)
+
+    payload = orjson.loads(JsonFormatter().format(record))
+
+    assert "request_id" not in payload
+    assert "tenant_id" not in payload
+
+
+def test_debug_sampler_only_samples_debug():
+    sampler = DebugSampler(0.0)
+
+    assert sampler.filter(_record(logging.DEBUG)) is False
+    assert sampler.filter(_record(logging.INFO)) is True
+    assert DebugSampler(1.0).filter(_record(logging.DEBUG)) is True
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.emit(_record())
+    handler.emit(_record())
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_queue_handler_leaves_formatting_to_the_writer():
+    handler = DroppingQueueHandler(queue.Queue())
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        handler.emit(logging.LogRecord("test", logging.ERROR, __file__, 1, "failed %s", ("here",), sys.exc_info()))
+
+    payload = orjson.loads(JsonFormatter().format(handler.queue.get_nowait()))
+
+    assert payload["message"] == "failed here"
+    assert "ZeroDivisionError" in payload["exc_info"]
+
+
+def test_forked_child_drains_its_log_queue():
+    handler = logger.handlers[0]
+    pid = os.fork()
+    if pid == 0:
+        # Without a restarted writer thread the record would sit in the queue forever
+        logger.warning("from forked child")
+        deadline = time.monotonic() + 2
+        while handler.queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        os._exit(0 if handler.queue.qsize() == 0 else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0